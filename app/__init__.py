@@ -6,6 +6,8 @@ GitHub: app/__init__.py
 """
 import os
 import logging
+import importlib
+import importlib.util
 from flask import Flask
 from werkzeug.middleware.proxy_fix import ProxyFix
 from config import get_config
@@ -31,6 +33,10 @@ def create_app(config_class=None):
     # Proxy fix for deployment behind reverse proxy
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1)
 
+    # Fast JSON serialization for jsonify()
+    from app.utils.json_provider import init_json_provider
+    init_json_provider(app)
+
     # Initialize Sentry for error tracking (production)
     init_sentry(app)
 
@@ -75,6 +81,10 @@ YENİ EKLEME: aday_bp blueprint kaydı
     # Register error handlers
     register_error_handlers(app)
 
+    # Request içinde biriken audit kayıtları commit sonrası tek INSERT ile yazılır
+    from app.models.admin import init_audit_buffer
+    init_audit_buffer(app)
+
     # Register context processors
     register_context_processors(app)
 
@@ -85,6 +95,11 @@ YENİ EKLEME: aday_bp blueprint kaydı
             db.create_all()
             app.logger.info("Database tables created (development mode)")
 
+    # Model ilişkileri ilk sorguda değil, açılışta bir kez çözülür
+    from app import models  # noqa: F401 - tüm mapper'ları kaydeder
+    from sqlalchemy.orm import configure_mappers
+    configure_mappers()
+
     # Register CLI commands
     try:
         from scripts.demo_setup import register_demo_commands
@@ -138,6 +153,26 @@ def init_sentry(app):
         app.logger.error(f"Sentry initialization failed: {e}")
 
 
+# Optional blueprints: (name, module, attribute, label, critical)
+OPTIONAL_BLUEPRINTS = [
+    ('credits', 'app.routes.credits', 'credits_bp', 'Credits', False),
+    ('two_factor', 'app.routes.two_factor', 'twofa_bp', '2FA', False),
+    ('candidate', 'app.routes.candidate', 'candidate_bp', 'Candidate', False),
+    ('candidate_auth', 'app.routes.candidate_auth', 'candidate_auth_bp', 'Candidate Auth', False),
+    ('analytics', 'app.routes.analytics', 'analytics_bp', 'Analytics', False),
+    ('health', 'app.routes.health', 'health_bp', 'Health check', False),
+    ('question_import', 'app.routes.question_import', 'question_import_bp', 'Question Import', False),
+    ('certificate', 'app.routes.certificate', 'certificate_bp', 'Certificate', False),
+    ('data_management', 'app.routes.data_management', 'data_bp', 'Data Management', False),
+    # CRITICAL FIX: customer_bp for /customer/* routes
+    ('customer', 'app.routes.customer', 'customer_bp', 'Customer', True),
+    ('email_verification', 'app.routes.email_verification', 'email_verification_bp', 'Email Verification', False),
+    ('proctoring', 'app.routes.proctoring', 'proctoring_bp', 'Proctoring', False),
+    # YENİ: security blueprint (tab switch, fraud detection)
+    ('security', 'app.routes.security', 'security_bp', 'Security', False),
+]
+
+
 def register_blueprints(app):
     """Register all Flask blueprints"""
     
@@ -163,113 +198,22 @@ def register_blueprints(app):
     app.register_blueprint(exam_bp, url_prefix='/exam')
     app.register_blueprint(api_bp, url_prefix='/api')
 
-    # Register credits blueprint
-    try:
-        from app.routes.credits import credits_bp
-        app.register_blueprint(credits_bp)
-        app.logger.info("✅ Credits blueprint registered")
-    except ImportError as e:
-        app.logger.warning(f"Credits blueprint not available: {e}")
-
-    # Register 2FA blueprint
-    try:
-        from app.routes.two_factor import twofa_bp
-        app.register_blueprint(twofa_bp)
-        app.logger.info("✅ 2FA blueprint registered")
-    except ImportError as e:
-        app.logger.warning(f"2FA blueprint not available: {e}")
-
-    # Register candidate blueprint
-    try:
-        from app.routes.candidate import candidate_bp
-        app.register_blueprint(candidate_bp)
-        app.logger.info("✅ Candidate blueprint registered")
-    except ImportError as e:
-        app.logger.warning(f"Candidate blueprint not available: {e}")
-
-    # Register candidate_auth blueprint
-    try:
-        from app.routes.candidate_auth import candidate_auth_bp
-        app.register_blueprint(candidate_auth_bp)
-        app.logger.info("✅ Candidate Auth blueprint registered")
-    except ImportError as e:
-        app.logger.warning(f"Candidate Auth blueprint not available: {e}")
-
-    # Register analytics blueprint
-    try:
-        from app.routes.analytics import analytics_bp
-        app.register_blueprint(analytics_bp)
-        app.logger.info("✅ Analytics blueprint registered")
-    except ImportError as e:
-        app.logger.warning(f"Analytics blueprint not available: {e}")
-
-    # Register health check blueprint
-    try:
-        from app.routes.health import health_bp
-        app.register_blueprint(health_bp)
-        app.logger.info("✅ Health check blueprint registered")
-    except ImportError as e:
-        app.logger.warning(f"Health check blueprint not available: {e}")
-
-    # Register question import blueprint
-    try:
-        from app.routes.question_import import question_import_bp
-        app.register_blueprint(question_import_bp)
-        app.logger.info("✅ Question Import blueprint registered")
-    except ImportError as e:
-        app.logger.warning(f"Question Import blueprint not available: {e}")
-
-    # Register certificate blueprint
-    try:
-        from app.routes.certificate import certificate_bp
-        app.register_blueprint(certificate_bp)
-        app.logger.info("✅ Certificate blueprint registered")
-    except ImportError as e:
-        app.logger.warning(f"Certificate blueprint not available: {e}")
-
-    # Register data management blueprint
-    try:
-        from app.routes.data_management import data_bp
-        app.register_blueprint(data_bp)
-        app.logger.info("✅ Data Management blueprint registered")
-    except ImportError as e:
-        app.logger.warning(f"Data Management blueprint not available: {e}")
-
-    # ══════════════════════════════════════════════════════════════
-    # CRITICAL FIX: Register customer_bp for /customer/* routes
-    # ══════════════════════════════════════════════════════════════
-    try:
-        from app.routes.customer import customer_bp
-        app.register_blueprint(customer_bp)
-        app.logger.info("✅ Customer blueprint registered")
-    except ImportError as e:
-        app.logger.error(f"❌ Customer blueprint not available: {e}")
-
-    # Register email verification blueprint
-    try:
-        from app.routes.email_verification import email_verification_bp
-        app.register_blueprint(email_verification_bp)
-        app.logger.info("✅ Email Verification blueprint registered")
-    except ImportError as e:
-        app.logger.warning(f"Email Verification blueprint not available: {e}")
-
-    # Register proctoring blueprint
-    try:
-        from app.routes.proctoring import proctoring_bp
-        app.register_blueprint(proctoring_bp)
-        app.logger.info("✅ Proctoring blueprint registered")
-    except ImportError as e:
-        app.logger.warning(f"Proctoring blueprint not available: {e}")
-
-    # ══════════════════════════════════════════════════════════════
-    # YENİ: Register security blueprint (tab switch, fraud detection)
-    # ══════════════════════════════════════════════════════════════
-    try:
-        from app.routes.security import security_bp
-        app.register_blueprint(security_bp)
-        app.logger.info("✅ Security blueprint registered")
-    except ImportError as e:
-        app.logger.warning(f"Security blueprint not available: {e}")
+    # Register optional blueprints (ENABLED_BLUEPRINTS env var, default: all)
+    enabled = {name.strip() for name in os.getenv('ENABLED_BLUEPRINTS', 'all').split(',')}
+    for name, module_name, attr, label, critical in OPTIONAL_BLUEPRINTS:
+        if 'all' not in enabled and name not in enabled:
+            continue
+        log_missing = app.logger.error if critical else app.logger.warning
+        # find_spec: eksik modül için ImportError/traceback oluşturmadan atla
+        if importlib.util.find_spec(module_name) is None:
+            log_missing(f"{label} blueprint not available: no module {module_name}")
+            continue
+        try:
+            blueprint = getattr(importlib.import_module(module_name), attr)
+            app.register_blueprint(blueprint)
+            app.logger.info(f"✅ {label} blueprint registered")
+        except ImportError as e:
+            log_missing(f"{label} blueprint not available: {e}")
 
     # Initialize i18n (internationalization)
     try:
@@ -1,15 +1,61 @@
 # -*- coding: utf-8 -*-
 """
 Celery Application Configuration
+
+Beat schedule contract: ``beat_schedule`` is static once the app is built.
+Do not assign into ``celery.conf.beat_schedule[...]`` at runtime - changes go
+through ``set_beat_schedule()``, which uses the scheduler's ``update_from_dict``
+so beat invalidates its heap only when the schedule actually changes.
 """
 from celery import Celery
 import os
 
+# Redis transport: keepalive + health checks; visibility timeout must exceed
+# the longest task (AI evaluation, backups) so acks_late tasks are not redelivered
+BROKER_TRANSPORT_OPTIONS = {
+    'socket_keepalive': True,
+    'health_check_interval': 30,
+    'visibility_timeout': 3600,
+}
+
+# Opt-in: skip the extra Redis round trips of ack emulation. Only for short,
+# idempotent workloads - a task in flight on a crashed worker is lost.
+if os.getenv('CELERY_DISABLE_ACK_EMULATION'):
+    BROKER_TRANSPORT_OPTIONS['ack_emulation'] = False
+
+# Internal task/result payloads: msgpack if installed (kombu ships the codec), else JSON
+try:
+    import msgpack  # noqa: F401
+    TASK_SERIALIZER = 'msgpack'
+except ImportError:
+    TASK_SERIALIZER = 'json'
+
+
+# Task modules imported by the worker at boot only. Web processes never import
+# them through this list - routes import a task module lazily right before .delay()
+TASK_MODULES = (
+    'app.tasks.email_tasks',
+    'app.tasks.webhook_tasks',
+    'app.tasks.ai_tasks',
+    'app.tasks.security_tasks',
+    'app.tasks.user_tasks',
+    'app.tasks.backup_tasks',
+    'app.tasks.calibration_tasks',
+    'app.tasks.cleanup_tasks',
+    'app.tasks.export_tasks',
+)
+
+# Flask app used by task bodies (set by init_celery or built on first use)
+_flask_app = None
+
 
 def make_celery(app=None):
     """
     Create Celery application with Flask integration
     
+    Called once at import for the module-level `celery`; pass `app` only
+    when a separate instance is really wanted (otherwise use init_celery).
+    
     Args:
         app: Flask application instance (optional)
     
@@ -20,19 +66,23 @@ def make_celery(app=None):
         'skillstestcenter',
         broker=os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
         backend=os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
-        include=[
-            'app.tasks.email_tasks',
-            'app.tasks.webhook_tasks',
-            'app.tasks.ai_tasks',
-            'app.tasks.report_tasks'
-        ]
+        include=TASK_MODULES
     )
     
     celery.conf.update(
+        # Redis connection reuse: shared broker pool, bounded backend pool,
+        # keepalive + periodic health checks instead of reconnecting
+        broker_pool_limit=int(os.getenv('CELERY_BROKER_POOL', '50')),
+        redis_max_connections=int(os.getenv('CELERY_REDIS_MAX_CONNECTIONS', '100')),
+        redis_socket_keepalive=True,
+        broker_transport_options=BROKER_TRANSPORT_OPTIONS,
+        result_backend_transport_options={'retry_policy': {'timeout': 5.0}},
+        
         # Task settings
-        task_serializer='json',
-        accept_content=['json'],
-        result_serializer='json',
+        task_serializer=TASK_SERIALIZER,
+        accept_content=['msgpack', 'json'],  # JSON still accepted for messages queued before rollout
+        result_serializer=TASK_SERIALIZER,
+        result_accept_content=['msgpack', 'json'],
         timezone='Europe/Istanbul',
         enable_utc=True,
         
@@ -60,21 +110,75 @@ def make_celery(app=None):
                 'task': 'app.tasks.email_tasks.send_exam_reminders',
                 'schedule': 86400.0,  # Daily
             },
+            'flush-security-counters': {
+                'task': 'app.tasks.security_tasks.flush_security_counters',
+                'schedule': 10.0,  # Every 10 seconds
+            },
         }
     )
     
     if app:
-        celery.conf.update(app.config)
-        
-        class ContextTask(celery.Task):
-            def __call__(self, *args, **kwargs):
-                with app.app_context():
-                    return self.run(*args, **kwargs)
-        
-        celery.Task = ContextTask
+        init_celery(app, celery)
     
     return celery
 
 
+def init_celery(app, celery_app=None):
+    """
+    Bind Flask config and app context to an existing Celery instance.
+    
+    Use this from an application factory instead of make_celery(app) so the
+    process keeps the single module-level instance (one task registry,
+    one broker pool).
+    
+    Args:
+        app: Flask application instance
+        celery_app: Celery instance (default: module-level `celery`)
+    
+    Returns:
+        Celery application instance
+    """
+    global _flask_app
+    _flask_app = app
+    celery_app = celery_app or celery
+    celery_app.conf.update(app.config)
+    
+    class ContextTask(celery_app.Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context():
+                return self.run(*args, **kwargs)
+    
+    celery_app.Task = ContextTask
+    return celery_app
+
+
+def task_app_context():
+    """
+    Flask app context for task code that touches the database or config.
+    
+    Uses the app bound by init_celery; in a plain worker process the app is
+    built with create_app() on first use and reused for later tasks.
+    """
+    global _flask_app
+    if _flask_app is None:
+        from app import create_app
+        _flask_app = create_app()
+    return _flask_app.app_context()
+
+
+def set_beat_schedule(new_schedule, scheduler=None):
+    """
+    Add or update beat entries without mutating the configured dict in place.
+    
+    Args:
+        new_schedule: {name: {'task': ..., 'schedule': ...}} entries
+        scheduler: running beat Scheduler (e.g. from a beat_init signal);
+                   when given, entries are merged via update_from_dict
+    """
+    celery.conf.beat_schedule = {**celery.conf.beat_schedule, **new_schedule}
+    if scheduler is not None:
+        scheduler.update_from_dict(new_schedule)
+
+
 # Create Celery instance
 celery = make_celery()
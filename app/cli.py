@@ -27,33 +27,7 @@ def register_commands(app):
 @with_appcontext
 def create_admin(email, password, name):
     """Create a new admin user (customer role)."""
-    from app.extensions import db
-    from app.models.user import User
-    import bcrypt
-    
-    # Check if user exists
-    existing = User.query.filter_by(email=email).first()
-    if existing:
-        click.echo(click.style(f'❌ User with email {email} already exists!', fg='red'))
-        return
-    
-    # Create user
-    hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-    
-    user = User(
-        email=email,
-        sifre=hashed_password,
-        ad_soyad=name,
-        rol='customer',
-        aktif=True
-    )
-    
-    db.session.add(user)
-    db.session.commit()
-    
-    click.echo(click.style(f'✅ Admin user created successfully!', fg='green'))
-    click.echo(f'   Email: {email}')
-    click.echo(f'   Role: customer')
+    _create_user(email, password, name, 'customer', 'Admin user')
 
 
 @click.command('create-superadmin')
@@ -63,9 +37,14 @@ def create_admin(email, password, name):
 @with_appcontext
 def create_superadmin(email, password, name):
     """Create a new superadmin user."""
+    _create_user(email, password, name, 'superadmin', 'Superadmin')
+
+
+def _create_user(email, password, name, rol, label):
+    """Create a user with an Argon2id password hash (shared by create-admin/create-superadmin)."""
     from app.extensions import db
     from app.models.user import User
-    import bcrypt
+    from app.utils.passwords import hash_password
     
     # Check if user exists
     existing = User.query.filter_by(email=email).first()
@@ -73,23 +52,20 @@ def create_superadmin(email, password, name):
         click.echo(click.style(f'❌ User with email {email} already exists!', fg='red'))
         return
     
-    # Create superadmin
-    hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-    
     user = User(
         email=email,
-        sifre=hashed_password,
+        sifre_hash=hash_password(password),
         ad_soyad=name,
-        rol='superadmin',
-        aktif=True
+        rol=rol,
+        is_active=True
     )
     
     db.session.add(user)
     db.session.commit()
     
-    click.echo(click.style(f'✅ Superadmin created successfully!', fg='green'))
+    click.echo(click.style(f'✅ {label} created successfully!', fg='green'))
     click.echo(f'   Email: {email}')
-    click.echo(f'   Role: superadmin')
+    click.echo(f'   Role: {rol}')
 
 
 @click.command('init-db')
@@ -116,30 +92,33 @@ def init_db(drop):
 @with_appcontext
 def seed_questions(count):
     """Seed the database with sample questions."""
+    from itertools import cycle
     from app.extensions import db
     from app.models.question import Question
     
-    categories = ['grammar', 'vocabulary', 'reading', 'listening']
-    levels = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2']
-    
-    created = 0
-    for i in range(count):
-        q = Question(
-            soru_metni=f"Sample question {i+1}: What is the correct answer?",
-            kategori=categories[i % len(categories)],
-            zorluk=levels[i % len(levels)],
-            dogru_cevap='A',
-            secenek_a='Option A (correct)',
-            secenek_b='Option B',
-            secenek_c='Option C',
-            secenek_d='Option D',
-            aktif=True
-        )
-        db.session.add(q)
-        created += 1
+    categories = cycle(['grammar', 'vocabulary', 'reading', 'listening'])
+    levels = cycle(['A1', 'A2', 'B1', 'B2', 'C1', 'C2'])
+    
+    # Plain dicts + one executemany INSERT (no ORM instances / per-object flush)
+    rows = [
+        {
+            'soru_metni': f"Sample question {i+1}: What is the correct answer?",
+            'kategori': next(categories),
+            'zorluk': next(levels),
+            'dogru_cevap': 'A',
+            'secenek_a': 'Option A (correct)',
+            'secenek_b': 'Option B',
+            'secenek_c': 'Option C',
+            'secenek_d': 'Option D',
+            'is_active': True
+        }
+        for i in range(count)
+    ]
     
+    if rows:
+        db.session.execute(Question.__table__.insert(), rows)
     db.session.commit()
-    click.echo(click.style(f'✅ Created {created} sample questions!', fg='green'))
+    click.echo(click.style(f'✅ Created {len(rows)} sample questions!', fg='green'))
 
 
 @click.command('run-backup')
@@ -154,6 +133,25 @@ def run_backup():
     click.echo('Check Celery worker for progress.')
 
 
+# show-config: config keys printed as-is
+_SAFE_CONFIG_KEYS = (
+    'DEBUG', 'TESTING', 'ENV',
+    'SESSION_TYPE', 'PERMANENT_SESSION_LIFETIME',
+    'SQLALCHEMY_TRACK_MODIFICATIONS',
+    'RATELIMIT_DEFAULT',
+    'MAX_CONTENT_LENGTH',
+)
+
+# show-config: (env var, min length, message when missing/short) - values never printed
+_SENSITIVE_ENV = (
+    ('SECRET_KEY', 32, '⚠️ Weak or not set'),
+    ('DATABASE_URL', 1, '❌ Not set'),
+    ('GEMINI_API_KEY', 1, '⚠️ Not set'),
+    ('SENDGRID_API_KEY', 1, '⚠️ Not set'),
+    ('SENTRY_DSN', 1, '⚠️ Not set'),
+)
+
+
 @click.command('show-config')
 @with_appcontext
 def show_config():
@@ -164,35 +162,17 @@ def show_config():
     click.echo('CURRENT CONFIGURATION')
     click.echo('='*50)
     
-    safe_keys = [
-        'DEBUG', 'TESTING', 'ENV', 
-        'SESSION_TYPE', 'PERMANENT_SESSION_LIFETIME',
-        'SQLALCHEMY_TRACK_MODIFICATIONS',
-        'RATELIMIT_DEFAULT',
-        'MAX_CONTENT_LENGTH'
-    ]
-    
-    for key in safe_keys:
-        value = current_app.config.get(key, 'Not set')
-        click.echo(f'{key}: {value}')
+    config = current_app.config
+    for key in _SAFE_CONFIG_KEYS:
+        click.echo(f"{key}: {config.get(key, 'Not set')}")
     
     # Show status of sensitive configs
     click.echo('\n--- Sensitive Configs (status only) ---')
     
-    secret_key = os.getenv('SECRET_KEY', '')
-    click.echo(f"SECRET_KEY: {'✅ Set' if len(secret_key) >= 32 else '⚠️ Weak or not set'}")
-    
-    db_url = os.getenv('DATABASE_URL', '')
-    click.echo(f"DATABASE_URL: {'✅ Set' if db_url else '❌ Not set'}")
-    
-    gemini_key = os.getenv('GEMINI_API_KEY', '')
-    click.echo(f"GEMINI_API_KEY: {'✅ Set' if gemini_key else '⚠️ Not set'}")
-    
-    sendgrid_key = os.getenv('SENDGRID_API_KEY', '')
-    click.echo(f"SENDGRID_API_KEY: {'✅ Set' if sendgrid_key else '⚠️ Not set'}")
-    
-    sentry_dsn = os.getenv('SENTRY_DSN', '')
-    click.echo(f"SENTRY_DSN: {'✅ Set' if sentry_dsn else '⚠️ Not set'}")
+    env = os.environ
+    for name, min_len, missing in _SENSITIVE_ENV:
+        ok = len(env.get(name, '')) >= min_len
+        click.echo(f"{name}: {'✅ Set' if ok else missing}")
     
     click.echo('='*50 + '\n')
 
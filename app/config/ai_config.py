@@ -15,11 +15,39 @@ Usage:
     response = model.generate_content(...)
 """
 import os
+import json
 import logging
-from typing import Optional
+from dataclasses import MISSING, dataclass, field, fields
+from typing import List, Optional, Union, get_args, get_origin
 
 logger = logging.getLogger(__name__)
 
+# SDKs are imported once; a missing package is logged when a client is requested
+try:
+    from openai import OpenAI
+except ImportError:
+    OpenAI = None
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+# Optional: typed single-pass decoding of evaluation responses
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Clients built successfully, reused for the process lifetime.
+# Failures are not stored, so a missing key or transient init error is retried.
+_openai_clients = {}
+_gemini_models = {}
+
+# Default model names, read once (refreshed by reset_ai_clients)
+_DEFAULT_OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+_DEFAULT_GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
+
 
 # ══════════════════════════════════════════════════════════════════
 # OPENAI CONFIGURATION
@@ -27,7 +55,7 @@ logger = logging.getLogger(__name__)
 
 def get_openai_client():
     """
-    Get configured OpenAI client.
+    Get configured OpenAI client (created once per API key).
     
     Environment Variables:
         OPENAI_API_KEY: Your OpenAI API key
@@ -36,21 +64,22 @@ def get_openai_client():
     Returns:
         OpenAI client instance
     """
+    if OpenAI is None:
+        logger.error("openai package not installed. Run: pip install openai")
+        return None
+    
     try:
-        from openai import OpenAI
-        
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
             logger.warning("OPENAI_API_KEY not set")
             return None
         
-        client = OpenAI(api_key=api_key)
-        logger.info("OpenAI client initialized")
+        client = _openai_clients.get(api_key)
+        if client is None:
+            client = _openai_clients[api_key] = OpenAI(api_key=api_key)
+            logger.info("OpenAI client initialized")
         return client
         
-    except ImportError:
-        logger.error("openai package not installed. Run: pip install openai")
-        return None
     except Exception as e:
         logger.error(f"Failed to initialize OpenAI: {e}")
         return None
@@ -72,7 +101,7 @@ def chat_with_openai(prompt: str, system_prompt: str = None, model: str = None)
     if not client:
         return None
     
-    model = model or os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+    model = model or _DEFAULT_OPENAI_MODEL
     
     messages = []
     if system_prompt:
@@ -99,7 +128,7 @@ def chat_with_openai(prompt: str, system_prompt: str = None, model: str = None)
 
 def get_gemini_model(model_name: str = None):
     """
-    Get configured Gemini model.
+    Get configured Gemini model (created once per API key and model name).
     
     Environment Variables:
         GEMINI_API_KEY: Your Google AI API key
@@ -108,30 +137,39 @@ def get_gemini_model(model_name: str = None):
     Returns:
         Gemini model instance
     """
+    if genai is None:
+        logger.error("google-generativeai package not installed. Run: pip install google-generativeai")
+        return None
+    
     try:
-        import google.generativeai as genai
-        
         api_key = os.getenv('GEMINI_API_KEY')
         if not api_key:
             logger.warning("GEMINI_API_KEY not set")
             return None
         
-        genai.configure(api_key=api_key)
-        
-        model_name = model_name or os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
-        model = genai.GenerativeModel(model_name)
-        
-        logger.info(f"Gemini model initialized: {model_name}")
+        model_name = model_name or _DEFAULT_GEMINI_MODEL
+        key = (api_key, model_name)
+        model = _gemini_models.get(key)
+        if model is None:
+            genai.configure(api_key=api_key)
+            model = _gemini_models[key] = genai.GenerativeModel(model_name)
+            logger.info(f"Gemini model initialized: {model_name}")
         return model
         
-    except ImportError:
-        logger.error("google-generativeai package not installed. Run: pip install google-generativeai")
-        return None
     except Exception as e:
         logger.error(f"Failed to initialize Gemini: {e}")
         return None
 
 
+def reset_ai_clients():
+    """Drop cached AI clients and re-read model env vars (tests, API key rotation)."""
+    global _DEFAULT_OPENAI_MODEL, _DEFAULT_GEMINI_MODEL
+    _DEFAULT_OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+    _DEFAULT_GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
+    _openai_clients.clear()
+    _gemini_models.clear()
+
+
 def chat_with_gemini(prompt: str, model_name: str = None) -> Optional[str]:
     """
     Send a generation request to Gemini.
@@ -172,25 +210,38 @@ def get_ai_response(prompt: str, system_prompt: str = None, provider: str = None
     Returns:
         Response text or None on error
     """
-    # Auto-detect provider based on available API keys
+    provider = provider or _DEFAULT_PROVIDER
     if provider is None:
-        if os.getenv('GEMINI_API_KEY'):
-            provider = 'gemini'
-        elif os.getenv('OPENAI_API_KEY'):
-            provider = 'openai'
-        else:
-            logger.error("No AI API key configured")
-            return None
+        logger.error("No AI API key configured")
+        return None
     
-    if provider == 'openai':
-        return chat_with_openai(prompt, system_prompt)
-    elif provider == 'gemini':
-        if system_prompt:
-            prompt = f"{system_prompt}\n\n{prompt}"
-        return chat_with_gemini(prompt)
-    else:
+    fn = _PROVIDERS.get(provider)
+    if fn is None:
         logger.error(f"Unknown AI provider: {provider}")
         return None
+    
+    return fn(prompt, system_prompt)
+
+
+def _chat_with_gemini_system(prompt: str, system_prompt: str = None) -> Optional[str]:
+    """Gemini has no system role - prepend the instructions to the prompt."""
+    if system_prompt:
+        prompt = f"{system_prompt}\n\n{prompt}"
+    return chat_with_gemini(prompt)
+
+
+# Provider name -> callable(prompt, system_prompt)
+_PROVIDERS = {
+    'openai': chat_with_openai,
+    'gemini': _chat_with_gemini_system,
+}
+
+# Auto-detected provider based on available API keys (Gemini preferred)
+_DEFAULT_PROVIDER = (
+    'gemini' if os.getenv('GEMINI_API_KEY')
+    else 'openai' if os.getenv('OPENAI_API_KEY')
+    else None
+)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -230,3 +281,162 @@ Return JSON only with scores and feedback.""",
 
 Return JSON only with scores and feedback."""
 }
+
+
+# ══════════════════════════════════════════════════════════════════
+# EVALUATION RESPONSE PARSING
+# Field names match the JSON contract in app/tasks/ai/writing.py and speaking.py
+# ══════════════════════════════════════════════════════════════════
+
+Score = Union[int, float]
+
+
+@dataclass(frozen=True)
+class GrammarError:
+    error_text: str
+    correction: str
+    error_type: str = ''
+    explanation: str = ''
+
+
+@dataclass(frozen=True)
+class WritingEvaluation:
+    task_achievement: Score
+    coherence_cohesion: Score
+    vocabulary: Score
+    grammar: Score
+    overall: Score
+    cefr_level: Optional[str] = None
+    feedback: str = ''
+    band_score: Optional[Score] = None
+    suspicious_content: bool = False
+    grammar_errors: List[GrammarError] = field(default_factory=list)
+    highlighted_essay: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class SpeakingEvaluation:
+    fluency: Score
+    pronunciation: Score
+    grammar: Score
+    vocabulary: Score
+    content: Score
+    overall: Score
+    cefr_level: Optional[str] = None
+    feedback: str = ''
+    suspicious_content: bool = False
+
+
+_EVALUATION_TYPES = {
+    'writing': WritingEvaluation,
+    'speaking': SpeakingEvaluation,
+}
+
+# One decoder per result type, built at import. strict=False: models often
+# send scores as numeric strings ("85") or booleans as "true"
+_DECODERS = {
+    kind: msgspec.json.Decoder(cls, strict=False) for kind, cls in _EVALUATION_TYPES.items()
+} if msgspec else {}
+
+
+def _strip_code_fence(text: str) -> str:
+    """Remove a ```json ... ``` wrapper some models add around JSON."""
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.split('\n', 1)[1] if '\n' in text else ''
+        text = text.rsplit('```', 1)[0]
+    return text.strip()
+
+
+def _convert(value, tp):
+    """
+    Check value against an evaluation dataclass annotation, converting it
+    the way msgspec does with strict=False ("85" -> 85, "true" -> True).
+    Raises ValueError if it cannot be used.
+    """
+    if get_origin(tp) is Union:
+        for arg in get_args(tp):
+            try:
+                return _convert(value, arg)
+            except ValueError:
+                pass
+        raise ValueError
+    if tp is type(None):
+        if value is None:
+            return None
+        raise ValueError
+    if tp is bool:
+        if isinstance(value, bool):
+            return value
+        lax = {'true': True, '1': True, 'false': False, '0': False}
+        if isinstance(value, (int, str)) and str(value).lower() in lax:
+            return lax[str(value).lower()]
+        raise ValueError
+    if tp in (int, float):
+        if isinstance(value, bool):
+            raise ValueError
+        if isinstance(value, tp):
+            return value
+        if isinstance(value, str):
+            return tp(value)  # ValueError if not numeric
+        if tp is float and isinstance(value, int):
+            return float(value)
+        raise ValueError
+    if isinstance(value, tp):
+        return value
+    raise ValueError
+
+
+def _decode_stdlib(text: str, cls):
+    return _build(json.loads(text), cls)
+
+
+def _build(data, cls):
+    """Validate a decoded JSON object against cls, as msgspec (strict=False) would."""
+    if not isinstance(data, dict):
+        raise ValueError(f"{cls.__name__} must be a JSON object")
+    values = {}
+    for f in fields(cls):
+        if f.name not in data:
+            if f.default is MISSING and f.default_factory is MISSING:
+                raise ValueError(f"Missing evaluation field: '{f.name}'")
+            continue
+        value = data[f.name]
+        if get_origin(f.type) is list:
+            if not isinstance(value, list):
+                raise ValueError(f"'{f.name}' must be a list")
+            value = [_build(item, get_args(f.type)[0]) for item in value]
+        else:
+            try:
+                value = _convert(value, f.type)
+            except ValueError:
+                raise ValueError(f"'{f.name}' has the wrong type") from None
+        values[f.name] = value
+    return cls(**values)
+
+
+def parse_evaluation(text: str, kind: str = 'writing'):
+    """
+    Parse an LLM evaluation response into a typed result.
+    
+    Args:
+        text: Raw model output (JSON, optionally in a code fence)
+        kind: 'writing' or 'speaking'
+    
+    Returns:
+        WritingEvaluation or SpeakingEvaluation
+    
+    Raises:
+        ValueError: unknown kind, malformed JSON or missing/mistyped fields
+    """
+    if kind not in _EVALUATION_TYPES:
+        raise ValueError(f"Unknown evaluation kind: {kind!r}")
+    
+    text = _strip_code_fence(text)
+    if msgspec is None:
+        return _decode_stdlib(text, _EVALUATION_TYPES[kind])
+    try:
+        return _DECODERS[kind].decode(text.encode('utf-8'))
+    except msgspec.DecodeError as e:
+        # Covers both malformed JSON and schema validation errors
+        raise ValueError(f"Invalid evaluation response: {e}") from e
@@ -9,8 +9,27 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flasgger import Swagger
 
+try:
+    import orjson
+except ImportError:
+    import json
+    orjson = None
+
+__all__ = ['db', 'migrate', 'csrf', 'limiter', 'swagger', 'init_extensions']
+
+
+def _json_serializer(value):
+    """
+    Encoder for JSON/JSONB columns (audit values, tags).
+    orjson when installed; datetimes and other non-JSON types become str.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(value, default=str)
+
+
 # Database
-db = SQLAlchemy()
+db = SQLAlchemy(engine_options={'json_serializer': _json_serializer})
 migrate = Migrate()
 
 # Security
@@ -5,7 +5,7 @@ Multi-language support using Flask-Babel
 """
 import os
 from flask import Flask, request, session, g
-from flask_babel import Babel, gettext, ngettext, lazy_gettext
+from flask_babel import Babel, gettext, ngettext
 
 # Initialize Babel
 babel = Babel()
@@ -46,6 +46,13 @@ SUPPORTED_LANGUAGES = {
 
 DEFAULT_LANGUAGE = 'tr'
 
+# Precomputed once for the per-request locale selection
+_SUPPORTED_KEYS = tuple(SUPPORTED_LANGUAGES.keys())
+_SUPPORTED_SET = frozenset(_SUPPORTED_KEYS)
+
+# Opt-in: persist language switches via Celery so the redirect does not wait on the DB
+LANGUAGE_UPDATE_ASYNC = os.getenv('LANGUAGE_UPDATE_ASYNC', 'false').lower() == 'true'
+
 
 def get_locale():
     """
@@ -57,6 +64,13 @@ def get_locale():
     3. Browser Accept-Language header
     4. Default language
     """
+    # Resolved once per request (Babel + context processor both ask)
+    if not hasattr(g, '_locale'):
+        g._locale = _resolve_locale()
+    return g._locale
+
+
+def _resolve_locale():
     # Check session
     if 'language' in session:
         return session['language']
@@ -66,7 +80,7 @@ def get_locale():
         return g.user.language
     
     # Check browser preference
-    return request.accept_languages.best_match(SUPPORTED_LANGUAGES.keys(), default=DEFAULT_LANGUAGE)
+    return request.accept_languages.best_match(_SUPPORTED_KEYS, default=DEFAULT_LANGUAGE)
 
 
 def get_timezone():
@@ -91,119 +105,47 @@ def init_i18n(app: Flask):
     # Initialize Babel with app
     babel.init_app(app, locale_selector=get_locale, timezone_selector=get_timezone)
     
+    # Static template globals are bound once, not per render
+    app.jinja_env.globals.update(
+        supported_languages=SUPPORTED_LANGUAGES,
+        _=gettext,
+        _n=ngettext,
+    )
+    
     # Add context processor for templates
     @app.context_processor
     def inject_i18n():
+        current_language = get_locale()
         return {
-            'supported_languages': SUPPORTED_LANGUAGES,
-            'current_language': get_locale(),
-            'current_language_info': SUPPORTED_LANGUAGES.get(get_locale(), SUPPORTED_LANGUAGES[DEFAULT_LANGUAGE]),
-            '_': gettext,
-            '_n': ngettext
+            'current_language': current_language,
+            'current_language_info': SUPPORTED_LANGUAGES.get(current_language, SUPPORTED_LANGUAGES[DEFAULT_LANGUAGE]),
         }
     
     # Add route for language switching
     @app.route('/set-language/<lang>')
     def set_language(lang):
-        if lang in SUPPORTED_LANGUAGES:
-            session['language'] = lang
-            
-            # Update user preference if logged in
-            if 'user_id' in session:
-                try:
-                    from app.models.user import User
-                    from app.extensions import db
-                    user = User.query.get(session['user_id'])
-                    if user:
-                        user.language = lang
-                        db.session.commit()
-                except:
-                    pass
+        from flask import redirect
+        back = redirect(request.referrer or '/')
         
-        # Redirect back to previous page
-        from flask import redirect, request
-        return redirect(request.referrer or '/')
+        # Desteklenmeyen veya zaten seçili dil: DB'ye yazma
+        if lang not in _SUPPORTED_SET or session.get('language') == lang:
+            return back
+        session['language'] = lang
+        
+        # Update user preference if logged in (single UPDATE, no-op if unchanged)
+        user_id = session.get('kullanici_id') or session.get('user_id')
+        if not user_id:
+            return back
+        
+        from app.tasks.user_tasks import persist_user_language, update_user_language
+        if LANGUAGE_UPDATE_ASYNC:
+            from kombu.exceptions import OperationalError
+            try:
+                update_user_language.delay(user_id, lang)
+                return back
+            except OperationalError:
+                pass  # Broker yoksa senkron yaz
+        persist_user_language(user_id, lang)
+        return back
     
     app.logger.info(f"✅ i18n initialized with {len(SUPPORTED_LANGUAGES)} languages")
-
-
-# =====================================================
-# TRANSLATION STRINGS (for babel extraction)
-# Run: pybabel extract -F babel.cfg -o messages.pot .
-# =====================================================
-
-# Common UI strings
-_ = lazy_gettext
-
-# Navigation
-NAV_DASHBOARD = _('Dashboard')
-NAV_CANDIDATES = _('Adaylar')
-NAV_EXAMS = _('Sınavlar')
-NAV_REPORTS = _('Raporlar')
-NAV_SETTINGS = _('Ayarlar')
-NAV_LOGOUT = _('Çıkış')
-
-# Auth
-AUTH_LOGIN = _('Giriş Yap')
-AUTH_LOGOUT = _('Çıkış')
-AUTH_EMAIL = _('E-posta')
-AUTH_PASSWORD = _('Şifre')
-AUTH_FORGOT_PASSWORD = _('Şifremi Unuttum')
-AUTH_REMEMBER_ME = _('Beni Hatırla')
-
-# Buttons
-BTN_SAVE = _('Kaydet')
-BTN_CANCEL = _('İptal')
-BTN_DELETE = _('Sil')
-BTN_EDIT = _('Düzenle')
-BTN_ADD = _('Ekle')
-BTN_SEARCH = _('Ara')
-BTN_FILTER = _('Filtrele')
-BTN_EXPORT = _('Dışa Aktar')
-BTN_IMPORT = _('İçe Aktar')
-BTN_DOWNLOAD = _('İndir')
-BTN_UPLOAD = _('Yükle')
-BTN_SUBMIT = _('Gönder')
-BTN_BACK = _('Geri')
-BTN_NEXT = _('İleri')
-BTN_FINISH = _('Bitir')
-
-# Messages
-MSG_SUCCESS = _('İşlem başarılı!')
-MSG_ERROR = _('Bir hata oluştu.')
-MSG_CONFIRM_DELETE = _('Bu öğeyi silmek istediğinizden emin misiniz?')
-MSG_NO_DATA = _('Veri bulunamadı.')
-MSG_LOADING = _('Yükleniyor...')
-
-# CEFR Levels
-CEFR_A1 = _('Başlangıç')
-CEFR_A2 = _('Temel')
-CEFR_B1 = _('Orta')
-CEFR_B2 = _('Orta Üstü')
-CEFR_C1 = _('İleri')
-CEFR_C2 = _('Uzman')
-
-# Exam Related
-EXAM_STATUS_PENDING = _('Beklemede')
-EXAM_STATUS_IN_PROGRESS = _('Sınavda')
-EXAM_STATUS_COMPLETED = _('Tamamlandı')
-EXAM_START = _('Sınava Başla')
-EXAM_CONTINUE = _('Sınava Devam Et')
-EXAM_FINISH = _('Sınavı Bitir')
-EXAM_TIME_REMAINING = _('Kalan Süre')
-
-# Skills
-SKILL_GRAMMAR = _('Dilbilgisi')
-SKILL_VOCABULARY = _('Kelime Bilgisi')
-SKILL_READING = _('Okuma')
-SKILL_LISTENING = _('Dinleme')
-SKILL_WRITING = _('Yazma')
-SKILL_SPEAKING = _('Konuşma')
-
-# Time periods
-TIME_TODAY = _('Bugün')
-TIME_YESTERDAY = _('Dün')
-TIME_THIS_WEEK = _('Bu Hafta')
-TIME_THIS_MONTH = _('Bu Ay')
-TIME_LAST_MONTH = _('Geçen Ay')
-TIME_THIS_YEAR = _('Bu Yıl')
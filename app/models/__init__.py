@@ -10,7 +10,9 @@ from app.models.candidate import Candidate
 from app.models.question import Question, ListeningAudio, ListeningQuestion, ReadingPassage, ReadingQuestion
 from app.models.exam import ExamTemplate, ExamSection, ExamAnswer, SpeakingRecording
 from app.models.company import Company
-from app.models.audit_log import AuditLog
+from app.models.audit_log import AuditLog, UserAgent
+from app.models.admin import SystemSetting
+from app.models.email_log import EmailLog
 
 # Create alias for Answer (commonly used name for ExamAnswer)
 Answer = ExamAnswer
@@ -30,5 +32,8 @@ __all__ = [
     'Answer',  # Alias for ExamAnswer
     'SpeakingRecording',
     'Company',
-    'AuditLog'
+    'AuditLog',
+    'UserAgent',
+    'SystemSetting',
+    'EmailLog'
 ]
@@ -2,9 +2,13 @@
 """
 Admin Models - Additional models for admin functionality
 """
+import os
 from datetime import datetime
 from app.extensions import db
 
+# Bir istekte bu kadar audit satırı birikince isteğin kendi transaction'ı içinde yazılır
+AUDIT_BUFFER_MAX = int(os.getenv('AUDIT_BUFFER_MAX', '500'))
+
 
 class FraudCase(db.Model):
     """Track flagged fraud/cheating cases"""
@@ -12,8 +16,8 @@ class FraudCase(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
 
-    # Linked candidate
-    candidate_id = db.Column(db.Integer, db.ForeignKey('adaylar.id'), index=True)
+    # Linked candidate (ix_fraud_cases_candidate_created)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('adaylar.id'))
 
     # Detection details
     similarity_score = db.Column(db.Float)
@@ -33,8 +37,13 @@ class FraudCase(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Relationships
-    candidate = db.relationship('Candidate', backref='fraud_cases')
-    reviewer = db.relationship('User', foreign_keys=[reviewed_by], backref='reviewed_cases')
+    candidate = db.relationship('Candidate', back_populates='fraud_cases')
+    reviewer = db.relationship('User', foreign_keys=[reviewed_by], back_populates='reviewed_cases')
+
+    # Adayın vaka geçmişi tarih sırasıyla index'ten okunur (ayrı sort yok)
+    __table_args__ = (
+        db.Index('ix_fraud_cases_candidate_created', 'candidate_id', 'created_at'),
+    )
 
     def __repr__(self):
         return f'<FraudCase {self.id} - {self.status}>'
@@ -46,7 +55,7 @@ class ExamSchedule(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
 
-    candidate_id = db.Column(db.Integer, db.ForeignKey('adaylar.id'), index=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('adaylar.id'))  # ix_exam_schedules_candidate_scheduled
     template_id = db.Column(db.Integer, db.ForeignKey('sinav_sablonlari.id'))
 
     scheduled_at = db.Column(db.DateTime, nullable=False)
@@ -59,8 +68,13 @@ class ExamSchedule(db.Model):
     created_by = db.Column(db.Integer, db.ForeignKey('kullanicilar.id'))
 
     # Relationships
-    candidate = db.relationship('Candidate', backref='schedules')
-    template = db.relationship('ExamTemplate', backref='schedules')
+    candidate = db.relationship('Candidate', back_populates='schedules')
+    template = db.relationship('ExamTemplate', back_populates='schedules')
+
+    # Adayın planlı sınavları tarih sırasıyla index'ten okunur
+    __table_args__ = (
+        db.Index('ix_exam_schedules_candidate_scheduled', 'candidate_id', 'scheduled_at'),
+    )
 
     def __repr__(self):
         return f'<ExamSchedule {self.id} - {self.scheduled_at}>'
@@ -86,6 +100,13 @@ class LearningResource(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Öneriler sadece aktif kaynaklardan (skill, seviye) ile seçilir;
+    # PostgreSQL'de partial (sadece is_active = true satırlar), diğerlerinde tam index
+    __table_args__ = (
+        db.Index('ix_learning_resources_live_skill_level', 'skill', 'cefr_level',
+                 postgresql_where=db.text('is_active = true')),
+    )
+
     def __repr__(self):
         return f'<LearningResource {self.title}>'
 
@@ -112,8 +133,8 @@ class BulkImport(db.Model):
     completed_at = db.Column(db.DateTime)
 
     # Relationships
-    company = db.relationship('Company', backref='imports')
-    creator = db.relationship('User', foreign_keys=[created_by], backref='imports')
+    company = db.relationship('Company', back_populates='imports')
+    creator = db.relationship('User', foreign_keys=[created_by], back_populates='imports')
 
     def __repr__(self):
         return f'<BulkImport {self.id} - {self.status}>'
@@ -124,7 +145,7 @@ class CreditTransaction(db.Model):
     __tablename__ = 'credit_transactions'
 
     id = db.Column(db.Integer, primary_key=True)
-    company_id = db.Column(db.Integer, db.ForeignKey('sirketler.id'), index=True)
+    company_id = db.Column(db.Integer, db.ForeignKey('sirketler.id'))  # ix_credit_tx_company_created
 
     amount = db.Column(db.Integer, nullable=False)
     transaction_type = db.Column(db.String(20), index=True)
@@ -136,7 +157,12 @@ class CreditTransaction(db.Model):
     created_by = db.Column(db.Integer, db.ForeignKey('kullanicilar.id'))
 
     # Relationships
-    company = db.relationship('Company', backref='credit_transactions')
+    company = db.relationship('Company', back_populates='credit_transactions')
+
+    # Per-company history, newest first
+    __table_args__ = (
+        db.Index('ix_credit_tx_company_created', 'company_id', 'created_at'),
+    )
 
     def __repr__(self):
         return f'<CreditTransaction {self.id}: {self.amount}>'
@@ -157,27 +183,228 @@ class LoginAttempt(db.Model):
         return f'<LoginAttempt {self.email}: {"success" if self.success else "failed"}>'
 
 
-def log_action(user, action, entity_type, entity_id, description=None, 
+class SystemSetting(db.Model):
+    """Key/value system settings (SMTP, webhook, defaults)"""
+    __tablename__ = 'system_settings'
+
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(100), unique=True, nullable=False, index=True)
+    value = db.Column(db.Text)
+    description = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @classmethod
+    def as_dict(cls):
+        """
+        All settings as {key: value}, loaded with one SELECT per request.
+
+        The table is tiny, so the whole thing is cached on flask.g and
+        repeated reads in the same request do not hit the database.
+        """
+        from flask import g, has_app_context
+
+        if not has_app_context():
+            return {s.key: s.value for s in cls.query.all()}
+        cache = g.get('_settings_cache')
+        if cache is None:
+            cache = g._settings_cache = {s.key: s.value for s in cls.query.all()}
+        return cache
+
+    @classmethod
+    def get_value(cls, key, default=None):
+        """Single setting value (request-cached, see as_dict)."""
+        value = cls.as_dict().get(key)
+        return default if value is None else value
+
+    @classmethod
+    def upsert_many(cls, values):
+        """
+        Insert or update settings with a single INSERT ... ON CONFLICT (key)
+        statement - one roundtrip, no SELECT-then-write race.
+
+        Args:
+            values: dict of {key: value}
+        """
+        if not values:
+            return
+
+        # Bu istekteki önbellek artık eski
+        from flask import g, has_app_context
+        if has_app_context():
+            g.pop('_settings_cache', None)
+
+        now = datetime.utcnow()
+        rows = [{'key': k, 'value': v, 'created_at': now, 'updated_at': now} for k, v in values.items()]
+        dialect = db.session.get_bind().dialect.name
+
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            for row in rows:
+                setting = cls.query.filter_by(key=row['key']).first()
+                if setting:
+                    setting.value = row['value']
+                else:
+                    db.session.add(cls(key=row['key'], value=row['value']))
+            return
+
+        stmt = insert(cls).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.key],
+            set_={'value': stmt.excluded.value, 'updated_at': stmt.excluded.updated_at}
+        )
+        db.session.execute(stmt)
+
+    def __repr__(self):
+        return f'<SystemSetting {self.key}>'
+
+
+def _audit_row(user, action, entity_type, entity_id, description=None,
                old_value=None, new_value=None, request=None):
-    """Helper function to log an admin action"""
-    import json
-    from app.models.audit_log import AuditLog
-
-    log = AuditLog(
-        user_id=user.id if user else None,
-        user_email=user.email if user else 'system',
-        user_role=user.rol if user else 'system',
-        action=action,
-        table_name=entity_type,
-        record_id=entity_id,
-        description=description,
-        old_values=json.dumps(old_value) if old_value else None,
-        new_values=json.dumps(new_value) if new_value else None,
-        ip_address=request.remote_addr if request else None,
-        user_agent=request.user_agent.string if request else None
-    )
+    """Build an audit_logs row (dict) for log_action / log_actions_bulk."""
+    return {
+        'user_id': user.id if user else None,
+        'user_email': user.email if user else 'system',
+        'user_role': user.rol if user else 'system',
+        'action': action,
+        'table_name': entity_type,
+        'record_id': entity_id,
+        'description': description,
+        'old_values': old_value or None,
+        'new_values': new_value or None,
+        'ip_address': request.remote_addr if request else None,
+        'user_agent': request.user_agent.string if request else None,
+        'endpoint': request.endpoint if request else None,
+        'created_at': datetime.utcnow(),
+    }
 
-    db.session.add(log)
-    db.session.commit()
 
-    return log
+def log_action(user, action, entity_type, entity_id, description=None, 
+               old_value=None, new_value=None, request=None):
+    """
+    Helper function to log an admin action.
+
+    The row is queued with queue_audit_row (one INSERT per request).
+
+    Returns:
+        The audit row (dict)
+    """
+    row = _audit_row(user, action, entity_type, entity_id, description,
+                     old_value, new_value, request)
+    queue_audit_row(row)
+    return row
+
+
+def queue_audit_row(row):
+    """
+    Queue an audit_logs row (dict with every AuditLog column except id;
+    'user_agent' text in place of user_agent_id).
+
+    Inside a request rows collect on g._pending_audit and are written only
+    once the request's session commits (after_commit); a rollback drops
+    them. Rows queued after the last commit are written at teardown unless
+    the request failed or rolled back. A request that queues
+    AUDIT_BUFFER_MAX rows inserts them early inside its own transaction,
+    so they still commit or roll back with it. Outside a request (tasks,
+    CLI) the row is written now.
+    """
+    from flask import g, has_request_context
+
+    if not has_request_context():
+        log_actions_bulk([row])
+        db.session.commit()
+        return
+
+    pending = g.setdefault('_pending_audit', [])
+    pending.append(row)
+    if len(pending) >= AUDIT_BUFFER_MAX:
+        log_actions_bulk(g.pop('_pending_audit'))
+
+
+def log_actions_bulk(rows):
+    """
+    Insert many audit rows with one executemany INSERT (no ORM objects).
+    The caller commits.
+
+    Args:
+        rows: list of dicts with AuditLog column names; a 'user_agent'
+            string is swapped for its user_agent_id
+    """
+    if not rows:
+        return
+    from sqlalchemy import insert
+    from app.models.audit_log import AuditLog, resolve_user_agents
+
+    resolve_user_agents(db.session.connection(), rows)
+    db.session.execute(insert(AuditLog), rows)
+
+
+def flush_pending_audit(exc=None):
+    """
+    teardown_request hook: write rows queued after the request's last commit.
+
+    Nothing is written if the request raised or its session rolled back
+    since its last commit. Uses its own connection/transaction so nothing left uncommitted in the
+    request session is committed along with the audit rows.
+    """
+    from flask import g
+
+    rows = g.pop('_pending_audit', None)
+    if not rows:
+        return
+    if exc is not None or g.get('_audit_rolled_back'):
+        # İşlem hata/rollback ile bittiyse yapılmamış eylemi loglama
+        return
+    _write_audit_rows(rows)
+
+
+def _audit_after_commit(session):
+    """Session after_commit: the request's changes are durable, write its rows."""
+    from flask import g, has_request_context
+
+    # SAVEPOINT release da after_commit tetikler; dış transaction henüz bitmedi
+    if has_request_context() and not session.in_nested_transaction():
+        g._audit_rolled_back = False
+        rows = g.pop('_pending_audit', None)
+        if rows:
+            _write_audit_rows(rows)
+
+
+def _audit_after_rollback(session, previous_transaction):
+    """Session after_soft_rollback: drop rows for changes that never happened."""
+    from flask import g, has_request_context
+
+    # SAVEPOINT rollback'i (begin_nested) dış transaction'ı geri almaz
+    if has_request_context() and not previous_transaction.nested:
+        g.pop('_pending_audit', None)
+        g._audit_rolled_back = True
+
+
+def init_audit_buffer(app):
+    """Hook the per-request audit buffer into the app and the db session."""
+    from sqlalchemy import event
+
+    app.teardown_request(flush_pending_audit)
+    if not event.contains(db.session, 'after_commit', _audit_after_commit):
+        event.listen(db.session, 'after_commit', _audit_after_commit)
+        event.listen(db.session, 'after_soft_rollback', _audit_after_rollback)
+
+
+def _write_audit_rows(rows):
+    """
+    One executemany INSERT on a separate connection; user agent ids are
+    resolved in the same transaction. Failures are logged.
+    """
+    from sqlalchemy import insert
+    from app.models.audit_log import AuditLog, resolve_user_agents
+
+    try:
+        with db.engine.begin() as conn:
+            resolve_user_agents(conn, rows)
+            conn.execute(insert(AuditLog.__table__), rows)
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).error(f"Audit log flush failed ({len(rows)} rows): {e}")
@@ -3,9 +3,122 @@
 Audit Log Model
 Tracks all admin and sensitive operations for compliance
 """
+import os
+import hashlib
+from collections import OrderedDict
 from datetime import datetime
+from sqlalchemy.dialects.postgresql import JSONB
 from app.extensions import db
-import json
+
+# dict -> JSON (JSONB on PostgreSQL); None is stored as SQL NULL, not JSON null
+_JSONValues = db.JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), 'postgresql')
+
+# SHA-1 digest -> user_agents.id, per worker process (LRU)
+USER_AGENT_CACHE_MAX = int(os.getenv('USER_AGENT_CACHE_MAX', '1024'))
+_user_agent_ids = OrderedDict()
+
+
+class UserAgent(db.Model):
+    """Distinct client user agent strings, referenced by audit_logs.user_agent_id"""
+    __tablename__ = 'user_agents'
+
+    id = db.Column(db.Integer, primary_key=True)
+    ua_hash = db.Column(db.LargeBinary(20), unique=True, nullable=False)  # SHA-1(ua_text)
+    ua_text = db.Column(db.Text, nullable=False)
+
+    def __repr__(self):
+        return f'<UserAgent {self.id}>'
+
+
+def _insert_ignore(dialect):
+    """INSERT that skips a row whose ua_hash already exists."""
+    table = UserAgent.__table__
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert(table).on_conflict_do_nothing(index_elements=['ua_hash'])
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert(table).on_conflict_do_nothing(index_elements=['ua_hash'])
+    return table.insert().prefix_with('IGNORE')
+
+
+def _ua_digest(ua_text):
+    return hashlib.sha1(ua_text.encode('utf-8')).digest()
+
+
+def _remember_user_agent(digest, ua_id):
+    _user_agent_ids[digest] = ua_id
+    _user_agent_ids.move_to_end(digest)
+    if len(_user_agent_ids) > USER_AGENT_CACHE_MAX:
+        _user_agent_ids.popitem(last=False)
+
+
+def user_agent_ids(conn, ua_texts):
+    """
+    Map user agent strings to user_agents.id on conn, inserting new ones.
+
+    Uncached strings are resolved with one SELECT, plus one INSERT and one
+    SELECT for strings never seen before, inside the caller's transaction.
+    Only ids that already existed are cached; a row inserted here could
+    still be rolled back with that transaction.
+
+    Returns:
+        {ua_text: id}
+    """
+    ids, missing = {}, {}
+    for ua_text in ua_texts:
+        if not ua_text:
+            continue
+        digest = _ua_digest(ua_text)
+        ua_id = _user_agent_ids.get(digest)
+        if ua_id is None:
+            missing[digest] = ua_text
+        else:
+            _user_agent_ids.move_to_end(digest)
+            ids[ua_text] = ua_id
+    if not missing:
+        return ids
+
+    table = UserAgent.__table__
+
+    def lookup(digests):
+        stmt = db.select(table.c.ua_hash, table.c.id).where(table.c.ua_hash.in_(digests))
+        # psycopg2 bytea -> memoryview
+        return {bytes(ua_hash): ua_id for ua_hash, ua_id in conn.execute(stmt)}
+
+    found = lookup(list(missing))
+    for digest, ua_id in found.items():
+        _remember_user_agent(digest, ua_id)
+
+    new = [d for d in missing if d not in found]
+    if new:
+        conn.execute(_insert_ignore(conn.dialect.name),
+                     [{'ua_hash': d, 'ua_text': missing[d]} for d in new])
+        found.update(lookup(new))
+
+    for digest, ua_text in missing.items():
+        ids[ua_text] = found.get(digest)
+    return ids
+
+
+def user_agent_id(ua_text, conn=None):
+    """user_agents.id for one user agent string (see user_agent_ids)."""
+    if not ua_text:
+        return None
+    if conn is None:
+        conn = db.session.connection()
+    return user_agent_ids(conn, [ua_text]).get(ua_text)
+
+
+def resolve_user_agents(conn, rows):
+    """
+    Replace each queued row's 'user_agent' text with 'user_agent_id', in
+    place, resolving every distinct string on conn at once.
+    """
+    ids = user_agent_ids(conn, {row['user_agent'] for row in rows if row.get('user_agent')})
+    for row in rows:
+        if 'user_agent' in row:
+            row['user_agent_id'] = ids.get(row.pop('user_agent'))
 
 
 class AuditLog(db.Model):
@@ -22,7 +135,7 @@ class AuditLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
 
     # Who - ForeignKey ile düzeltildi
-    user_id = db.Column(db.Integer, db.ForeignKey('kullanicilar.id'), index=True, nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('kullanicilar.id'), nullable=True)  # ix_audit_logs_user_created
     user_email = db.Column(db.String(255))
     user_role = db.Column(db.String(50))  # admin, superadmin, etc.
 
@@ -32,37 +145,34 @@ class AuditLog(db.Model):
     record_id = db.Column(db.Integer)
 
     # Details
-    old_values = db.Column(db.Text)  # JSON of previous values
-    new_values = db.Column(db.Text)  # JSON of new values
+    old_values = db.Column(_JSONValues)  # previous values (dict)
+    new_values = db.Column(_JSONValues)  # new values (dict)
     description = db.Column(db.String(500))
 
     # Context
     ip_address = db.Column(db.String(45))
-    user_agent = db.Column(db.String(500))
+    user_agent_id = db.Column(db.Integer, db.ForeignKey('user_agents.id'), nullable=True)
     endpoint = db.Column(db.String(200))
 
     # When
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
     # Relationship - Yeni eklendi
-    user = db.relationship('User', backref='audit_logs', lazy='select')
+    user = db.relationship('User', back_populates='audit_logs', lazy='select')
+    agent = db.relationship('UserAgent', lazy='select')
+
+    # Kullanıcı bazlı audit geçmişi: user_id filtresi, en yeni önce
+    __table_args__ = (
+        db.Index('ix_audit_logs_user_created', 'user_id', 'created_at'),
+    )
 
     def __repr__(self):
         return f'<AuditLog {self.action} {self.table_name}:{self.record_id}>'
 
     @property
-    def old_data(self):
-        """Parse old values from JSON."""
-        if self.old_values:
-            return json.loads(self.old_values)
-        return {}
-
-    @property
-    def new_data(self):
-        """Parse new values from JSON."""
-        if self.new_values:
-            return json.loads(self.new_values)
-        return {}
+    def user_agent(self):
+        """Client user agent string (from the user_agents lookup table)."""
+        return self.agent.ua_text if self.agent else None
 
     @classmethod
     def log(cls, user_id: int, user_email: str, action: str,
@@ -98,16 +208,52 @@ class AuditLog(db.Model):
             action=action,
             table_name=table_name,
             record_id=record_id,
-            old_values=json.dumps(old_values) if old_values else None,
-            new_values=json.dumps(new_values) if new_values else None,
+            old_values=old_values or None,
+            new_values=new_values or None,
             description=description,
             ip_address=ip_address,
-            user_agent=user_agent,
+            user_agent_id=user_agent_id(user_agent),
             endpoint=endpoint
         )
         db.session.add(log)
         return log
 
+    @classmethod
+    def buffer_log(cls, user_id: int = None, user_email: str = None, action: str = None,
+                   table_name: str = None, record_id: int = None,
+                   old_values: dict = None, new_values: dict = None,
+                   description: str = None, ip_address: str = None,
+                   user_agent: str = None, endpoint: str = None,
+                   user_role: str = None):
+        """
+        Queue an audit row instead of adding an ORM object (same arguments as log()).
+
+        Inside a request queued rows are written in one INSERT once the
+        request's session commits (see app.models.admin.queue_audit_row).
+
+        Returns:
+            The row (dict)
+        """
+        from app.models.admin import queue_audit_row
+
+        row = {
+            'user_id': user_id,
+            'user_email': user_email,
+            'user_role': user_role,
+            'action': action,
+            'table_name': table_name,
+            'record_id': record_id,
+            'description': description,
+            'old_values': old_values or None,
+            'new_values': new_values or None,
+            'ip_address': ip_address,
+            'user_agent': user_agent,  # id'ye yazılırken çevrilir
+            'endpoint': endpoint,
+            'created_at': datetime.utcnow(),
+        }
+        queue_audit_row(row)
+        return row
+
     @classmethod
     def log_login(cls, user_id: int, user_email: str, success: bool,
                   ip_address: str = None, user_agent: str = None):
@@ -183,9 +329,9 @@ def audit_action(action: str, table_name: str = None, get_record_id=None):
             # Execute the function
             result = func(*args, **kwargs)
 
-            # Log the action
+            # Log the action (queued, written with the request's other rows)
             try:
-                AuditLog.log(
+                AuditLog.buffer_log(
                     user_id=user_id,
                     user_email=user_email,
                     user_role=user_role,
@@ -196,7 +342,6 @@ def audit_action(action: str, table_name: str = None, get_record_id=None):
                     user_agent=request.user_agent.string if request else None,
                     endpoint=request.endpoint if request else None
                 )
-                db.session.commit()
             except Exception:
                 pass  # Don't fail the main operation
 
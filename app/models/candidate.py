@@ -3,7 +3,10 @@
 Candidate Model - Exam takers
 """
 from datetime import datetime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.mutable import MutableList
 from app.extensions import db
+from app.models.functions import utcnow
 
 
 class Candidate(db.Model):
@@ -64,9 +67,10 @@ class Candidate(db.Model):
     is_deleted = db.Column(db.Boolean, default=False)
     is_anonymized = db.Column(db.Boolean, default=False)  # KVKK data retention
     admin_notes = db.Column(db.Text)
-    tags = db.Column(db.Text)  # JSON tags
+    # JSON liste; PostgreSQL'de JSONB (driver bir kez decode eder), append() kirletir
+    tags = db.Column(MutableList.as_mutable(db.JSON().with_variant(JSONB(), 'postgresql')), default=list)
     consent_given = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=utcnow())
     
     # KVKK Consent Fields
     foreign_data_consent = db.Column(db.Boolean, default=False)  # AI processing consent
@@ -80,13 +84,38 @@ class Candidate(db.Model):
     listening_replays_used = db.Column(db.Integer, default=0)  # Number of replay uses
     benchmark_percentile = db.Column(db.Float)  # Compared to other candidates
     
+    # Exam security counters (updated by /api/security/log)
+    tab_switch_count = db.Column(db.Integer, default=0)
+    blur_count = db.Column(db.Integer, default=0)
+    
     # Relationships with cascade delete (prevents orphan records)
-    company = db.relationship('Company', backref='candidates')
-    answers = db.relationship('ExamAnswer', backref='candidate', lazy='dynamic',
+    company = db.relationship('Company', back_populates='candidates')
+    # Liste (dynamic değil): toplu sayfalarda selectinload(Candidate.answers) ile 2 sorgu
+    answers = db.relationship('ExamAnswer', back_populates='candidate',
                              cascade='all, delete-orphan')
-    recordings = db.relationship('SpeakingRecording', backref='candidate', lazy='dynamic',
+    recordings = db.relationship('SpeakingRecording', back_populates='candidate', lazy='dynamic',
                                 cascade='all, delete-orphan')
+    fraud_cases = db.relationship('FraudCase', back_populates='candidate',
+                                  order_by='FraudCase.created_at.desc()')
+    schedules = db.relationship('ExamSchedule', back_populates='candidate',
+                                order_by='ExamSchedule.scheduled_at.desc()')
+    
+    # Şirket aday listesi (API + panel): silinmemiş adaylar, en yeni önce
+    # (created_at, id) sırası API keyset (cursor) sayfalamasını index'ten okur
+    # Dashboard durum filtresi (sinav_durumu) için ayrı index
+    # PostgreSQL'de partial (sadece is_deleted = false satırlar), diğerlerinde tam index
+    __table_args__ = (
+        db.Index('ix_adaylar_live_sirket_created_id', 'sirket_id', 'created_at', 'id',
+                 postgresql_where=db.text('is_deleted = false')),
+        db.Index('ix_adaylar_live_sirket_durum_created_id', 'sirket_id', 'sinav_durumu', 'created_at', 'id',
+                 postgresql_where=db.text('is_deleted = false')),
+    )
     
+    # p_<skill> kolonları
+    SKILLS = ('grammar', 'vocabulary', 'reading', 'listening', 'writing', 'speaking')
+    # dogru_mu ile puanlanan beceriler; writing/speaking AI puanıdır
+    OBJECTIVE_SKILLS = ('grammar', 'vocabulary', 'reading', 'listening')
+
     def calculate_total_score(self):
         """Calculate weighted total score"""
         weights = {
@@ -110,6 +139,85 @@ class Candidate(db.Model):
         self.puan = round(total, 2)
         return self.puan
     
+    def finalize_scores(self):
+        """
+        Compute the stored result columns at exam submission.
+
+        One GROUP BY over cevaplar LEFT JOIN sorular (ix_cevaplar_aday_soru range
+        scan) fills p_<kategori> with the percentage of correct answers for the
+        objective skills and puan with the overall percentage; sinav_durumu
+        becomes 'tamamlandi'. p_writing/p_speaking come from AI evaluation
+        (dogru_mu is NULL there) and are left untouched.
+        These columns are the canonical snapshot - result pages read them
+        instead of re-aggregating answers. The caller commits.
+
+        Returns:
+            Number of answers counted
+        """
+        from sqlalchemy import func, case
+        from app.models.exam import ExamAnswer
+        from app.models.question import Question
+
+        rows = db.session.query(
+            Question.kategori,
+            func.count(ExamAnswer.id),
+            func.sum(case((ExamAnswer.dogru_mu.is_(True), 1), else_=0)),
+        ).outerjoin(Question, Question.id == ExamAnswer.soru_id).filter(
+            ExamAnswer.aday_id == self.id
+        ).group_by(Question.kategori).all()
+
+        toplam = dogru = 0
+        for kategori, sayi, dogru_sayi in rows:
+            dogru_sayi = dogru_sayi or 0
+            toplam += sayi
+            dogru += dogru_sayi
+            # Yazma/konuşma AI puanı korunur (cevapları dogru_mu=NULL)
+            if kategori in self.OBJECTIVE_SKILLS:
+                setattr(self, f'p_{kategori}', round(dogru_sayi * 100.0 / sayi, 2))
+
+        self.puan = max(0, min(100, int(dogru * 100 / toplam))) if toplam else 0
+        self.sinav_durumu = 'tamamlandi'
+        self.bitis_tarihi = datetime.utcnow()
+        return toplam
+
+    def assign_login_code(self, attempts=3):
+        """
+        Give the candidate a new random giris_kodu and flush it in a SAVEPOINT.
+
+        The UNIQUE constraint on giris_kodu is the collision check: on an
+        IntegrityError only the savepoint is rolled back and a new code is
+        tried. New candidates are added to the session here.
+
+        Other integrity errors (e.g. a bad sirket_id) are raised at once.
+
+        Returns:
+            The assigned code (the caller commits)
+        """
+        from sqlalchemy.exc import IntegrityError
+        from app.utils.helpers import generate_code
+
+        for attempt in range(attempts):
+            self.giris_kodu = generate_code()
+            try:
+                with db.session.begin_nested():
+                    db.session.add(self)
+                return self.giris_kodu
+            except IntegrityError as e:
+                if attempt == attempts - 1 or not Candidate.is_login_code_conflict(e):
+                    raise
+
+    @staticmethod
+    def is_login_code_conflict(error):
+        """True if an IntegrityError is the giris_kodu UNIQUE index (safe to retry)."""
+        orig = getattr(error, 'orig', None)
+        diag = getattr(orig, 'diag', None)  # psycopg2
+        constraint = getattr(diag, 'constraint_name', None)
+        if constraint:
+            return 'giris_kodu' in constraint
+        # SQLite: "UNIQUE constraint failed: adaylar.giris_kodu"
+        # MySQL: "Duplicate entry ... for key 'ix_adaylar_giris_kodu'"
+        return 'giris_kodu' in str(orig or error)
+
     def get_cefr_level(self):
         """Get CEFR level from score - inline to avoid circular import"""
         score = self.puan or 0
@@ -4,6 +4,7 @@ Company Model - Multi-tenant support
 """
 from datetime import datetime
 from app.extensions import db
+from app.models.functions import utcnow
 
 
 class Company(db.Model):
@@ -36,7 +37,17 @@ class Company(db.Model):
     smtp_pass = db.Column(db.String(255))
     smtp_from = db.Column(db.String(255))
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=utcnow())
+    
+    # Relationships
+    # Şirket başına çok kullanıcı: sadece erişildiğinde yüklenir
+    users = db.relationship('User', back_populates='company')
+    candidates = db.relationship('Candidate', back_populates='company')
+    questions = db.relationship('Question', back_populates='company')
+    imports = db.relationship('BulkImport', back_populates='company')
+    # İki ayrı CreditTransaction sınıfı var: modül yolu ile ayrılır
+    credit_transactions = db.relationship('app.models.admin.CreditTransaction', back_populates='company')
+    transactions = db.relationship('app.models.company.CreditTransaction', back_populates='company')
     
     def deduct_credit(self, amount=1, transaction_type='exam', description=None, 
                       candidate_id=None, user_id=None):
@@ -59,30 +70,65 @@ class Company(db.Model):
         
         # ATOMIC UPDATE - prevents race condition
         # Uses database-level update instead of Python-level
-        from sqlalchemy import text
+        from sqlalchemy import update, insert, select, literal
+        from sqlalchemy.orm.attributes import set_committed_value
         
-        result = db.session.execute(
-            text("""
-                UPDATE sirketler 
-                SET kredi = kredi - :amount 
-                WHERE id = :company_id AND kredi >= :amount
-            """),
-            {'amount': amount, 'company_id': self.id}
-        )
+        sirketler = Company.__table__
+        stmt = update(sirketler).where(
+            sirketler.c.id == self.id,
+            sirketler.c.kredi >= amount
+        ).values(kredi=sirketler.c.kredi - amount)
+        aciklama = description or f'{transaction_type} için {amount} kredi düşüldü'
+        dialect = db.session.get_bind().dialect
         
-        # Check if update was successful (affected 1 row)
-        if result.rowcount == 0:
-            return False
+        if dialect.name == 'postgresql':
+            # Writable CTE: UPDATE + kredi_hareketleri INSERT in one statement
+            upd = stmt.returning(
+                (sirketler.c.kredi + amount).label('onceki_bakiye'),
+                sirketler.c.kredi.label('sonraki_bakiye')
+            ).cte('upd')
+            hareketler = CreditTransaction.__table__
+            values = {
+                'sirket_id': self.id,
+                'islem_tipi': transaction_type,
+                'miktar': -amount,  # Negative for deduction
+                'aciklama': aciklama,
+                'aday_id': candidate_id,
+                'kullanici_id': user_id,
+                'created_at': datetime.utcnow(),
+            }
+            columns = [literal(v, hareketler.c[k].type).label(k) for k, v in values.items()]
+            new_balance = db.session.execute(
+                insert(hareketler).from_select(
+                    list(values) + ['onceki_bakiye', 'sonraki_bakiye'],
+                    select(*columns, upd.c.onceki_bakiye, upd.c.sonraki_bakiye)
+                ).returning(hareketler.c.sonraki_bakiye)
+            ).scalar()
+            if new_balance is None:
+                return False
+            # Loaded (not dirty) value: flush must not write kredi back
+            set_committed_value(self, 'kredi', new_balance)
+            return True
         
-        # Refresh the object to get updated kredi value
-        db.session.refresh(self)
+        if dialect.update_returning:
+            # UPDATE ... RETURNING: new balance in the same round trip
+            new_balance = db.session.execute(stmt.returning(sirketler.c.kredi)).scalar()
+            if new_balance is None:
+                return False
+            set_committed_value(self, 'kredi', new_balance)
+        else:
+            # Check if update was successful (affected 1 row)
+            if db.session.execute(stmt).rowcount == 0:
+                return False
+            # Refresh the object to get updated kredi value
+            db.session.refresh(self, ['kredi'])
         
         # Create transaction record for audit trail
         transaction = CreditTransaction(
             sirket_id=self.id,
             islem_tipi=transaction_type,
             miktar=-amount,  # Negative for deduction
-            aciklama=description or f'{transaction_type} için {amount} kredi düşüldü',
+            aciklama=aciklama,
             onceki_bakiye=self.kredi + amount,  # Balance before deduction
             sonraki_bakiye=self.kredi,          # Balance after deduction
             aday_id=candidate_id,
@@ -152,7 +198,7 @@ class CreditTransaction(db.Model):
     __tablename__ = 'kredi_hareketleri'
     
     id = db.Column(db.Integer, primary_key=True)
-    sirket_id = db.Column(db.Integer, db.ForeignKey('sirketler.id'), index=True)
+    sirket_id = db.Column(db.Integer, db.ForeignKey('sirketler.id'))  # ix_kredi_hareketleri_sirket_created
     
     # Transaction details
     islem_tipi = db.Column(db.String(50))  # exam, email, api, purchase, refund, bonus
@@ -171,7 +217,12 @@ class CreditTransaction(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
-    company = db.relationship('Company', backref='transactions')
+    company = db.relationship('Company', back_populates='transactions')
+    
+    # Şirket kredi geçmişi: sirket_id filtresi, en yeni önce (get_credit_history)
+    __table_args__ = (
+        db.Index('ix_kredi_hareketleri_sirket_created', 'sirket_id', 'created_at'),
+    )
     
     def to_dict(self):
         return {
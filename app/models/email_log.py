@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+Email Log Model
+Delivery record for transactional emails (invitation, result, reset)
+"""
+from datetime import datetime
+from app.extensions import db
+
+
+class EmailLog(db.Model):
+    """Email log modeli"""
+    __tablename__ = 'email_logs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipient = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(200))
+    email_type = db.Column(db.String(50))  # invitation, result, reset, etc.
+    status = db.Column(db.String(20), default='pending')  # pending, sent, failed
+    error_message = db.Column(db.Text)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('adaylar.id'), nullable=True, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<EmailLog {self.recipient} - {self.status}>'
@@ -29,7 +29,8 @@ class ExamTemplate(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
-    sections = db.relationship('ExamSection', backref='template', lazy='dynamic')
+    sections = db.relationship('ExamSection', back_populates='template', lazy='dynamic')
+    schedules = db.relationship('ExamSchedule', back_populates='template')
     
     def __repr__(self):
         return f'<ExamTemplate {self.isim}>'
@@ -47,6 +48,9 @@ class ExamSection(db.Model):
     question_count = db.Column(db.Integer, default=5)
     time_limit = db.Column(db.Integer)  # seconds, per section
     
+    # Relationships
+    template = db.relationship('ExamTemplate', back_populates='sections')
+    
     def __repr__(self):
         return f'<ExamSection {self.section_name}>'
 
@@ -56,7 +60,7 @@ class ExamAnswer(db.Model):
     __tablename__ = 'cevaplar'
     
     id = db.Column(db.Integer, primary_key=True)
-    aday_id = db.Column(db.Integer, db.ForeignKey('adaylar.id'), index=True)
+    aday_id = db.Column(db.Integer, db.ForeignKey('adaylar.id'))  # ix_cevaplar_aday_soru ile indexli
     soru_id = db.Column(db.Integer, db.ForeignKey('sorular.id'), index=True)
     
     verilen_cevap = db.Column(db.Text)
@@ -68,8 +72,58 @@ class ExamAnswer(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
-    question = db.relationship('Question', backref='answers')
+    candidate = db.relationship('Candidate', back_populates='answers')
+    question = db.relationship('Question', back_populates='answers')
+    
+    # Aday cevapları (aday_id) ve cevap tekrar kontrolü (aday_id + soru_id)
+    __table_args__ = (
+        db.Index('ix_cevaplar_aday_soru', 'aday_id', 'soru_id'),
+    )
     
+    @classmethod
+    def bulk_submit(cls, aday_id, answers):
+        """
+        Insert a batch of answers with one SELECT and one executemany INSERT.
+
+        Questions the candidate has already answered (or that repeat within
+        the batch) are skipped, so re-sending the same batch is harmless.
+        The caller commits.
+
+        Args:
+            aday_id: Candidate id
+            answers: list of {'soru_id', 'verilen_cevap', 'dogru_mu'} dicts;
+                only dogru_mu=True (the boolean) is stored as correct
+
+        Returns:
+            Number of rows inserted
+        """
+        answered = {
+            soru_id for (soru_id,) in
+            db.session.query(cls.soru_id).filter(cls.aday_id == aday_id)
+        }
+
+        now = datetime.utcnow()
+        rows = []
+        for answer in answers:
+            try:
+                soru_id = int(answer.get('soru_id'))
+            except (TypeError, ValueError):
+                continue
+            if soru_id in answered:
+                continue
+            answered.add(soru_id)
+            rows.append({
+                'aday_id': aday_id,
+                'soru_id': soru_id,
+                'verilen_cevap': answer.get('verilen_cevap'),
+                'dogru_mu': answer.get('dogru_mu') is True,  # "false" gibi metinler doğru sayılmaz
+                'created_at': now,
+            })
+
+        if rows:
+            db.session.execute(cls.__table__.insert(), rows)
+        return len(rows)
+
     def __repr__(self):
         return f'<ExamAnswer {self.aday_id}:{self.soru_id}>'
 
@@ -97,6 +151,9 @@ class SpeakingRecording(db.Model):
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Relationships
+    candidate = db.relationship('Candidate', back_populates='recordings')
+    
     def save_audio(self, audio_data: bytes, extension: str = 'webm'):
         """
         Save audio to file system (recommended method).
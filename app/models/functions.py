@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+SQL Functions - dialect-aware expressions shared by models
+"""
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import expression
+from sqlalchemy.types import DateTime
+
+
+class utcnow(expression.FunctionElement):
+    """
+    Current UTC time as a naive timestamp, computed by the database.
+    Matches the Python-side datetime.utcnow() defaults already stored.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return 'CURRENT_TIMESTAMP'
+
+
+@compiles(utcnow, 'postgresql')
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, 'mssql')
+def _utcnow_mssql(element, compiler, **kw):
+    return 'GETUTCDATE()'
@@ -19,7 +19,7 @@ class Question(db.Model):
     dogru_cevap = db.Column(db.String(1))  # A, B, C, D
     
     # Categorization
-    kategori = db.Column(db.String(50), index=True)  # grammar, vocabulary, reading
+    kategori = db.Column(db.String(50))  # grammar, vocabulary, reading (ix_sorular_kategori_zorluk_id ile indexli)
     zorluk = db.Column(db.String(10), default='B1', index=True)  # A1-C2
     soru_tipi = db.Column(db.String(20), default='SECMELI')  # SECMELI, YAZILI, KONUSMA
     
@@ -41,7 +41,16 @@ class Question(db.Model):
     last_calibrated = db.Column(db.DateTime)
     
     # Relationships
-    company = db.relationship('Company', backref='questions')
+    company = db.relationship('Company', back_populates='questions')
+    answers = db.relationship('ExamAnswer', back_populates='question')
+    
+    # Soru havuzu filtresi (kategori + zorluk, en yeni önce)
+    # Sınav/API soru seçimi: sadece aktif sorular (PostgreSQL'de partial index)
+    __table_args__ = (
+        db.Index('ix_sorular_kategori_zorluk_id', 'kategori', 'zorluk', 'id'),
+        db.Index('ix_sorular_live_sirket_kategori_zorluk', 'sirket_id', 'kategori', 'zorluk',
+                 postgresql_where=db.text('is_active = true')),
+    )
     
     def to_dict(self):
         return {
@@ -75,7 +84,7 @@ class ListeningAudio(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
-    questions = db.relationship('ListeningQuestion', backref='audio', lazy='dynamic')
+    questions = db.relationship('ListeningQuestion', back_populates='audio', lazy='dynamic')
     
     def __repr__(self):
         return f'<ListeningAudio {self.title}>'
@@ -95,6 +104,9 @@ class ListeningQuestion(db.Model):
     dogru_cevap = db.Column(db.String(1))
     soru_sirasi = db.Column(db.Integer, default=1)
     
+    # Relationships
+    audio = db.relationship('ListeningAudio', back_populates='questions')
+    
     def __repr__(self):
         return f'<ListeningQuestion {self.id}>'
 
@@ -114,7 +126,7 @@ class ReadingPassage(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
-    questions = db.relationship('ReadingQuestion', backref='passage', lazy='dynamic')
+    questions = db.relationship('ReadingQuestion', back_populates='passage', lazy='dynamic')
     
     def __repr__(self):
         return f'<ReadingPassage {self.title}>'
@@ -134,5 +146,8 @@ class ReadingQuestion(db.Model):
     secenek_d = db.Column(db.Text)
     dogru_cevap = db.Column(db.String(255))
     
+    # Relationships
+    passage = db.relationship('ReadingPassage', back_populates='questions')
+    
     def __repr__(self):
         return f'<ReadingQuestion {self.id}>'
@@ -4,7 +4,8 @@ User Model - Admin users and system users
 """
 from datetime import datetime
 from app.extensions import db
-import bcrypt
+from app.models.functions import utcnow
+from app.utils.passwords import hash_password, verify_password
 
 
 class User(db.Model):
@@ -18,7 +19,7 @@ class User(db.Model):
     rol = db.Column(db.String(50), default='customer')  # superadmin, customer
     sirket_id = db.Column(db.Integer, db.ForeignKey('sirketler.id'), index=True)
     is_active = db.Column(db.Boolean, default=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, server_default=utcnow())
     last_login = db.Column(db.DateTime)
     
     # Two-Factor Authentication fields
@@ -30,7 +31,11 @@ class User(db.Model):
     language = db.Column(db.String(10), default='tr')  # Preferred language
     
     # Relationships
-    company = db.relationship('Company', backref='users')
+    # 1-1 ve küçük satır: User yüklenirken tek LEFT JOIN ile gelir (ek SELECT yok)
+    company = db.relationship('Company', back_populates='users', lazy='joined')
+    audit_logs = db.relationship('AuditLog', back_populates='user')
+    reviewed_cases = db.relationship('FraudCase', foreign_keys='FraudCase.reviewed_by', back_populates='reviewer')
+    imports = db.relationship('BulkImport', foreign_keys='BulkImport.created_by', back_populates='creator')
     
     # ══════════════════════════════════════════════════════════════
     # ROLE HELPERS
@@ -70,17 +75,11 @@ class User(db.Model):
     
     def set_password(self, password):
         """Hash and set password"""
-        self.sifre_hash = bcrypt.hashpw(
-            password.encode('utf-8'), 
-            bcrypt.gensalt()
-        ).decode('utf-8')
+        self.sifre_hash = hash_password(password)
     
     def check_password(self, password):
         """Verify password"""
-        return bcrypt.checkpw(
-            password.encode('utf-8'), 
-            self.sifre_hash.encode('utf-8')
-        )
+        return verify_password(password, self.sifre_hash)
     
     def to_dict(self):
         """Convert to dictionary"""
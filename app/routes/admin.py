@@ -3,30 +3,48 @@
 Admin Routes - Super Admin Panel
 GitHub: app/routes/admin.py
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
-from functools import wraps
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, g
 from datetime import datetime
+from collections import namedtuple
 import logging
+import time
+
+from app.utils.helpers import lazy_load_guard
+from app.utils.stats_cache import cached_stats, invalidate_stats, REPORT_STATS_TTL
 
 logger = logging.getLogger(__name__)
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+# Kullanıcı formundaki şirket listesi için süreç içi kısa ömürlü önbellek
+SIRKETLER_CACHE_TTL = 60
+SirketSecenek = namedtuple('SirketSecenek', ['id', 'isim'])
+_sirketler_cache = {'expires': 0.0, 'value': None}
 
-def superadmin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if 'kullanici_id' not in session:
-            flash('Bu sayfaya erişmek için giriş yapmalısınız.', 'warning')
-            return redirect(url_for('auth.login'))
 
-        rol = session.get('rol', '')
-        if rol not in ['superadmin', 'super_admin', 'admin']:
-            flash('Bu sayfaya erişim yetkiniz yok.', 'danger')
-            return redirect(url_for('main.index'))
+SUPERADMIN_ROLES = ('superadmin', 'super_admin', 'admin')
+
 
-        return f(*args, **kwargs)
-    return decorated_function
+@admin_bp.before_request
+def _require_superadmin():
+    """
+    Access check for every admin_bp route, run once per request.
+    Session values are read here and kept on g (g.user_role, g.sirket_id).
+    """
+    if 'kullanici_id' not in session:
+        flash('Bu sayfaya erişmek için giriş yapmalısınız.', 'warning')
+        return redirect(url_for('auth.login'))
+
+    g.user_role = session.get('rol', '')
+    g.sirket_id = session.get('sirket_id')
+    if g.user_role not in SUPERADMIN_ROLES:
+        flash('Bu sayfaya erişim yetkiniz yok.', 'danger')
+        return redirect(url_for('main.index'))
+
+
+def superadmin_required(f):
+    """Marks an admin view; the check itself runs in _require_superadmin (before_request)."""
+    return f
 
 
 def delete_candidate_related_data(candidate_id):
@@ -81,6 +99,25 @@ def delete_candidate_related_data(candidate_id):
     return silinen_veriler
 
 
+def list_sirketler():
+    """Form select kutuları için (id, isim) listesi - TTL önbellekli"""
+    now = time.monotonic()
+    if _sirketler_cache['value'] is not None and now < _sirketler_cache['expires']:
+        return _sirketler_cache['value']
+
+    from app.models import Company
+    rows = Company.query.with_entities(Company.id, Company.isim).order_by(Company.isim).all()
+    value = [SirketSecenek(row.id, row.isim) for row in rows]
+    _sirketler_cache['value'] = value
+    _sirketler_cache['expires'] = now + SIRKETLER_CACHE_TTL
+    return value
+
+
+def invalidate_sirketler_cache():
+    _sirketler_cache['value'] = None
+    _sirketler_cache['expires'] = 0.0
+
+
 # ==================== DASHBOARD ====================
 @admin_bp.route('/')
 @admin_bp.route('/dashboard')
@@ -96,15 +133,27 @@ def dashboard():
     son_adaylar = []
 
     try:
+        from sqlalchemy import func, select, lambda_stmt
         from app.models import Company, User, Question, Candidate
-        stats = {
-            'toplam_sirket': Company.query.count(),
-            'toplam_kullanici': User.query.count(),
-            'toplam_soru': Question.query.count(),
-            'toplam_aday': Candidate.query.count(),
-        }
-        son_sirketler = Company.query.order_by(Company.id.desc()).limit(5).all()
-        son_adaylar = Candidate.query.order_by(Candidate.id.desc()).limit(5).all()
+        from app.extensions import db
+
+        def _sayaclar():
+            # Dört tablo sayacı tek SELECT'te (skaler alt sorgular)
+            row = db.session.query(*[
+                select(func.count()).select_from(model).scalar_subquery().label(key)
+                for key, model in (('toplam_sirket', Company), ('toplam_kullanici', User),
+                                   ('toplam_soru', Question), ('toplam_aday', Candidate))
+            ]).one()
+            return dict(row._mapping)
+
+        stats = cached_stats('admin_dashboard', _sayaclar)
+        # Sabit sorgular: lambda_stmt ile SELECT bir kez kurulur ve cache key'i saklanır
+        son_sirketler = db.session.scalars(
+            lambda_stmt(lambda: select(Company).order_by(Company.id.desc()).limit(5))
+        ).all()
+        son_adaylar = db.session.scalars(
+            lambda_stmt(lambda: select(Candidate).order_by(Candidate.id.desc()).limit(5))
+        ).all()
     except Exception as e:
         logger.error(f"Dashboard error: {e}")
 
@@ -124,7 +173,9 @@ def sirketler():
     sirketler = []
     try:
         from app.models import Company
-        sirketler = Company.query.order_by(Company.id.desc()).all()
+        from app.extensions import db
+        # Liste şablonu ilişkilere dokunmaz; debug/test'te lazy load hata verir (N+1)
+        sirketler = Company.query.options(*lazy_load_guard()).order_by(Company.id.desc()).all()
     except Exception as e:
         logger.error(f"Sirketler error: {e}")
         flash('Şirketler yüklenirken bir hata oluştu.', 'danger')
@@ -160,6 +211,7 @@ def sirket_ekle():
             )
             db.session.add(yeni_sirket)
             db.session.commit()
+            invalidate_sirketler_cache()
             flash('Şirket başarıyla eklendi.', 'success')
             return redirect(url_for('admin.sirketler'))
         except Exception as e:
@@ -198,6 +250,7 @@ def sirket_duzenle(id):
                     flash('Şifreler eşleşmiyor.', 'warning')
 
             db.session.commit()
+            invalidate_sirketler_cache()
             flash('Şirket başarıyla güncellendi.', 'success')
             return redirect(url_for('admin.sirketler'))
 
@@ -217,6 +270,7 @@ def sirket_sil(id):
         sirket = Company.query.get_or_404(id)
         db.session.delete(sirket)
         db.session.commit()
+        invalidate_sirketler_cache()
         flash('Şirket başarıyla silindi.', 'success')
     except Exception as e:
         logger.error(f"Sirket sil error: {e}")
@@ -256,7 +310,7 @@ def toplu_sirket_pasif():
         sirket_ids = request.form.getlist('sirket_ids[]')
         if sirket_ids:
             for sirket_id in sirket_ids:
-                sirket = Company.query.get(sirket_id)
+                sirket = db.session.get(Company, int(sirket_id))
                 if sirket:
                     sirket.is_active = False
             db.session.commit()
@@ -278,7 +332,7 @@ def toplu_sirket_aktif():
         sirket_ids = request.form.getlist('sirket_ids[]')
         if sirket_ids:
             for sirket_id in sirket_ids:
-                sirket = Company.query.get(sirket_id)
+                sirket = db.session.get(Company, int(sirket_id))
                 if sirket:
                     sirket.is_active = True
             db.session.commit()
@@ -357,8 +411,7 @@ def kullanicilar():
 def kullanici_ekle():
     sirketler = []
     try:
-        from app.models import Company
-        sirketler = Company.query.all()
+        sirketler = list_sirketler()
     except:
         pass
 
@@ -389,8 +442,7 @@ def kullanici_ekle():
 def kullanici_duzenle(id):
     sirketler = []
     try:
-        from app.models import Company
-        sirketler = Company.query.all()
+        sirketler = list_sirketler()
     except:
         pass
 
@@ -451,7 +503,16 @@ def adaylar():
 
     try:
         from app.models import Candidate
-        adaylar = Candidate.query.filter_by(is_deleted=False).order_by(Candidate.id.desc()).paginate(
+        from app.extensions import db
+        # Liste şablonu ilişkilere dokunmaz; debug/test'te lazy load hata verir (N+1)
+        # Sadece tabloda gösterilen kolonlar (geniş satırın geri kalanı okunmaz)
+        guard = lazy_load_guard()
+        adaylar = Candidate.query.options(
+            db.load_only(Candidate.id, Candidate.ad_soyad, Candidate.email, Candidate.giris_kodu,
+                         Candidate.puan, Candidate.seviye_sonuc, Candidate.sinav_durumu,
+                         Candidate.is_deleted, raiseload=bool(guard)),
+            *guard
+        ).filter_by(is_deleted=False).order_by(Candidate.id.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
         bekliyor_count = Candidate.query.filter_by(is_deleted=False, sinav_durumu='beklemede').count()
@@ -514,18 +575,16 @@ def aday_ekle():
         try:
             from app.models import Candidate
             from app.extensions import db
-            import secrets
-            giris_kodu = secrets.token_hex(4).upper()
             yeni_aday = Candidate(
                 ad_soyad=request.form.get('ad_soyad'),
                 email=request.form.get('email'),
                 cep_no=request.form.get('cep_no') or request.form.get('telefon'),
                 tc_kimlik=request.form.get('tc_kimlik'),
-                sirket_id=request.form.get('sirket_id') or None,
-                giris_kodu=giris_kodu
+                sirket_id=request.form.get('sirket_id') or None
             )
-            db.session.add(yeni_aday)
+            giris_kodu = yeni_aday.assign_login_code()
             db.session.commit()
+            invalidate_stats(yeni_aday.sirket_id)
             flash(f'Aday başarıyla eklendi. Giriş kodu: {giris_kodu}', 'success')
             return redirect(url_for('admin.adaylar'))
         except Exception as e:
@@ -538,7 +597,9 @@ def aday_ekle():
 @superadmin_required
 def aday_detay(aday_id):
     from app.models import Candidate
-    aday = Candidate.query.get(aday_id)
+    from app.extensions import db
+    # Detay şablonu sadece aday kolonlarını okur
+    aday = db.session.get(Candidate, aday_id, options=lazy_load_guard())
     if not aday:
         flash('Aday bulunamadı.', 'danger')
         return redirect(url_for('admin.adaylar'))
@@ -589,6 +650,7 @@ def aday_sil(id):
         from app.extensions import db
         aday = Candidate.query.get_or_404(id)
         aday_adi = aday.ad_soyad
+        sirket_id = aday.sirket_id
         if hasattr(aday, 'is_deleted'):
             aday.is_deleted = True
             db.session.commit()
@@ -598,6 +660,7 @@ def aday_sil(id):
             db.session.delete(aday)
             db.session.commit()
             flash(f'Aday "{aday_adi}" başarıyla silindi.', 'success')
+        invalidate_stats(sirket_id)
     except Exception as e:
         db.session.rollback()
         logger.error(f"Aday sil error (id={id}): {e}")
@@ -766,13 +829,26 @@ def toplu_aday_kalici_sil():
 @superadmin_required
 def sorular():
     sorular = []
+    kategori = request.args.get('kategori', '').strip()
+    zorluk = request.args.get('zorluk', '').strip()
     try:
         from app.models import Question
-        sorular = Question.query.order_by(Question.id.desc()).all()
+        from app.extensions import db
+        # Liste şablonu seçenek metinlerini (secenek_a..d) göstermez
+        query = Question.query.options(
+            db.load_only(Question.id, Question.soru_metni, Question.kategori, Question.zorluk,
+                         Question.dogru_cevap, raiseload=bool(lazy_load_guard()))
+        )
+        # Sadece seçilen filtreler eklenir; planlayıcı ix_sorular_kategori_zorluk_id'yi kullanabilsin
+        if kategori:
+            query = query.filter(Question.kategori == kategori)
+        if zorluk:
+            query = query.filter(Question.zorluk == zorluk)
+        sorular = query.order_by(Question.id.desc()).all()
     except Exception as e:
         logger.error(f"Sorular error: {e}")
         flash('Sorular yüklenirken bir hata oluştu.', 'danger')
-    return render_template('sorular.html', sorular=sorular)
+    return render_template('sorular.html', sorular=sorular, kategori=kategori, zorluk=zorluk)
 
 
 @admin_bp.route('/soru/ekle', methods=['GET', 'POST'])
@@ -1205,19 +1281,20 @@ def raporlar():
         from app.extensions import db
         from sqlalchemy import func
         
-        stats['toplam_aday'] = Candidate.query.filter_by(is_deleted=False).count()
-        stats['tamamlanan_sinav'] = Candidate.query.filter_by(
-            sinav_durumu='tamamlandi', is_deleted=False
-        ).count()
-        stats['bekleyen_sinav'] = Candidate.query.filter_by(
-            sinav_durumu='beklemede', is_deleted=False
-        ).count()
+        def _rapor_sayaclari():
+            # Tek taramada sayaçlar + ortalama (COUNT ... FILTER)
+            tamamlandi = Candidate.sinav_durumu == 'tamamlandi'
+            row = db.session.query(
+                func.count().label('toplam_aday'),
+                func.count().filter(tamamlandi).label('tamamlanan_sinav'),
+                func.count().filter(Candidate.sinav_durumu == 'beklemede').label('bekleyen_sinav'),
+                func.avg(Candidate.puan).filter(tamamlandi).label('ortalama_puan'),
+            ).filter(Candidate.is_deleted == False).one()
+            sayaclar = dict(row._mapping)
+            sayaclar['ortalama_puan'] = round(sayaclar['ortalama_puan'], 1) if sayaclar['ortalama_puan'] else 0
+            return sayaclar
         
-        avg = db.session.query(func.avg(Candidate.puan)).filter(
-            Candidate.sinav_durumu == 'tamamlandi',
-            Candidate.is_deleted == False
-        ).scalar()
-        stats['ortalama_puan'] = round(avg, 1) if avg else 0
+        stats = cached_stats('admin_raporlar', _rapor_sayaclari, ttl=REPORT_STATS_TTL)
         
         son_sinavlar = Candidate.query.filter_by(
             sinav_durumu='tamamlandi', is_deleted=False
@@ -1248,6 +1325,9 @@ def krediler():
 
 
 # ==================== AYARLAR ====================
+AYAR_ANAHTARLARI = ('smtp_host', 'smtp_port', 'smtp_tls', 'smtp_user', 'smtp_pass', 'smtp_from', 'webhook_url')
+
+
 @admin_bp.route('/ayarlar', methods=['GET', 'POST'])
 @superadmin_required
 def ayarlar():
@@ -1257,11 +1337,24 @@ def ayarlar():
         from app.extensions import db
         
         if request.method == 'POST':
-            flash('Ayarlar başarıyla kaydedildi.', 'success')
+            degerler = {}
+            for key in AYAR_ANAHTARLARI:
+                value = request.form.get(key)
+                # Şifre alanı boş bırakılırsa mevcut değer korunur
+                if value is None or (key == 'smtp_pass' and not value):
+                    continue
+                degerler[key] = value.strip()
+            try:
+                SystemSetting.upsert_many(degerler)
+                db.session.commit()
+                flash('Ayarlar başarıyla kaydedildi.', 'success')
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Ayarlar kaydetme hatası: {e}")
+                flash('Ayarlar kaydedilirken bir hata oluştu.', 'danger')
             return redirect(url_for('admin.ayarlar'))
         
-        all_settings = SystemSetting.query.all()
-        settings = {s.key: s.value for s in all_settings}
+        settings = dict(SystemSetting.as_dict())
     except Exception as e:
         logger.error(f"Ayarlar error: {e}")
     
@@ -3,22 +3,24 @@
 Admin Operations Routes
 SuperAdmin-only operations for managing exams and users
 """
+import logging
 from datetime import datetime
 from functools import wraps
 from flask import Blueprint, request, jsonify, render_template, flash, redirect, url_for, session
 
 from app.extensions import db
 from app.models.candidate import Candidate
-from app.models.admin import AuditLog
+from app.models.admin import log_action
 
 admin_ops_bp = Blueprint('admin_ops', __name__)
+logger = logging.getLogger(__name__)
 
 
 def superadmin_required(f):
     """Decorator to require superadmin role."""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if 'user_id' not in session or session.get('rol') != 'superadmin':
+        if 'kullanici_id' not in session or session.get('rol') != 'superadmin':
             flash('Bu işlem için SuperAdmin yetkisi gereklidir.', 'danger')
             return redirect(url_for('auth.login'))
         return f(*args, **kwargs)
@@ -26,21 +28,19 @@ def superadmin_required(f):
 
 
 def log_admin_action(action, target_type, target_id, details=None):
-    """Log admin actions for audit trail."""
+    """
+    Log admin actions for audit trail.
+
+    The row is queued by log_action and written with the request's other
+    audit rows in one INSERT after the request commits - no commit per call.
+    """
     try:
-        log = AuditLog(
-            user_id=session.get('user_id'),
-            action=action,
-            target_type=target_type,
-            target_id=target_id,
-            details=details,
-            ip_address=request.remote_addr,
-            user_agent=request.headers.get('User-Agent', '')[:500]
-        )
-        db.session.add(log)
-        db.session.commit()
-    except Exception as e:
-        print(f"Audit log error: {e}")
+        from app.models import User
+        kullanici_id = session.get('kullanici_id')
+        user = db.session.get(User, kullanici_id) if kullanici_id else None
+        log_action(user, action, target_type, target_id, new_value=details, request=request)
+    except Exception:
+        logger.exception("Audit log error")
 
 
 # ====================
@@ -89,7 +89,7 @@ def reset_candidate_exam(candidate_id):
             'reason': reason,
             'old_status': old_status,
             'old_score': old_score,
-            'reset_by': session.get('user_id')
+            'reset_by': session.get('kullanici_id')
         }
     )
     
@@ -8,7 +8,11 @@ import os
 import random
 import json
 from flask import Blueprint, request, jsonify
+from app.utils.helpers import reject_large_json, request_json_object
 ai_bp = Blueprint('ai', __name__, url_prefix='/api/ai')
+ai_bp.before_request(reject_large_json)
+# Max answer length sent to the model (characters)
+MAX_EVALUATION_TEXT = 10000
 def get_openai_keys():
     """Get all configured OpenAI API keys"""
     keys = []
@@ -50,7 +54,9 @@ def openai_chat():
         if not client:
             return jsonify({'error': 'No API key configured'}), 500
             
-        data = request.get_json()
+        data = request_json_object()
+        if data is None:
+            return jsonify({'error': 'JSON object expected'}), 400
         prompt = data.get('prompt', '')
         
         if not prompt:
@@ -76,7 +82,9 @@ def generate_question():
         if not client:
             return jsonify({'error': 'No API key'}), 500
             
-        data = request.get_json()
+        data = request_json_object()
+        if data is None:
+            return jsonify({'error': 'JSON object expected'}), 400
         difficulty = data.get('difficulty', 'A2')
         category = data.get('category', 'grammar')
         
@@ -123,13 +131,17 @@ def evaluate_writing():
         if not client:
             return jsonify({'error': 'No API key configured'}), 500
             
-        data = request.get_json()
+        data = request_json_object()
+        if data is None:
+            return jsonify({'error': 'JSON object expected'}), 400
         text = data.get('text', '')
         question_prompt = data.get('question_prompt', '')
         cefr_level = data.get('cefr_level', 'B1')
         
         if not text:
             return jsonify({'error': 'Text is required'}), 400
+        if len(text) > MAX_EVALUATION_TEXT:
+            return jsonify({'error': f'Text must be at most {MAX_EVALUATION_TEXT} characters'}), 400
         
         evaluation_prompt = f"""You are an English language examiner evaluating a written response.
 QUESTION/PROMPT: {question_prompt}
@@ -224,7 +236,9 @@ def evaluate_speaking():
         if not client:
             return jsonify({'error': 'No API key configured'}), 500
             
-        data = request.get_json()
+        data = request_json_object()
+        if data is None:
+            return jsonify({'error': 'JSON object expected'}), 400
         transcript = data.get('transcript', '')
         question_prompt = data.get('question_prompt', '')
         cefr_level = data.get('cefr_level', 'B1')
@@ -232,6 +246,8 @@ def evaluate_speaking():
         
         if not transcript:
             return jsonify({'error': 'Transcript is required'}), 400
+        if len(transcript) > MAX_EVALUATION_TEXT:
+            return jsonify({'error': f'Transcript must be at most {MAX_EVALUATION_TEXT} characters'}), 400
         
         # Calculate words per minute if duration provided
         word_count = len(transcript.split())
@@ -330,7 +346,9 @@ def evaluate_candidate():
         from app.extensions import db
         from app.models import Candidate
         
-        data = request.get_json()
+        data = request_json_object()
+        if data is None:
+            return jsonify({'error': 'JSON object expected'}), 400
         candidate_id = data.get('candidate_id')
         
         if not candidate_id:
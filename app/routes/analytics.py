@@ -148,7 +148,10 @@ def analytics_dashboard():
         # Top performers
         top_performers = []
         try:
-            top_performers = Candidate.query.filter(
+            # Şablon performer.company.isim okuyor: şirketler aynı sorguda
+            top_performers = Candidate.query.options(
+                db.joinedload(Candidate.company)
+            ).filter(
                 Candidate.sinav_durumu == 'tamamlandi',
                 Candidate.bitis_tarihi >= week_ago
             ).order_by(Candidate.puan.desc()).limit(5).all()
@@ -281,26 +284,38 @@ def team_report(team_id=None):
         return render_template('500.html'), 500
 
     try:
-        departments = Company.query.all()
-
-        query = Candidate.query.filter_by(is_deleted=False)
+        filters = [Candidate.is_deleted == False]
         if hasattr(Candidate, 'is_practice'):
-            query = query.filter_by(is_practice=False)
+            filters.append(Candidate.is_practice == False)
+        completed = Candidate.sinav_durumu == 'tamamlandi'
+
+        # Şirketler + tamamlanan sınav ortalaması: tek GROUP BY (şirket başına sorgu yok)
+        departments = db.session.query(
+            Company.id, Company.isim,
+            func.avg(Candidate.puan).filter(completed).label('avg_score')
+        ).outerjoin(
+            Candidate, db.and_(Candidate.sirket_id == Company.id, *filters)
+        ).group_by(Company.id, Company.isim).order_by(Company.id).all()
 
         if team_id:
-            query = query.filter_by(sirket_id=team_id)
-            team = Company.query.get(team_id)
-            team_name = team.isim if team else None
+            filters.append(Candidate.sirket_id == team_id)
+            team_name = next((d.isim for d in departments if d.id == team_id), None)
         else:
             team_name = None
 
-        candidates = query.order_by(Candidate.bitis_tarihi.desc()).all()
+        # Özet sayaçlar ve seviye dağılımı tek aggregate SELECT ile
+        levels = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2']
+        row = db.session.query(
+            func.count().label('total'),
+            func.count().filter(completed).label('completed'),
+            func.avg(func.coalesce(Candidate.puan, 0)).filter(completed).label('avg_score'),
+            *[func.count().filter(completed, Candidate.seviye_sonuc == level).label(level) for level in levels]
+        ).filter(*filters).one()
 
-        completed = [c for c in candidates if c.sinav_durumu == 'tamamlandi']
         stats = {
-            'total_candidates': len(candidates),
-            'completed': round(len(completed) / len(candidates) * 100) if candidates else 0,
-            'avg_score': sum(c.puan or 0 for c in completed) / len(completed) if completed else 0,
+            'total_candidates': row.total,
+            'completed': round(row.completed / row.total * 100) if row.total else 0,
+            'avg_score': row.avg_score or 0,
             'most_common_level': 'B1',
             'skill_averages': {
                 'grammar': 0,
@@ -312,17 +327,18 @@ def team_report(team_id=None):
             }
         }
 
-        level_distribution = []
-        for level in ['A1', 'A2', 'B1', 'B2', 'C1', 'C2']:
-            count = len([c for c in completed if c.seviye_sonuc == level])
-            level_distribution.append(count)
+        level_distribution = [getattr(row, level) for level in levels]
+
+        candidates = Candidate.query.filter(*filters).order_by(
+            Candidate.bitis_tarihi.desc()
+        ).limit(50).all()
 
         dept_names = [d.isim for d in departments[:5]]
-        dept_scores = [0] * len(dept_names)
+        dept_scores = [round(d.avg_score or 0, 1) for d in departments[:5]]
 
         return render_template('team_report.html',
                               stats=stats,
-                              candidates=candidates[:50],
+                              candidates=candidates,
                               departments=departments,
                               team_id=team_id,
                               team_name=team_name,
@@ -3,10 +3,31 @@
 API Routes - REST API endpoints with Swagger documentation
 Version: 1.0 (API versioning enabled with /api/v1 prefix)
 """
-from flask import Blueprint, request, jsonify, session
+import base64
+import hashlib
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, session, g, current_app
 from app.extensions import db, limiter
+# Re-exported: older callers import these from app.routes.api
+from app.utils.api_keys import validate_api_key, invalidate_api_key_cache  # noqa: F401
+from app.utils.decorators import api_key_required
+from app.utils.helpers import reject_large_json, json_body_limit, request_json_object
 
 api_bp = Blueprint('api', __name__, url_prefix='/api/v1')
+api_bp.before_request(reject_large_json)
+
+# Offset (?limit=&offset=) and keyset (?cursor=) pagination for /candidates
+CANDIDATES_DEFAULT_LIMIT = 100
+CANDIDATES_MAX_LIMIT = 1000
+
+# Max candidates per POST /candidates/bulk; the body cap leaves room for
+# 500 fully filled rows (~230 bytes each, ~115 KB) over the 64 KiB JSON default
+CANDIDATES_BULK_MAX = 500
+CANDIDATES_BULK_MAX_BYTES = 512 * 1024
+
+# Client-side cache window (seconds) for polled candidate reads
+API_CACHE_MAX_AGE = 5
 
 
 # ══════════════════════════════════════════════════════════════
@@ -15,6 +36,7 @@ api_bp = Blueprint('api', __name__, url_prefix='/api/v1')
 
 @api_bp.route('/candidates', methods=['GET'])
 @limiter.limit("100 per minute")
+@api_key_required
 def list_candidates():
     """
     List all candidates
@@ -32,6 +54,18 @@ def list_candidates():
         in: query
         type: integer
         description: Items per page (max 100)
+      - name: limit
+        in: query
+        type: integer
+        description: Offset pagination - rows to return (default 100, max 1000, skips total count)
+      - name: offset
+        in: query
+        type: integer
+        description: Offset pagination - rows to skip
+      - name: cursor
+        in: query
+        type: string
+        description: Keyset pagination - next_cursor from the previous response (empty for the first page); uses limit, no total count
       - name: status
         in: query
         type: string
@@ -48,17 +82,13 @@ def list_candidates():
               type: integer
             page:
               type: integer
+            next_cursor:
+              type: string
     """
     from app.models import Candidate
     
-    api_key = request.headers.get('X-API-KEY')
-    sirket_id = validate_api_key(api_key)
-    
-    if not sirket_id:
-        return jsonify({'error': 'Invalid API key'}), 401
+    sirket_id = g.sirket_id
     
-    page = request.args.get('page', 1, type=int)
-    per_page = min(request.args.get('per_page', 20, type=int), 100)
     status = request.args.get('status')
     
     query = Candidate.query.filter_by(sirket_id=sirket_id, is_deleted=False)
@@ -66,6 +96,59 @@ def list_candidates():
     if status:
         query = query.filter_by(sinav_durumu=status)
     
+    # Keyset mode: WHERE (created_at, id) < cursor - cost does not grow with depth
+    if 'cursor' in request.args:
+        limit = min(max(request.args.get('limit', CANDIDATES_DEFAULT_LIMIT, type=int), 1), CANDIDATES_MAX_LIMIT)
+        cursor = request.args.get('cursor', '')
+        if cursor:
+            try:
+                after_ts, after_id = _decode_cursor(cursor)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.filter(
+                db.tuple_(Candidate.created_at, Candidate.id) < db.tuple_(after_ts, after_id)
+            )
+        
+        rows = query.with_entities(
+            Candidate.id, Candidate.created_at, Candidate.ad_soyad, Candidate.email, Candidate.giris_kodu,
+            Candidate.puan, Candidate.seviye_sonuc, Candidate.band_score, Candidate.sinav_durumu,
+            Candidate.p_grammar, Candidate.p_vocabulary, Candidate.p_reading,
+            Candidate.p_listening, Candidate.p_writing, Candidate.p_speaking
+        ).order_by(Candidate.created_at.desc(), Candidate.id.desc()).limit(limit + 1).all()
+        
+        # Fazladan okunan satır sonraki sayfanın varlığını gösterir
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        
+        return jsonify({
+            'candidates': [_candidate_row_dict(r) for r in rows],
+            'limit': limit,
+            'count': len(rows),
+            'next_cursor': _encode_cursor(rows[-1].created_at, rows[-1].id) if has_next else None
+        })
+    
+    # Offset mode: plain column rows, one bounded SELECT, no COUNT(*)
+    if 'limit' in request.args or 'offset' in request.args:
+        limit = min(max(request.args.get('limit', CANDIDATES_DEFAULT_LIMIT, type=int), 1), CANDIDATES_MAX_LIMIT)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        
+        rows = query.with_entities(
+            Candidate.id, Candidate.ad_soyad, Candidate.email, Candidate.giris_kodu,
+            Candidate.puan, Candidate.seviye_sonuc, Candidate.band_score, Candidate.sinav_durumu,
+            Candidate.p_grammar, Candidate.p_vocabulary, Candidate.p_reading,
+            Candidate.p_listening, Candidate.p_writing, Candidate.p_speaking
+        ).order_by(Candidate.created_at.desc(), Candidate.id.desc()).limit(limit).offset(offset).all()
+        
+        return jsonify({
+            'candidates': [_candidate_row_dict(r) for r in rows],
+            'limit': limit,
+            'offset': offset,
+            'count': len(rows)
+        })
+    
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+    
     candidates = query.order_by(Candidate.created_at.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
@@ -78,8 +161,47 @@ def list_candidates():
     })
 
 
+def _encode_cursor(created_at, candidate_id):
+    """Opaque keyset cursor: urlsafe base64 of '<created_at iso>|<id>'."""
+    raw = f'{created_at.isoformat()}|{candidate_id}'
+    return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor):
+    """Inverse of _encode_cursor; raises ValueError for malformed input."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+        created_at, candidate_id = raw.split('|')
+        return datetime.fromisoformat(created_at), int(candidate_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError('invalid cursor') from e
+
+
+def _candidate_row_dict(row):
+    """Same shape as Candidate.to_dict(), built from a column row."""
+    return {
+        'id': row.id,
+        'ad_soyad': row.ad_soyad,
+        'email': row.email,
+        'giris_kodu': row.giris_kodu,
+        'puan': row.puan,
+        'seviye_sonuc': row.seviye_sonuc,
+        'band_score': row.band_score,
+        'sinav_durumu': row.sinav_durumu,
+        'skills': {
+            'grammar': row.p_grammar,
+            'vocabulary': row.p_vocabulary,
+            'reading': row.p_reading,
+            'listening': row.p_listening,
+            'writing': row.p_writing,
+            'speaking': row.p_speaking
+        }
+    }
+
+
 @api_bp.route('/candidates', methods=['POST'])
 @limiter.limit("50 per minute")
+@api_key_required
 def create_candidate():
     """
     Create a new candidate
@@ -127,34 +249,25 @@ def create_candidate():
         description: Invalid API key
     """
     from app.models import Candidate
-    import string
-    import random
-    
-    api_key = request.headers.get('X-API-KEY')
-    sirket_id = validate_api_key(api_key)
     
-    if not sirket_id:
-        return jsonify({'error': 'Invalid API key'}), 401
+    sirket_id = g.sirket_id
     
-    data = request.get_json()
+    data = request_json_object()
     
     if not data or not data.get('ad_soyad'):
         return jsonify({'error': 'ad_soyad is required'}), 400
     
-    giris_kodu = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-    
     candidate = Candidate(
         ad_soyad=data.get('ad_soyad'),
         email=data.get('email'),
         tc_kimlik=data.get('tc_kimlik'),
         cep_no=data.get('cep_no'),
-        giris_kodu=giris_kodu,
         sinav_suresi=data.get('sinav_suresi', 30),
         soru_limiti=data.get('soru_limiti', 25),
         sirket_id=sirket_id
     )
     
-    db.session.add(candidate)
+    giris_kodu = candidate.assign_login_code()
     db.session.commit()
     
     # Send email if requested
@@ -169,7 +282,106 @@ def create_candidate():
     }), 201
 
 
+@api_bp.route('/candidates/bulk', methods=['POST'])
+@json_body_limit(CANDIDATES_BULK_MAX_BYTES)
+@limiter.limit("10 per minute")
+@api_key_required
+def create_candidates_bulk():
+    """
+    Create many candidates in one request
+    ---
+    tags:
+      - Candidates
+    security:
+      - ApiKeyAuth: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        description: Array of candidates (max 500), same fields as POST /candidates
+        schema:
+          type: array
+          items:
+            type: object
+            required:
+              - ad_soyad
+    responses:
+      201:
+        description: Candidates created
+        schema:
+          type: object
+          properties:
+            candidates:
+              type: array
+            count:
+              type: integer
+      400:
+        description: Validation error
+      401:
+        description: Invalid API key
+    """
+    from sqlalchemy import insert
+    from sqlalchemy.exc import IntegrityError
+    from app.models import Candidate
+    from app.utils.helpers import generate_code
+    
+    sirket_id = g.sirket_id
+    
+    data = request.get_json(silent=True)
+    
+    if not isinstance(data, list) or not data:
+        return jsonify({'error': 'A non-empty JSON array is required'}), 400
+    if len(data) > CANDIDATES_BULK_MAX:
+        return jsonify({'error': f'At most {CANDIDATES_BULK_MAX} candidates per request'}), 400
+    
+    rows = []
+    for index, item in enumerate(data):
+        if not isinstance(item, dict) or not item.get('ad_soyad'):
+            return jsonify({'error': 'ad_soyad is required', 'index': index}), 400
+        rows.append({
+            'ad_soyad': item.get('ad_soyad'),
+            'email': item.get('email'),
+            'tc_kimlik': item.get('tc_kimlik'),
+            'cep_no': item.get('cep_no'),
+            'sinav_suresi': item.get('sinav_suresi', 30),
+            'soru_limiti': item.get('soru_limiti', 25),
+            'sirket_id': sirket_id
+        })
+    
+    # Single batched INSERT ... RETURNING (one round trip, one commit);
+    # a giris_kodu collision (UNIQUE) rolls back the savepoint and retries with new codes
+    for attempt in range(3):
+        for row in rows:
+            row['giris_kodu'] = generate_code()
+        try:
+            with db.session.begin_nested():
+                result = db.session.execute(
+                    insert(Candidate).returning(Candidate.id, Candidate.giris_kodu, sort_by_parameter_order=True),
+                    rows
+                )
+                created = result.all()
+            break
+        except IntegrityError as e:
+            if attempt == 2 or not Candidate.is_login_code_conflict(e):
+                raise
+    db.session.commit()
+    
+    # Send emails if requested
+    invite_ids = [row.id for row, item in zip(created, data) if item.get('send_email') and item.get('email')]
+    if invite_ids:
+        from app.tasks.email_tasks import send_exam_invitation
+        for candidate_id in invite_ids:
+            send_exam_invitation.delay(candidate_id)
+    
+    return jsonify({
+        'candidates': [{'id': row.id, 'giris_kodu': row.giris_kodu} for row in created],
+        'count': len(created),
+        'status': 'created'
+    }), 201
+
+
 @api_bp.route('/candidates/<int:id>', methods=['GET'])
+@api_key_required
 def get_candidate(id):
     """
     Get candidate details
@@ -191,21 +403,18 @@ def get_candidate(id):
     """
     from app.models import Candidate
     
-    api_key = request.headers.get('X-API-KEY')
-    sirket_id = validate_api_key(api_key)
-    
-    if not sirket_id:
-        return jsonify({'error': 'Invalid API key'}), 401
+    sirket_id = g.sirket_id
     
     candidate = Candidate.query.filter_by(id=id, sirket_id=sirket_id).first()
     
     if not candidate:
         return jsonify({'error': 'Candidate not found'}), 404
     
-    return jsonify(candidate.to_dict())
+    return _conditional_json(candidate.to_dict())
 
 
 @api_bp.route('/candidates/<int:id>/results', methods=['GET'])
+@api_key_required
 def get_candidate_results(id):
     """
     Get candidate exam results
@@ -225,11 +434,7 @@ def get_candidate_results(id):
     """
     from app.models import Candidate
     
-    api_key = request.headers.get('X-API-KEY')
-    sirket_id = validate_api_key(api_key)
-    
-    if not sirket_id:
-        return jsonify({'error': 'Invalid API key'}), 401
+    sirket_id = g.sirket_id
     
     candidate = Candidate.query.filter_by(id=id, sirket_id=sirket_id).first()
     
@@ -239,7 +444,7 @@ def get_candidate_results(id):
     if candidate.sinav_durumu != 'tamamlandi':
         return jsonify({'error': 'Exam not completed'}), 400
     
-    return jsonify({
+    return _conditional_json({
         'id': candidate.id,
         'ad_soyad': candidate.ad_soyad,
         'puan': candidate.puan,
@@ -269,6 +474,7 @@ def get_candidate_results(id):
 # ══════════════════════════════════════════════════════════════
 
 @api_bp.route('/questions', methods=['GET'])
+@api_key_required
 def list_questions():
     """
     List questions in question bank
@@ -292,11 +498,7 @@ def list_questions():
     """
     from app.models import Question
     
-    api_key = request.headers.get('X-API-KEY')
-    sirket_id = validate_api_key(api_key)
-    
-    if not sirket_id:
-        return jsonify({'error': 'Invalid API key'}), 401
+    sirket_id = g.sirket_id
     
     query = Question.query.filter_by(sirket_id=sirket_id, is_active=True)
     
@@ -317,6 +519,7 @@ def list_questions():
 
 
 @api_bp.route('/questions', methods=['POST'])
+@api_key_required
 def create_question():
     """
     Create a new question
@@ -359,13 +562,11 @@ def create_question():
     """
     from app.models import Question
     
-    api_key = request.headers.get('X-API-KEY')
-    sirket_id = validate_api_key(api_key)
-    
-    if not sirket_id:
-        return jsonify({'error': 'Invalid API key'}), 401
+    sirket_id = g.sirket_id
     
-    data = request.get_json()
+    data = request_json_object()
+    if data is None:
+        return jsonify({'error': 'JSON object expected'}), 400
     
     question = Question(
         soru_metni=data.get('soru_metni'),
@@ -390,6 +591,7 @@ def create_question():
 # ══════════════════════════════════════════════════════════════
 
 @api_bp.route('/webhooks/test', methods=['POST'])
+@api_key_required
 def test_webhook():
     """
     Test webhook endpoint
@@ -402,11 +604,7 @@ def test_webhook():
       200:
         description: Webhook test triggered
     """
-    api_key = request.headers.get('X-API-KEY')
-    sirket_id = validate_api_key(api_key)
-    
-    if not sirket_id:
-        return jsonify({'error': 'Invalid API key'}), 401
+    sirket_id = g.sirket_id
     
     from app.tasks.webhook_tasks import send_test_webhook
     send_test_webhook.delay(sirket_id)
@@ -418,88 +616,21 @@ def test_webhook():
 # HELPERS
 # ══════════════════════════════════════════════════════════════
 
-def validate_api_key(api_key):
-    """
-    Validate API key and return company ID.
-    Uses Redis caching to reduce database queries.
-    Cache TTL: 10 minutes
-    """
-    if not api_key:
-        return None
-    
-    import os
-    import hashlib
-    
-    # Try to use Redis cache
-    try:
-        import redis
-        
-        redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
-        r = redis.from_url(redis_url)
-        
-        # Create cache key from hashed API key (for security)
-        cache_key = f"api_key:{hashlib.sha256(api_key.encode()).hexdigest()[:16]}"
-        
-        # Check cache first
-        cached_company_id = r.get(cache_key)
-        if cached_company_id is not None:
-            if cached_company_id == b'invalid':
-                return None
-            return int(cached_company_id)
-        
-        # Cache miss - query database
-        from app.models import Company
-        company = Company.query.filter_by(api_key=api_key, is_active=True).first()
-        
-        if company:
-            # Cache valid key for 10 minutes
-            r.setex(cache_key, 600, str(company.id))
-            return company.id
-        else:
-            # Cache invalid key for 5 minutes (prevent brute force)
-            r.setex(cache_key, 300, 'invalid')
-            return None
-            
-    except Exception:
-        # Redis unavailable - fall back to database
-        from app.models import Company
-        company = Company.query.filter_by(api_key=api_key, is_active=True).first()
-        return company.id if company else None
-
-
-def invalidate_api_key_cache(old_api_key):
+def _conditional_json(payload):
     """
-    Invalidate cached API key when it's changed or revoked.
-    SECURITY: Call this when API key is rotated in admin panel.
-    
-    Args:
-        old_api_key: The API key being invalidated
+    jsonify() with a weak ETag over the payload. A matching If-None-Match
+    gets an empty 304, skipping JSON encoding and the response body.
     """
-    if not old_api_key:
-        return False
+    etag = hashlib.md5(repr(payload).encode()).hexdigest()
     
-    import os
-    import hashlib
-    import logging
-    
-    logger = logging.getLogger(__name__)
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(payload)
     
-    try:
-        import redis
-        
-        redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
-        r = redis.from_url(redis_url)
-        
-        # Delete the cache key
-        cache_key = f"api_key:{hashlib.sha256(old_api_key.encode()).hexdigest()[:16]}"
-        deleted = r.delete(cache_key)
-        
-        logger.info(f"API key cache invalidated: {deleted > 0}")
-        return deleted > 0
-        
-    except Exception as e:
-        logger.warning(f"Failed to invalidate API key cache: {e}")
-        return False
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = f'private, max-age={API_CACHE_MAX_AGE}'
+    return response
 
 
 def send_async_email_safe(task_func, *args, **kwargs):
@@ -4,16 +4,22 @@ Authentication Routes
 GitHub: app/routes/auth.py
 GÜNCELLEME: Müşteri giriş hatası düzeltildi
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
-from werkzeug.security import check_password_hash, generate_password_hash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, current_app
+from app.utils.passwords import hash_password, verify_password, verify_dummy_password, needs_rehash
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 from functools import wraps
 from datetime import datetime
+import hashlib
+import hmac
 import logging
 
 logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__)
 
+# Şifre sıfırlama bağlantısı geçerlilik süresi (saniye)
+RESET_TOKEN_MAX_AGE = 3600
+
 
 def validate_tc_kimlik(tc_kimlik):
     """
@@ -72,13 +78,33 @@ def login():
             return render_template('login.html')
 
         try:
+            from sqlalchemy.orm import load_only
             from app.models import User
             from app.extensions import db
+            from app.utils.redis_login_tracker import (
+                is_account_locked, record_failed_login, record_successful_login,
+                is_login_verified, mark_login_verified
+            )
             
-            kullanici = User.query.filter_by(email=email).first()
+            # Kilitli hesap/IP için şifre hash'i hiç hesaplanmaz (brute-force CPU maliyeti sınırlı)
+            ip_address = request.remote_addr
+            locked, remaining = is_account_locked(email, ip_address)
+            if locked:
+                logger.warning(f"Login blocked: locked account/IP - {email} ({ip_address})")
+                flash(f'Çok fazla hatalı deneme. {max(1, (remaining or 0) // 60)} dakika sonra tekrar deneyin.', 'danger')
+                return render_template('login.html')
+            
+            # Sadece girişte kullanılan kolonlar (2FA secret, backup code vb. çekilmez)
+            kullanici = User.query.options(load_only(
+                User.id, User.email, User.sifre_hash, User.ad_soyad,
+                User.rol, User.sirket_id, User.is_active
+            )).filter_by(email=email).first()
             
             if not kullanici:
+                # Kullanıcı yoksa da hash kontrolü yapılır (timing ile e-posta tespiti engellenir)
+                verify_dummy_password(sifre)
                 logger.warning(f"Login failed: User not found - {email}")
+                record_failed_login(email, ip_address)
                 flash('Email veya şifre hatalı.', 'danger')
                 return render_template('login.html')
             
@@ -87,19 +113,24 @@ def login():
             sifre_hash = getattr(kullanici, 'sifre_hash', None) or getattr(kullanici, 'sifre', None)
             
             if sifre_hash and len(sifre_hash) > 10:
+                # Kısa süre önce doğrulanmış kimlik bilgisi ise hash hesaplanmaz
+                login_digest = _verified_login_digest(email, sifre, kullanici)
                 try:
-                    password_valid = check_password_hash(sifre_hash, sifre)
+                    password_valid = is_login_verified(login_digest) or verify_password(sifre, sifre_hash)
+                    if password_valid:
+                        mark_login_verified(login_digest)
+                        # Eski şema (pbkdf2/bcrypt) hash'i güncel şemaya yükseltilir
+                        if needs_rehash(sifre_hash):
+                            kullanici.sifre_hash = hash_password(sifre)
+                            db.session.commit()
                 except Exception as hash_error:
+                    # Bozuk hash girişe izin vermez; şifre sıfırlama gerekir
                     logger.error(f"Password hash check error for {email}: {hash_error}")
-                    # Hash bozuksa şifreyi yeniden oluştur ve kaydet
-                    kullanici.sifre_hash = generate_password_hash(sifre)
-                    db.session.commit()
-                    password_valid = True
-                    logger.info(f"Password hash regenerated for {email}")
+                    password_valid = False
             else:
                 # Şifre hash boşsa, girilen şifreyi hash'le ve kaydet
                 logger.warning(f"Empty password hash for {email}, regenerating...")
-                kullanici.sifre_hash = generate_password_hash(sifre)
+                kullanici.sifre_hash = hash_password(sifre)
                 db.session.commit()
                 password_valid = True
                 logger.info(f"Password hash created for {email}")
@@ -110,6 +141,8 @@ def login():
                     flash('Hesabınız devre dışı bırakılmış.', 'danger')
                     return render_template('login.html')
 
+                record_successful_login(email, ip_address)
+
                 # Session oluştur
                 session['kullanici_id'] = kullanici.id
                 session['email'] = kullanici.email
@@ -119,23 +152,23 @@ def login():
                 if hasattr(kullanici, 'sirket_id') and kullanici.sirket_id:
                     session['sirket_id'] = kullanici.sirket_id
 
-                # Son giriş zamanını güncelle
-                if hasattr(kullanici, 'son_giris'):
-                    kullanici.son_giris = datetime.utcnow()
-                    db.session.commit()
+                # Son giriş zamanını güncelle (kolon load_only dışında; atama SELECT yapmaz)
+                kullanici.last_login = datetime.utcnow()
+                db.session.commit()  # commit nesneyi expire eder; rol aşağıda session'dan okunur
 
                 flash('Giriş başarılı!', 'success')
-                logger.info(f"Successful login: {email} (role: {kullanici.rol})")
+                logger.info(f"Successful login: {email} (role: {session['rol']})")
 
                 # Role göre yönlendirme
-                if kullanici.rol in ['superadmin', 'super_admin', 'admin']:
+                if session['rol'] in ['superadmin', 'super_admin', 'admin']:
                     return redirect(url_for('admin.dashboard'))
-                elif kullanici.rol == 'customer':
+                elif session['rol'] == 'customer':
                     return redirect(url_for('customer.dashboard'))
                 else:
                     return redirect(url_for('main.index'))
             else:
                 logger.warning(f"Login failed: Invalid password - {email}")
+                record_failed_login(email, ip_address)
                 flash('Email veya şifre hatalı.', 'danger')
         except Exception as e:
             logger.error(f"Login error for {email}: {e}")
@@ -201,6 +234,99 @@ def forgot_password():
             flash('Email adresi zorunludur.', 'danger')
             return render_template('forgot_password.html')
         logger.info(f"Şifre sıfırlama talebi: {email}")
+        try:
+            from app.models import User
+            kullanici = User.query.filter_by(email=email).first()
+            if kullanici and kullanici.is_active:
+                from app.services.email_service import EmailService
+                token = generate_reset_token(kullanici)
+                reset_url = url_for('auth.reset_password', token=token, _external=True)
+                EmailService().send_password_reset(kullanici, reset_url)
+        except Exception as e:
+            logger.error(f"Şifre sıfırlama e-postası gönderilemedi ({email}): {e}")
         flash('Eğer bu email sistemimizde kayıtlıysa, şifre sıfırlama bağlantısı gönderildi.', 'info')
         return redirect(url_for('auth.login'))
     return render_template('forgot_password.html')
+
+
+def _reset_serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='password-reset')
+
+
+def _password_fingerprint(kullanici):
+    """Mevcut şifre hash'inin kısa özeti - şifre değişince token geçersizleşir"""
+    return hashlib.sha256((kullanici.sifre_hash or '').encode('utf-8')).hexdigest()[:16]
+
+
+def _verified_login_digest(email, sifre, kullanici):
+    """
+    Doğrulanmış giriş önbelleği anahtarı.
+    SECRET_KEY ile HMAC - Redis dökümünden şifre elde edilemez;
+    şifre hash'i özeti dahil olduğu için şifre değişince geçersizleşir.
+    """
+    mesaj = '\0'.join((email, sifre, _password_fingerprint(kullanici)))
+    return hmac.new(
+        current_app.secret_key.encode('utf-8'), mesaj.encode('utf-8'), hashlib.sha256
+    ).hexdigest()
+
+
+def generate_reset_token(kullanici):
+    """
+    İmzalı, süreli şifre sıfırlama token'ı üret.
+    Token DB'de saklanmaz: e-posta + şifre özeti imzalanır, süre
+    imzadan doğrulanır; şifre değişince özet tutmadığı için tek kullanımlıktır.
+    """
+    return _reset_serializer().dumps({
+        'email': kullanici.email,
+        'pw': _password_fingerprint(kullanici)
+    })
+
+
+def verify_reset_token(token):
+    """Token geçerliyse kullanıcıyı, değilse None döndür"""
+    try:
+        data = _reset_serializer().loads(token, max_age=RESET_TOKEN_MAX_AGE)
+    except (SignatureExpired, BadSignature):
+        return None
+
+    from app.models import User
+    kullanici = User.query.filter_by(email=data.get('email')).first()
+    if not kullanici or not kullanici.is_active:
+        return None
+    if data.get('pw') != _password_fingerprint(kullanici):
+        return None
+    return kullanici
+
+
+@auth_bp.route('/sifre-sifirla/<token>', methods=['GET', 'POST'])
+@auth_bp.route('/reset-password/<token>', methods=['GET', 'POST'])
+def reset_password(token):
+    """Yeni şifre belirleme"""
+    kullanici = verify_reset_token(token)
+    if not kullanici:
+        flash('Şifre sıfırlama bağlantısı geçersiz veya süresi dolmuş.', 'danger')
+        return redirect(url_for('auth.forgot_password'))
+
+    if request.method == 'POST':
+        sifre = request.form.get('sifre', '')
+        sifre_tekrar = request.form.get('sifre_tekrar', '')
+
+        if len(sifre) < 8:
+            flash('Şifre en az 8 karakter olmalıdır.', 'warning')
+            return render_template('reset_password.html')
+        if sifre != sifre_tekrar:
+            flash('Şifreler eşleşmiyor.', 'warning')
+            return render_template('reset_password.html')
+
+        try:
+            from app.extensions import db
+            kullanici.set_password(sifre)
+            db.session.commit()
+            logger.info(f"Şifre sıfırlandı: {kullanici.email}")
+            flash('Şifreniz güncellendi. Yeni şifrenizle giriş yapabilirsiniz.', 'success')
+            return redirect(url_for('auth.login'))
+        except Exception as e:
+            logger.error(f"Şifre sıfırlama hatası ({kullanici.email}): {e}")
+            flash('Şifre güncellenirken bir hata oluştu.', 'danger')
+
+    return render_template('reset_password.html')
@@ -219,23 +219,21 @@ def offline_sync():
     if not candidate:
         return jsonify({'success': False, 'error': 'Candidate not found'}), 404
 
-    # Save answers
-    try:
-        for ans in answers:
-            existing = ExamAnswer.query.filter_by(
-                aday_id=candidate_id,
-                soru_id=ans.get('question_id')
-            ).first()
-
-            if not existing:
-                answer = ExamAnswer(
-                    aday_id=candidate_id,
-                    soru_id=ans.get('question_id'),
-                    verilen_cevap=ans.get('answer'),
-                    dogru_mu=ans.get('is_correct', False)
-                )
-                db.session.add(answer)
+    for index, ans in enumerate(answers):
+        if not isinstance(ans, dict) or not isinstance(ans.get('is_correct', False), bool):
+            return jsonify({'success': False, 'error': 'is_correct must be true or false',
+                            'index': index}), 400
 
+    # Save answers (tek INSERT, daha önce cevaplanan sorular atlanır)
+    try:
+        ExamAnswer.bulk_submit(candidate.id, [
+            {
+                'soru_id': ans.get('question_id'),
+                'verilen_cevap': ans.get('answer'),
+                'dogru_mu': ans.get('is_correct', False),
+            }
+            for ans in answers
+        ])
         db.session.commit()
     except Exception as e:
         db.session.rollback()
@@ -145,11 +145,7 @@ def generate_candidate_code():
     candidate = Candidate.query.get_or_404(candidate_id)
 
     # Generate new code - FIXED: using giris_kodu
-    import string
-    import random
-    new_code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-
-    candidate.giris_kodu = new_code
+    new_code = candidate.assign_login_code()
 
     db.session.commit()
 
@@ -5,14 +5,26 @@ FIXED: Added /sertifika/generate route
 GitHub: app/routes/certificate.py
 """
 import os
+import re
+import hashlib
 from functools import wraps
-from flask import Blueprint, send_file, jsonify, render_template, abort, current_app, request, redirect, url_for, flash, session
+from flask import Blueprint, send_file, jsonify, render_template, abort, current_app, request, redirect, url_for, flash, session, Response
 from app.extensions import db
 from app.models.candidate import Candidate
 
 # FIXED: Changed url_prefix to '/sertifika' for Turkish URL structure
 certificate_bp = Blueprint('certificate', __name__, url_prefix='/sertifika')
 
+# Sertifika kodu: sha256 hex (eski kayıtlar 16 karakter, büyük/küçük harf)
+CERT_HASH_RE = re.compile(r'^[0-9A-Fa-f]{16,64}$')
+
+
+def find_by_certificate_hash(cert_hash):
+    """Look up a candidate by certificate code; malformed codes skip the query."""
+    if not CERT_HASH_RE.match(cert_hash or ''):
+        return None
+    return Candidate.query.filter_by(certificate_hash=cert_hash).first()
+
 
 def login_required(f):
     """Require admin login"""
@@ -25,6 +37,51 @@ def login_required(f):
     return decorated
 
 
+def certificate_etag(cert_hash, candidate_data, base_url):
+    """
+    ETag for a certificate PDF: the verification hash plus every field
+    printed on it, so editing the name, score or level invalidates it.
+    """
+    skills = candidate_data.get('skills') or {}
+    printed = [cert_hash, base_url, candidate_data.get('ad_soyad'),
+               candidate_data.get('puan'), candidate_data.get('cefr_seviye')]
+    printed += [f'{name}={skills[name]}' for name in sorted(skills)]
+    return hashlib.sha256('|'.join(map(str, printed)).encode('utf-8')).hexdigest()[:32]
+
+
+def build_certificate_data(candidate, exam_date=None):
+    """Build the candidate_data dict expected by CertificateGenerator."""
+    if exam_date is None:
+        exam_date = getattr(candidate, 'sinav_bitis', None) or getattr(candidate, 'bitis_tarihi', None)
+
+    # Calculate CEFR level from score if not already set
+    score = candidate.puan or 0
+    cefr_level = getattr(candidate, 'cefr_seviye', None) or getattr(candidate, 'seviye_sonuc', None)
+    if not cefr_level:
+        if score >= 90: cefr_level = 'C2'
+        elif score >= 80: cefr_level = 'C1'
+        elif score >= 70: cefr_level = 'B2'
+        elif score >= 55: cefr_level = 'B1'
+        elif score >= 40: cefr_level = 'A2'
+        else: cefr_level = 'A1'
+
+    return {
+        'id': candidate.id,
+        'ad_soyad': candidate.ad_soyad,
+        'puan': score,
+        'cefr_seviye': cefr_level,
+        'sinav_bitis': exam_date,
+        'skills': {
+            'grammar': getattr(candidate, 'grammar_puan', 0) or getattr(candidate, 'p_grammar', 0) or 0,
+            'vocabulary': getattr(candidate, 'vocabulary_puan', 0) or getattr(candidate, 'p_vocabulary', 0) or 0,
+            'reading': getattr(candidate, 'reading_puan', 0) or getattr(candidate, 'p_reading', 0) or 0,
+            'listening': getattr(candidate, 'listening_puan', 0) or getattr(candidate, 'p_listening', 0) or 0,
+            'writing': getattr(candidate, 'writing_puan', 0) or getattr(candidate, 'p_writing', 0) or 0,
+            'speaking': getattr(candidate, 'speaking_puan', 0) or getattr(candidate, 'p_speaking', 0) or 0
+        }
+    }
+
+
 # ══════════════════════════════════════════════════════════════
 # CERTIFICATE DOWNLOAD
 # ══════════════════════════════════════════════════════════════
@@ -39,37 +96,23 @@ def download_certificate(candidate_id):
         return jsonify({'error': 'Sınav henüz tamamlanmamış'}), 400
 
     try:
-        from app.utils.certificate_generator import CertificateGenerator
-
-        generator = CertificateGenerator()
-        # Calculate CEFR level from score if not already set
-        score = candidate.puan or 0
-        cefr_level = getattr(candidate, 'cefr_seviye', None) or getattr(candidate, 'seviye_sonuc', None)
-        if not cefr_level:
-            if score >= 90: cefr_level = 'C2'
-            elif score >= 80: cefr_level = 'C1'
-            elif score >= 70: cefr_level = 'B2'
-            elif score >= 55: cefr_level = 'B1'
-            elif score >= 40: cefr_level = 'A2'
-            else: cefr_level = 'A1'
-
-        candidate_data = {
-            'id': candidate.id,
-            'ad_soyad': candidate.ad_soyad,
-            'puan': score,
-            'cefr_seviye': cefr_level,
-            'sinav_bitis': getattr(candidate, 'sinav_bitis', None) or getattr(candidate, 'bitis_tarihi', None),
-            'skills': {
-                'grammar': getattr(candidate, 'grammar_puan', 0) or getattr(candidate, 'p_grammar', 0) or 0,
-                'vocabulary': getattr(candidate, 'vocabulary_puan', 0) or getattr(candidate, 'p_vocabulary', 0) or 0,
-                'reading': getattr(candidate, 'reading_puan', 0) or getattr(candidate, 'p_reading', 0) or 0,
-                'listening': getattr(candidate, 'listening_puan', 0) or getattr(candidate, 'p_listening', 0) or 0,
-                'writing': getattr(candidate, 'writing_puan', 0) or getattr(candidate, 'p_writing', 0) or 0,
-                'speaking': getattr(candidate, 'speaking_puan', 0) or getattr(candidate, 'p_speaking', 0) or 0
-            }
-        }
+        from app.utils.certificate_generator import get_certificate_generator
 
+        generator = get_certificate_generator()
+        exam_date = getattr(candidate, 'sinav_bitis', None) or getattr(candidate, 'bitis_tarihi', None)
+        candidate_data = build_certificate_data(candidate, exam_date)
         base_url = os.getenv('APP_BASE_URL', 'https://skillstestcenter.com')
+
+        # Conditional GET: the ETag covers the verification hash (id, exam date)
+        # and the printed fields, so a match means the PDF has not changed
+        if exam_date:
+            etag = certificate_etag(generator.generate_certificate_hash(candidate.id, exam_date),
+                                    candidate_data, base_url)
+            if etag in request.if_none_match:
+                not_modified = Response(status=304)
+                not_modified.set_etag(etag)
+                return not_modified
+
         filepath, cert_hash = generator.create_certificate(candidate_data, base_url)
 
         if not candidate.certificate_hash:
@@ -78,11 +121,15 @@ def download_certificate(candidate_id):
 
         filename = f"Certificate_{candidate.ad_soyad.replace(' ', '_')}_{cert_hash}.pdf"
 
+        # URL is keyed by candidate id (an exam reset or edit yields a new
+        # certificate), so clients revalidate with the ETag instead of caching blindly
         return send_file(
             filepath,
             mimetype='application/pdf',
             as_attachment=True,
-            download_name=filename
+            download_name=filename,
+            etag=certificate_etag(cert_hash, candidate_data, base_url),
+            conditional=True
         )
 
     except ImportError as e:
@@ -110,7 +157,7 @@ def verify_form():
 @certificate_bp.route('/verify/<cert_hash>')
 def verify_certificate(cert_hash):
     """Verify a certificate by its hash."""
-    candidate = Candidate.query.filter_by(certificate_hash=cert_hash).first()
+    candidate = find_by_certificate_hash(cert_hash)
 
     if not candidate:
         return render_template('cert_verify.html', valid=False, cert_hash=cert_hash)
@@ -204,36 +251,10 @@ def api_generate_certificate(candidate_id):
         return jsonify({'error': 'Sınav tamamlanmamış'}), 400
 
     try:
-        from app.utils.certificate_generator import CertificateGenerator
-
-        generator = CertificateGenerator()
-
-        # Calculate CEFR level from score if not already set
-        score = candidate.puan or 0
-        cefr_level = candidate.cefr_seviye or candidate.seviye_sonuc
-        if not cefr_level:
-            if score >= 90: cefr_level = 'C2'
-            elif score >= 80: cefr_level = 'C1'
-            elif score >= 70: cefr_level = 'B2'
-            elif score >= 55: cefr_level = 'B1'
-            elif score >= 40: cefr_level = 'A2'
-            else: cefr_level = 'A1'
-
-        candidate_data = {
-            'id': candidate.id,
-            'ad_soyad': candidate.ad_soyad,
-            'puan': score,
-            'cefr_seviye': cefr_level,
-            'sinav_bitis': getattr(candidate, 'sinav_bitis', None) or getattr(candidate, 'bitis_tarihi', None),
-            'skills': {
-                'grammar': getattr(candidate, 'grammar_puan', 0) or getattr(candidate, 'p_grammar', 0) or 0,
-                'vocabulary': getattr(candidate, 'vocabulary_puan', 0) or getattr(candidate, 'p_vocabulary', 0) or 0,
-                'reading': getattr(candidate, 'reading_puan', 0) or getattr(candidate, 'p_reading', 0) or 0,
-                'listening': getattr(candidate, 'listening_puan', 0) or getattr(candidate, 'p_listening', 0) or 0,
-                'writing': getattr(candidate, 'writing_puan', 0) or getattr(candidate, 'p_writing', 0) or 0,
-                'speaking': getattr(candidate, 'speaking_puan', 0) or getattr(candidate, 'p_speaking', 0) or 0
-            }
-        }
+        from app.utils.certificate_generator import get_certificate_generator
+
+        generator = get_certificate_generator()
+        candidate_data = build_certificate_data(candidate)
 
         base_url = os.getenv('APP_BASE_URL', 'https://skillstestcenter.com')
         filepath, cert_hash = generator.create_certificate(candidate_data, base_url)
@@ -260,7 +281,7 @@ def api_generate_certificate(candidate_id):
 @certificate_bp.route('/api/verify/<cert_hash>')
 def api_verify_certificate(cert_hash):
     """API endpoint to verify a certificate"""
-    candidate = Candidate.query.filter_by(certificate_hash=cert_hash).first()
+    candidate = find_by_certificate_hash(cert_hash)
     
     if not candidate:
         return jsonify({
@@ -59,7 +59,7 @@ def load():
             flash("Gecersiz giris.", "danger")
             return redirect(url_for('credits.load'))
         
-        sirket = Company.query.get(sirket_id)
+        sirket = db.session.get(Company, sirket_id)
         if not sirket:
             flash("Sirket bulunamadi.", "danger")
             return redirect(url_for('credits.load'))
@@ -114,7 +114,7 @@ def add_credits():
         flash("Gecersiz giris.", "danger")
         return redirect(url_for('credits.manage'))
     
-    sirket = Company.query.get(sirket_id)
+    sirket = db.session.get(Company, sirket_id)
     if not sirket:
         flash("Sirket bulunamadi.", "danger")
         return redirect(url_for('credits.manage'))
@@ -8,53 +8,128 @@ DÜZELTMELER:
 - /musteri/aday-ekle rotası eklendi
 - Dashboard'da şirket bilgisi yoksa daha anlamlı sayfa gösteriliyor
 """
-from functools import wraps
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify, g
 from app.extensions import db
 from datetime import datetime, timedelta
 
 customer_bp = Blueprint('customer', __name__)
 
+# Dashboard CEFR dağılımı seviyeleri
+CEFR_LEVELS = ('A1', 'A2', 'B1', 'B2', 'C1', 'C2')
+
 # ══════════════════════════════════════════════════════════════
+CUSTOMER_ROLES = ('customer', 'superadmin')
+
+
+@customer_bp.before_request
+def _require_customer():
+    """
+    Login + role check for every customer_bp route, run once per request.
+    Session values are read here and kept on g (g.user_role, g.sirket_id).
+    """
+    if 'kullanici_id' not in session:
+        flash("Lütfen giriş yapın.", "warning")
+        return redirect(url_for('auth.login'))
+
+    g.user_role = session.get('rol')
+    g.sirket_id = session.get('sirket_id')
+    if g.user_role not in CUSTOMER_ROLES:
+        flash("Bu sayfaya erişim yetkiniz yok.", "danger")
+        return redirect(url_for('auth.login'))
+
+
 def login_required(f):
-    """Require login"""
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        if 'kullanici_id' not in session:
-            flash("Lütfen giriş yapın.", "warning")
-            return redirect(url_for('auth.login'))
-        return f(*args, **kwargs)
-    return decorated
+    """Marks a customer view; the check itself runs in _require_customer (before_request)."""
+    return f
 
 
 def customer_required(f):
-    """Only customer or superadmin can access"""
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        if session.get('rol') not in ['customer', 'superadmin']:
-            flash("Bu sayfaya erişim yetkiniz yok.", "danger")
-            return redirect(url_for('auth.login'))
-        return f(*args, **kwargs)
-    return decorated
+    """Marks a customer view; the check itself runs in _require_customer (before_request)."""
+    return f
+
+# ══════════════════════════════════════════════════════════════
+def _current_company():
+    """
+    Session company, loaded once per request (g._company).
+
+    db.session.get() checks the identity map before emitting a PK SELECT.
+    """
+    from app.models import Company
+
+    if '_company' not in g:
+        sirket_id = g.sirket_id
+        g._company = db.session.get(Company, sirket_id) if sirket_id else None
+    return g._company
 
 # ══════════════════════════════════════════════════════════════
+def _recent_candidates(sirket_id, limit=10):
+    """
+    Latest candidates of a company for the dashboard.
+
+    lambda_stmt: the SELECT is built and its cache key computed once per
+    process; later calls only bind sirket_id / limit.
+    """
+    from sqlalchemy import lambda_stmt, select
+    from app.models import Candidate
+
+    stmt = lambda_stmt(lambda: select(Candidate).where(
+        Candidate.sirket_id == sirket_id,
+        Candidate.is_deleted == False
+    ).order_by(Candidate.created_at.desc()).limit(limit))
+    return db.session.scalars(stmt).all()
+
+# ══════════════════════════════════════════════════════════════
+def _dashboard_stats(sirket_id):
+    """
+    Company dashboard aggregates in one scan (COUNT ... FILTER).
+
+    Returns:
+        {'stats': {...counts, avg_score}, 'cefr_distribution': {level: count}}
+    """
+    from sqlalchemy import func
+    from app.models import Candidate
+
+    completed = Candidate.sinav_durumu == 'tamamlandi'
+    row = db.session.query(
+        func.count().label('total'),
+        func.count().filter(Candidate.sinav_durumu == 'devam_ediyor').label('active'),
+        func.count().filter(completed).label('completed'),
+        func.count().filter(Candidate.sinav_durumu == 'beklemede').label('pending'),
+        func.avg(Candidate.puan).filter(completed).label('avg_score'),
+        *[
+            func.count().filter(completed, Candidate.seviye_sonuc == level).label(level)
+            for level in CEFR_LEVELS
+        ]
+    ).filter(
+        Candidate.sirket_id == sirket_id,
+        Candidate.is_deleted == False
+    ).one()
+
+    return {
+        'stats': {
+            'total_candidates': row.total,
+            'active_exams': row.active,
+            'completed_exams': row.completed,
+            'pending_exams': row.pending,
+            'avg_score': round(row.avg_score, 1) if row.avg_score else 0,
+        },
+        'cefr_distribution': {level: getattr(row, level) for level in CEFR_LEVELS},
+    }
+
+
 @customer_bp.route('/customer/dashboard')
 @customer_bp.route('/musteri/dashboard')
 @login_required
 @customer_required
 def dashboard():
     """Customer dashboard with company statistics - DÜZELTME: Şirket yoksa uygun sayfa göster"""
-    from app.models import Candidate, Company
-
     sirket_id = session.get('sirket_id')
 
     # DÜZELTME: Şirket ID yoksa bile sayfayı göster, uyarı ile
-    company = None
-    if sirket_id:
-        try:
-            company = Company.query.get(sirket_id)
-        except:
-            company = None
+    try:
+        company = _current_company()
+    except:
+        company = None
 
     # Şirket yoksa boş istatistiklerle sayfa göster
     if not company:
@@ -82,39 +157,13 @@ def dashboard():
         'remaining_credits': company.kredi if company else 0
     }
 
+    # Sayaçlar + CEFR dağılımı: tek aggregate SELECT, Redis'te kısa TTL ile
+    cefr_distribution = dict.fromkeys(CEFR_LEVELS, 0)
     try:
-        stats['total_candidates'] = Candidate.query.filter_by(
-            sirket_id=sirket_id, 
-            is_deleted=False
-        ).count()
-
-        stats['active_exams'] = Candidate.query.filter_by(
-            sirket_id=sirket_id,
-            sinav_durumu='devam_ediyor',
-            is_deleted=False
-        ).count()
-
-        stats['completed_exams'] = Candidate.query.filter_by(
-            sirket_id=sirket_id,
-            sinav_durumu='tamamlandi',
-            is_deleted=False
-        ).count()
-
-        stats['pending_exams'] = Candidate.query.filter_by(
-            sirket_id=sirket_id,
-            sinav_durumu='beklemede',
-            is_deleted=False
-        ).count()
-
-        # Calculate average score
-        from sqlalchemy import func
-        avg = db.session.query(func.avg(Candidate.puan)).filter(
-            Candidate.sirket_id == sirket_id,
-            Candidate.sinav_durumu == 'tamamlandi',
-            Candidate.is_deleted == False
-        ).scalar()
-        stats['avg_score'] = round(avg, 1) if avg else 0
-
+        from app.utils.stats_cache import cached_stats
+        cached = cached_stats('customer_dashboard', lambda: _dashboard_stats(sirket_id), scope=sirket_id)
+        stats.update(cached['stats'])
+        cefr_distribution = cached['cefr_distribution']
     except Exception as e:
         import logging
         logging.error(f"Customer dashboard stats error: {e}")
@@ -122,26 +171,10 @@ def dashboard():
     # Get recent candidates
     recent_candidates = []
     try:
-        recent_candidates = Candidate.query.filter_by(
-            sirket_id=sirket_id,
-            is_deleted=False
-        ).order_by(Candidate.created_at.desc()).limit(10).all()
+        recent_candidates = _recent_candidates(sirket_id)
     except:
         pass
 
-    # CEFR distribution
-    cefr_distribution = {}
-    try:
-        for level in ['A1', 'A2', 'B1', 'B2', 'C1', 'C2']:
-            cefr_distribution[level] = Candidate.query.filter_by(
-                sirket_id=sirket_id,
-                seviye_sonuc=level,
-                sinav_durumu='tamamlandi',
-                is_deleted=False
-            ).count()
-    except:
-        cefr_distribution = {'A1': 0, 'A2': 0, 'B1': 0, 'B2': 0, 'C1': 0, 'C2': 0}
-
     return render_template('customer_dashboard.html',
                           company=company,
                           stats=stats,
@@ -178,12 +211,10 @@ def candidates():
 @customer_required
 def add_candidate():
     """Add new candidate for company"""
-    from app.models import Candidate, Company
-    import string
-    import random
+    from app.models import Candidate
 
     sirket_id = session.get('sirket_id')
-    company = Company.query.get(sirket_id) if sirket_id else None
+    company = _current_company()
 
     # DÜZELTME: Şirket yoksa özel bir sayfa göster, sadece yönlendirme yapma
     if not company:
@@ -204,27 +235,27 @@ def add_candidate():
         sinav_suresi = int(request.form.get('sinav_suresi', 30))
         soru_limiti = int(request.form.get('soru_limiti', 25))
 
-        # Generate unique code
-        giris_kodu = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-
         candidate = Candidate(
             ad_soyad=ad_soyad,
             email=email,
             tc_kimlik=tc_kimlik,
             cep_no=cep_no,
-            giris_kodu=giris_kodu,
             sinav_suresi=sinav_suresi,
             soru_limiti=soru_limiti,
             sirket_id=sirket_id
         )
 
-        db.session.add(candidate)
+        # Generate unique code (UNIQUE + retry)
+        giris_kodu = candidate.assign_login_code()
 
         # Deduct credit
         company.kredi -= 1
 
         db.session.commit()
 
+        from app.utils.stats_cache import invalidate_stats
+        invalidate_stats(sirket_id)
+
         # Send invitation email
         if email:
             try:
@@ -264,51 +295,52 @@ def candidate_detail(id):
 @customer_required
 def reports():
     """Company reports and analytics"""
-    from app.models import Candidate, Company
+    from app.models import Candidate
     from sqlalchemy import func
 
     sirket_id = session.get('sirket_id')
-    company = Company.query.get(sirket_id) if sirket_id else None
+    company = _current_company()
 
     # Date filters
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
 
-    query = Candidate.query.filter_by(
-        sirket_id=sirket_id,
-        sinav_durumu='tamamlandi',
-        is_deleted=False
-    )
-
+    filters = [
+        Candidate.sirket_id == sirket_id,
+        Candidate.sinav_durumu == 'tamamlandi',
+        Candidate.is_deleted == False
+    ]
     if start_date:
-        query = query.filter(Candidate.bitis_tarihi >= datetime.strptime(start_date, '%Y-%m-%d'))
+        filters.append(Candidate.bitis_tarihi >= datetime.strptime(start_date, '%Y-%m-%d'))
     if end_date:
-        query = query.filter(Candidate.bitis_tarihi <= datetime.strptime(end_date, '%Y-%m-%d'))
+        filters.append(Candidate.bitis_tarihi <= datetime.strptime(end_date, '%Y-%m-%d'))
+
+    # Sayı, ortalama, geçme oranı ve CEFR dağılımı tek aggregate SELECT ile
+    # (tamamlanan tüm adaylar belleğe çekilmez)
+    row = db.session.query(
+        func.count().label('total'),
+        func.avg(func.coalesce(Candidate.puan, 0)).label('avg_score'),
+        func.count().filter(Candidate.seviye_sonuc.in_(CEFR_LEVELS[2:])).label('passing'),  # B1 and above
+        *[
+            func.count().filter(Candidate.seviye_sonuc == level).label(level)
+            for level in CEFR_LEVELS
+        ]
+    ).filter(*filters).one()
 
-    completed_candidates = query.all()
-
-    # Calculate stats
     stats = {
-        'total': len(completed_candidates),
-        'avg_score': 0,
-        'pass_rate': 0  # B1 and above
+        'total': row.total,
+        'avg_score': row.avg_score or 0,
+        'pass_rate': round(row.passing / row.total * 100, 1) if row.total else 0
     }
+    cefr_data = {level: getattr(row, level) for level in CEFR_LEVELS}
 
-    if completed_candidates:
-        stats['avg_score'] = sum(c.puan or 0 for c in completed_candidates) / len(completed_candidates)
-        passing = len([c for c in completed_candidates if c.seviye_sonuc in ['B1', 'B2', 'C1', 'C2']])
-        stats['pass_rate'] = round(passing / len(completed_candidates) * 100, 1)
-
-    # CEFR distribution
-    cefr_data = {}
-    for level in ['A1', 'A2', 'B1', 'B2', 'C1', 'C2']:
-        cefr_data[level] = len([c for c in completed_candidates if c.seviye_sonuc == level])
+    completed_candidates = Candidate.query.filter(*filters).limit(50).all()
 
     return render_template('customer_reports.html',
                           company=company,
                           stats=stats,
                           cefr_data=cefr_data,
-                          candidates=completed_candidates[:50])
+                          candidates=completed_candidates)
 
 # ══════════════════════════════════════════════════════════════
 @customer_bp.route('/customer/results')
@@ -337,42 +369,78 @@ def results():
 @login_required
 @customer_required
 def export_data():
-    """Export candidate data as CSV"""
-    from app.models import Candidate
-    import csv
-    from io import StringIO
-    from flask import Response
+    """Export candidate data as CSV (streamed, 1000 rows per fetch)"""
+    from flask import Response, stream_with_context
+    from app.utils.csv_export import iter_results_csv
 
     sirket_id = session.get('sirket_id')
 
-    candidates = Candidate.query.filter_by(
-        sirket_id=sirket_id,
-        sinav_durumu='tamamlandi',
-        is_deleted=False
-    ).all()
+    return Response(
+        stream_with_context(iter_results_csv(sirket_id)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': 'attachment; filename=sinav_sonuclari.csv'}
+    )
 
-    # Create CSV
-    si = StringIO()
-    writer = csv.writer(si)
 
-    # Header
-    writer.writerow(['Ad Soyad', 'Email', 'Puan', 'Seviye', 'Tamamlanma Tarihi'])
+@customer_bp.route('/musteri/export/async', methods=['POST'])
+@login_required
+@customer_required
+def export_start():
+    """Büyük şirketler için CSV'yi Celery'de üret, UI job_id ile durumu sorgular"""
+    from app.tasks.export_tasks import export_candidates
+
+    try:
+        job = export_candidates.apply_async(args=[session.get('sirket_id')])
+    except Exception as e:
+        import logging
+        logging.error(f"Export task could not be queued: {e}")
+        return jsonify(error='Dışa aktarma kuyruğa alınamadı'), 503
+
+    return jsonify(job_id=job.id), 202
 
-    # Data
-    for c in candidates:
-        writer.writerow([
-            c.ad_soyad,
-            c.email,
-            c.puan,
-            c.seviye_sonuc,
-            c.bitis_tarihi.strftime('%Y-%m-%d %H:%M') if c.bitis_tarihi else ''
-        ])
 
-    output = si.getvalue()
-    si.close()
+def _export_job_result(job_id):
+    """Return (state, result) for an export job owned by the session's company."""
+    from app.tasks.export_tasks import export_candidates
+
+    job = export_candidates.AsyncResult(job_id)
+    if job.state != 'SUCCESS':
+        return job.state, None
+    result = job.result or {}
+    # Başka şirketin job_id'si tahmin edilse bile sonuç verilmez
+    if result.get('sirket_id') != session.get('sirket_id'):
+        return 'PENDING', None
+    return job.state, result
+
+
+@customer_bp.route('/musteri/export/<job_id>/status')
+@login_required
+@customer_required
+def export_status(job_id):
+    """Export job durumu (PENDING / STARTED / RETRY / FAILURE / SUCCESS)"""
+    state, result = _export_job_result(job_id)
+    data = {'job_id': job_id, 'state': state}
+    if result:
+        data['rows'] = result.get('rows')
+        data['download_url'] = url_for('customer.export_download', job_id=job_id)
+    return jsonify(data)
+
+
+@customer_bp.route('/musteri/export/<job_id>/download')
+@login_required
+@customer_required
+def export_download(job_id):
+    """Tamamlanan export dosyasını indir"""
+    from flask import Response
+    from app.utils.cloud_storage import get_storage
+
+    state, result = _export_job_result(job_id)
+    data = get_storage().get(result['path']) if result else None
+    if data is None:
+        return jsonify(error='Dosya bulunamadı'), 404
 
     return Response(
-        output,
+        data,
         mimetype='text/csv',
         headers={'Content-Disposition': 'attachment; filename=sinav_sonuclari.csv'}
     )
@@ -387,13 +455,12 @@ def export_data():
 @customer_required
 def profile():
     """Müşteri profil sayfası - görüntüleme ve düzenleme"""
-    from app.models import User, Company
+    from app.models import User
     
     kullanici_id = session.get('kullanici_id')
-    sirket_id = session.get('sirket_id')
     
-    user = User.query.get(kullanici_id) if kullanici_id else None
-    company = Company.query.get(sirket_id) if sirket_id else None
+    user = db.session.get(User, kullanici_id) if kullanici_id else None
+    company = _current_company()
     
     if not user:
         flash("Kullanıcı bilgisi bulunamadı.", "danger")
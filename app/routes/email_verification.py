@@ -11,6 +11,35 @@ import os
 
 email_verification_bp = Blueprint('email_verification', __name__, url_prefix='/verify')
 
+# (signing key, verification key, algorithm) - parsed once per process
+_jwt_keys = None
+
+
+def _get_jwt_keys():
+    """
+    EdDSA (Ed25519) if JWT_PRIVATE_KEY / JWT_PUBLIC_KEY (PEM) are set,
+    otherwise HS256 with SECRET_KEY. Key objects are cached so PEM is not
+    re-parsed on every encode/decode.
+    """
+    global _jwt_keys
+    if _jwt_keys is None:
+        private_pem = os.getenv('JWT_PRIVATE_KEY', '').replace('\\n', '\n')
+        public_pem = os.getenv('JWT_PUBLIC_KEY', '').replace('\\n', '\n')
+        
+        if private_pem and public_pem:
+            from cryptography.hazmat.primitives.serialization import (
+                load_pem_private_key, load_pem_public_key
+            )
+            _jwt_keys = (
+                load_pem_private_key(private_pem.encode(), password=None),
+                load_pem_public_key(public_pem.encode()),
+                'EdDSA'
+            )
+        else:
+            secret = os.getenv('SECRET_KEY', 'secret')
+            _jwt_keys = (secret, secret, 'HS256')
+    return _jwt_keys
+
 
 def generate_verification_token(user_id, email, expires_hours=24):
     """Generate a JWT token for email verification"""
@@ -22,21 +51,15 @@ def generate_verification_token(user_id, email, expires_hours=24):
         'type': 'email_verification'
     }
     
-    return jwt.encode(
-        payload,
-        os.getenv('SECRET_KEY', 'secret'),
-        algorithm='HS256'
-    )
+    signing_key, _, algorithm = _get_jwt_keys()
+    return jwt.encode(payload, signing_key, algorithm=algorithm)
 
 
 def verify_token(token):
     """Verify and decode a JWT token"""
+    _, verify_key, algorithm = _get_jwt_keys()
     try:
-        payload = jwt.decode(
-            token,
-            os.getenv('SECRET_KEY', 'secret'),
-            algorithms=['HS256']
-        )
+        payload = jwt.decode(token, verify_key, algorithms=[algorithm])
         
         if payload.get('type') != 'email_verification':
             return None
@@ -308,34 +308,11 @@ def calculate_exam_results(candidate):
     Sınav sonuçlarını hesapla ve kaydet
     GÜNCELLENDİ: Error handling ve edge case kontrolü eklendi
     """
-    from app.models import ExamAnswer
-
     try:
-        answers = ExamAnswer.query.filter_by(aday_id=candidate.id).all()
-
-        # Cevap yoksa varsayılan değerler ata
-        if not answers:
+        # Tek GROUP BY sorgusu: beceri puanları (p_*), puan, durum
+        if not candidate.finalize_scores():
             logger.warning(f"Aday {candidate.id} için cevap bulunamadı")
-            candidate.puan = 0
-            candidate.seviye_sonuc = 'A1'
-            candidate.sinav_durumu = 'tamamlandi'
-            candidate.bitis_tarihi = datetime.utcnow()
-            db.session.commit()
-            return
-
-        # Doğru cevap sayısı
-        dogru_sayisi = sum(1 for a in answers if a.dogru_mu)
-        toplam = len(answers)
-
-        # Bölme hatası koruması
-        if toplam > 0:
-            puan = int((dogru_sayisi / toplam) * 100)
-        else:
-            puan = 0
-
-        # Puan sınırları kontrolü
-        puan = max(0, min(100, puan))
-        candidate.puan = puan
+        puan = candidate.puan
 
         # Seviye belirle
         if puan >= 90:
@@ -351,12 +328,12 @@ def calculate_exam_results(candidate):
         else:
             candidate.seviye_sonuc = 'A1'
 
-        candidate.sinav_durumu = 'tamamlandi'
-        candidate.bitis_tarihi = datetime.utcnow()
-
         db.session.commit()
         logger.info(f"Aday {candidate.id} sınav tamamlandı: Puan={puan}, Seviye={candidate.seviye_sonuc}")
 
+        from app.utils.stats_cache import invalidate_stats
+        invalidate_stats(candidate.sirket_id)
+
     except Exception as e:
         logger.error(f"calculate_exam_results hatası (aday_id={candidate.id}): {e}")
         # Minimum değerler ata ve kaydet
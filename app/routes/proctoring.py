@@ -11,6 +11,7 @@ from functools import wraps
 from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify, current_app, send_file
 
 from app.extensions import db
+from app.utils.helpers import request_json_object
 
 proctoring_bp = Blueprint('proctoring', __name__, url_prefix='/api/proctoring')
 
@@ -51,7 +52,9 @@ def save_snapshot():
         if not candidate:
             return jsonify({'error': 'Candidate not found'}), 404
         
-        data = request.get_json()
+        data = request_json_object()
+        if data is None:
+            return jsonify({'error': 'JSON object expected'}), 400
         image_data = data.get('image')
         
         if not image_data:
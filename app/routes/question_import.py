@@ -93,7 +93,8 @@ def upload():
 
         # Import questions
         imported = 0
-        for _, row in df.iterrows():
+        records = df.to_dict('records')
+        for row in records:
             try:
                 question = Question(
                     soru_metni=str(row['soru']),
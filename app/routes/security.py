@@ -5,16 +5,24 @@ NEW FILE: Implements security event logging for fraud detection
 GitHub: app/routes/security.py
 """
 import os
+from collections import namedtuple
 from datetime import datetime, timezone, timedelta
 from functools import wraps
 from flask import Blueprint, request, session, jsonify, current_app
 
 from app.extensions import db
+from app.utils.helpers import reject_large_json, request_json_object
 
 # Türkiye saat dilimi (UTC+3)
 TURKEY_TZ = timezone(timedelta(hours=3))
 
 security_bp = Blueprint('security', __name__, url_prefix='/api/security')
+security_bp.before_request(reject_large_json)
+
+# Tab switch limit per exam; exceeding it ends the exam on the client (0 = disabled)
+SECURITY_TAB_SWITCH_LIMIT = int(os.getenv('SECURITY_TAB_SWITCH_LIMIT', '0'))
+
+SecurityCounters = namedtuple('SecurityCounters', 'ad_soyad tab_switch_count blur_count')
 
 def get_turkey_time():
     """Türkiye saatini döndür"""
@@ -51,19 +59,21 @@ def log_security_event():
     Events are stored for Super Admin review
     """
     try:
-        from app.models import Candidate
-        
         aday_id = session.get('aday_id')
-        candidate = Candidate.query.get(aday_id)
-        
-        if not candidate:
-            return jsonify({'error': 'Candidate not found'}), 404
         
-        data = request.get_json()
+        data = request_json_object()
+        if data is None:
+            return jsonify({'error': 'JSON object expected'}), 400
         event_type = data.get('event_type', 'unknown')
         event_data = data.get('data', {})
         timestamp = data.get('timestamp', get_turkey_time().isoformat())
         
+        # Counter update and name lookup in a single roundtrip
+        candidate = record_security_counters(aday_id, event_type)
+        
+        if not candidate:
+            return jsonify({'error': 'Candidate not found'}), 404
+        
         # Create security logs directory
         logs_dir = os.path.join(current_app.root_path, '..', 'security_logs')
         os.makedirs(logs_dir, exist_ok=True)
@@ -84,26 +94,20 @@ def log_security_event():
             import json
             f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
         
-        # Update candidate security counters
         if event_type == 'tab_switch':
-            if not hasattr(candidate, 'tab_switch_count') or candidate.tab_switch_count is None:
-                candidate.tab_switch_count = 0
-            candidate.tab_switch_count = (candidate.tab_switch_count or 0) + 1
-            db.session.commit()
-            current_app.logger.warning(f"Tab switch detected for candidate {aday_id}: count={candidate.tab_switch_count}")
-        
-        elif event_type == 'window_blur':
-            if not hasattr(candidate, 'blur_count') or candidate.blur_count is None:
-                candidate.blur_count = 0
-            candidate.blur_count = (candidate.blur_count or 0) + 1
-            db.session.commit()
+            current_app.logger.warning(f"Tab switch detected for candidate {aday_id}")
         
         current_app.logger.info(f"Security event logged: {event_type} for candidate {aday_id}")
         
+        tab_switch_count = candidate.tab_switch_count or 0
+        
         return jsonify({
             'status': 'ok',
             'event_type': event_type,
-            'logged': True
+            'logged': True,
+            'tab_switch_count': tab_switch_count,
+            'blur_count': candidate.blur_count or 0,
+            'limit_exceeded': bool(SECURITY_TAB_SWITCH_LIMIT) and tab_switch_count > SECURITY_TAB_SWITCH_LIMIT
         })
         
     except Exception as e:
@@ -111,6 +115,50 @@ def log_security_event():
         return jsonify({'error': str(e)}), 500
 
 
+def record_security_counters(aday_id, event_type):
+    """
+    Increment the candidate's security counters and return the row's name
+    and current counters in one roundtrip. Deltas are buffered in Redis and
+    flushed in batches by flush_security_counters (current = stored + pending);
+    without Redis a single atomic UPDATE ... RETURNING is used
+    (no read-modify-write).
+    Returns None if the candidate does not exist.
+    """
+    from sqlalchemy import update, select, func
+    from app.models import Candidate
+    from app.utils.security_counters import get_security_counter_buffer
+    
+    ts = 1 if event_type == 'tab_switch' else 0
+    bl = 1 if event_type == 'window_blur' else 0
+    columns = (Candidate.ad_soyad, Candidate.tab_switch_count, Candidate.blur_count)
+    
+    # Non-counter events add 0 so the response still includes pending deltas
+    pending = get_security_counter_buffer().increment(aday_id, tab_switch=ts, blur=bl)
+    
+    if pending is not None or not (ts or bl):
+        row = db.session.execute(select(*columns).where(Candidate.id == aday_id)).first()
+        if row is None or pending is None:
+            return row
+        return SecurityCounters(
+            row.ad_soyad,
+            (row.tab_switch_count or 0) + pending['tab_switch'],
+            (row.blur_count or 0) + pending['blur']
+        )
+    
+    stmt = (
+        update(Candidate)
+        .where(Candidate.id == aday_id)
+        .values(
+            tab_switch_count=func.coalesce(Candidate.tab_switch_count, 0) + ts,
+            blur_count=func.coalesce(Candidate.blur_count, 0) + bl
+        )
+        .returning(*columns)
+    )
+    row = db.session.execute(stmt).first()
+    db.session.commit()
+    return row
+
+
 @security_bp.route('/logs/<int:aday_id>')
 @login_required
 def get_security_logs(aday_id):
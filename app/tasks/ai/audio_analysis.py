@@ -5,6 +5,8 @@ Audio Analysis Module - Environment and speaker detection
 import os
 import logging
 
+from app.config.ai_config import get_gemini_model
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,10 +34,7 @@ def analyze_audio_environment(audio_base64):
         return result
     
     try:
-        import google.generativeai as genai
-        
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-pro-vision')
+        model = get_gemini_model('gemini-pro-vision')
         
         # Note: For actual audio analysis, you'd need to use Whisper first
         # Then analyze the transcript for multiple speakers
@@ -7,7 +7,7 @@ import json
 import logging
 
 from app.celery_app import celery
-from app.tasks.ai.utils import capture_ai_error, default_scores, parse_gemini_response
+from app.tasks.ai.utils import capture_ai_error, default_scores, generate_gemini_json
 from app.tasks.ai.transcription import transcribe_audio
 
 logger = logging.getLogger(__name__)
@@ -90,11 +90,6 @@ def evaluate_with_gemini(transcript):
         return default_scores()
     
     try:
-        import google.generativeai as genai
-        
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-pro')
-        
         # ══════════════════════════════════════════════════════════════════
         # SECURITY: Prompt hardening against injection attacks
         # ══════════════════════════════════════════════════════════════════
@@ -126,8 +121,7 @@ Evaluate the speaking response above on a scale of 0-100 for each criterion and
 
 IMPORTANT: Return ONLY valid JSON. If suspicious_content is true, set overall to 0."""
 
-        response = model.generate_content(prompt)
-        scores = parse_gemini_response(response.text)
+        scores = generate_gemini_json(prompt, kind='speaking')
         return scores
         
     except Exception as e:
@@ -8,7 +8,7 @@ import logging
 from datetime import datetime
 
 from app.celery_app import celery
-from app.tasks.ai.utils import parse_gemini_response
+from app.tasks.ai.utils import generate_gemini_json
 
 logger = logging.getLogger(__name__)
 
@@ -44,11 +44,6 @@ def generate_study_plan(candidate_id):
         return generate_default_study_plan(candidate, sorted_weaknesses)
     
     try:
-        import google.generativeai as genai
-        
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-pro')
-        
         prompt = f"""Bir İngilizce öğretmeni olarak, aşağıdaki aday için kişiselleştirilmiş bir çalışma planı oluştur.
 
 ADAY BİLGİLERİ:
@@ -76,8 +71,7 @@ Lütfen JSON formatında şu bilgileri içeren bir çalışma planı oluştur:
     "tips": ["ipucu1", "ipucu2"]
 }}"""
 
-        response = model.generate_content(prompt)
-        study_plan = parse_gemini_response(response.text)
+        study_plan = generate_gemini_json(prompt)
         
         # Store study plan
         candidate.admin_notes = json.dumps({
@@ -2,10 +2,22 @@
 """
 AI Tasks Utilities - Common helpers for AI evaluation
 """
+import os
+import json
+import hashlib
 import logging
+from dataclasses import asdict
+
+from app.config.ai_config import get_gemini_model
 
 logger = logging.getLogger(__name__)
 
+# Gemini request timeout and cache lifetime for identical prompts
+GEMINI_TIMEOUT_SECONDS = int(os.getenv('GEMINI_TIMEOUT_SECONDS', '30'))
+GEMINI_CACHE_TTL = 3600
+
+_redis_client = None
+
 
 def capture_ai_error(exception, task_type, context=None):
     """
@@ -57,17 +69,21 @@ def default_scores(error=None):
     }
 
 
-def parse_gemini_response(response_text):
+def parse_gemini_response(response_text, kind=None):
     """
     Parse JSON response from Gemini, handling markdown code blocks.
     
     Args:
         response_text: Raw response text from Gemini
+        kind: 'writing' or 'speaking' to validate against the typed
+              evaluation schema (app.config.ai_config.parse_evaluation)
         
     Returns:
         Parsed JSON dictionary
     """
-    import json
+    if kind is not None:
+        from app.config.ai_config import parse_evaluation
+        return asdict(parse_evaluation(response_text, kind))
     
     text = response_text.strip()
     
@@ -80,15 +96,78 @@ def parse_gemini_response(response_text):
     return json.loads(text)
 
 
-def get_gemini_model():
-    """Get configured Gemini model."""
-    import os
+def _get_redis():
+    """Lazy Redis connection for the response cache (None if unavailable)."""
+    global _redis_client
+    if _redis_client is None:
+        try:
+            import redis
+            _redis_client = redis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+        except ImportError:
+            return None
+    return _redis_client
+
+
+def _require_gemini_model(model_name):
+    model = get_gemini_model(model_name)
+    if model is None:
+        raise RuntimeError('Gemini is not configured (GEMINI_API_KEY)')
+    return model
+
+
+def _generate_text(model, prompt):
+    return model.generate_content(
+        prompt, request_options={'timeout': GEMINI_TIMEOUT_SECONDS}
+    ).text
+
+
+def generate_gemini_text(prompt, model_name=None):
+    """
+    Generate a Gemini response with a request timeout.
+    
+    Args:
+        prompt: Full prompt text
+        model_name: Gemini model to use (default: GEMINI_MODEL)
+        
+    Returns:
+        Response text
+    """
+    return _generate_text(_require_gemini_model(model_name), prompt)
+
+
+def generate_gemini_json(prompt, kind=None, model_name=None):
+    """
+    Generate and parse a JSON response from Gemini.
+    Identical prompts (e.g. re-submitted essays) are served from Redis for 1 hour.
+    Only responses that parsed successfully are cached, so a malformed
+    answer is regenerated on the next attempt.
+    
+    Args:
+        prompt: Full prompt text
+        kind: Evaluation schema to validate against (see parse_gemini_response)
+        model_name: Gemini model to use (default: GEMINI_MODEL)
+        
+    Returns:
+        Parsed JSON dictionary
+    """
+    model = _require_gemini_model(model_name)
+    cache_key = f"ai:gemini:{model.model_name}:{kind or 'raw'}:{hashlib.sha256(prompt.encode('utf-8')).hexdigest()}"
+    r = _get_redis()
+    
+    if r is not None:
+        try:
+            cached = r.get(cache_key)
+            if cached is not None:
+                return json.loads(cached)
+        except Exception as e:
+            logger.warning(f"Gemini cache read failed: {e}")
     
-    api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key:
-        return None
+    result = parse_gemini_response(_generate_text(model, prompt), kind)
     
-    import google.generativeai as genai
-    genai.configure(api_key=api_key)
+    if r is not None:
+        try:
+            r.setex(cache_key, GEMINI_CACHE_TTL, json.dumps(result))
+        except Exception as e:
+            logger.warning(f"Gemini cache write failed: {e}")
     
-    return genai.GenerativeModel('gemini-pro')
+    return result
@@ -7,7 +7,7 @@ import json
 import logging
 
 from app.celery_app import celery
-from app.tasks.ai.utils import capture_ai_error, parse_gemini_response
+from app.tasks.ai.utils import capture_ai_error, generate_gemini_json
 
 logger = logging.getLogger(__name__)
 
@@ -66,11 +66,6 @@ def evaluate_writing_with_gemini(essay_text):
         return {'overall': 50, 'feedback': 'AI evaluation unavailable'}
     
     try:
-        import google.generativeai as genai
-        
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-pro')
-        
         # ══════════════════════════════════════════════════════════════════
         # SECURITY: Prompt hardening against injection attacks
         # - User input is wrapped in <student_essay> XML tags
@@ -117,14 +112,8 @@ IMPORTANT:
 2. Find and list ALL grammar, spelling, and punctuation errors.
 3. If suspicious_content is true, set overall score to 0."""
 
-        response = model.generate_content(prompt)
-        result = parse_gemini_response(response.text)
-        
-        # Ensure grammar_errors is a list
-        if 'grammar_errors' not in result:
-            result['grammar_errors'] = []
-        
-        return result
+        # Schema defaults fill grammar_errors with [] when the model omits it
+        return generate_gemini_json(prompt, kind='writing')
         
     except Exception as e:
         logger.error(f"Gemini writing evaluation error: {e}")
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Export Tasks - Large CSV exports built off the request path
+"""
+import logging
+import tempfile
+
+from app.celery_app import celery, task_app_context
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task(bind=True, max_retries=2)
+def export_candidates(self, sirket_id):
+    """
+    Write a company's results CSV to storage.
+
+    Returns:
+        {'sirket_id', 'path', 'rows'} - path is a key for get_storage()
+    """
+    from app.utils.csv_export import write_results_csv
+    from app.utils.cloud_storage import get_storage, generate_file_path
+
+    try:
+        # Satırlar önce diske yazılır; bellekte tek kopya sadece kaydederken
+        with tempfile.TemporaryFile() as tmp:
+            with task_app_context():
+                rows = write_results_csv(sirket_id, tmp)
+            tmp.seek(0)
+            path = get_storage().save(
+                tmp.read(),
+                generate_file_path('exports', f'sinav_sonuclari_{sirket_id}.csv')
+            )
+    except Exception as e:
+        logger.error(f"Export failed (sirket_id={sirket_id}): {e}")
+        raise self.retry(exc=e, countdown=30)
+
+    logger.info(f"Exported {rows} results for company {sirket_id}")
+    return {'sirket_id': sirket_id, 'path': path, 'rows': rows}
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+Security Tasks - Periodic flush of buffered exam security counters
+"""
+import logging
+
+from app.celery_app import celery, task_app_context
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task
+def flush_security_counters():
+    """
+    Flush tab switch / blur counters buffered in Redis to the database.
+    Runs every 10 seconds via Celery beat.
+    """
+    from app.utils.security_counters import get_security_counter_buffer
+
+    with task_app_context():
+        updated = get_security_counter_buffer().flush()
+    if updated:
+        logger.info(f"Flushed security counters for {updated} candidates")
+    return updated
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+User Tasks - Deferred user preference writes
+"""
+import logging
+
+from app.celery_app import celery, task_app_context
+
+logger = logging.getLogger(__name__)
+
+
+def persist_user_language(user_id: int, lang: str) -> bool:
+    """
+    Store a user's language preference with a single UPDATE (no SELECT).
+    No-op if the stored value is already `lang`.
+
+    Returns:
+        True if a row was updated
+    """
+    from sqlalchemy import update
+    from sqlalchemy.exc import SQLAlchemyError
+    from app.models.user import User
+    from app.extensions import db
+
+    try:
+        result = db.session.execute(
+            update(User)
+            .where(User.id == user_id, User.language.is_distinct_from(lang))
+            .values(language=lang)
+        )
+        db.session.commit()
+        return result.rowcount > 0
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logger.warning(f"Language preference update failed for user {user_id}: {e}")
+        return False
+
+
+@celery.task(ignore_result=True)
+def update_user_language(user_id: int, lang: str):
+    """Fire-and-forget language preference update (see i18n.set_language)."""
+    with task_app_context():
+        persist_user_language(user_id, lang)
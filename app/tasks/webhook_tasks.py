@@ -67,13 +67,14 @@ def trigger_exam_completed(self, candidate_id):
         candidate_id: Candidate ID
     """
     try:
+        from app.extensions import db
         from app.models import Candidate, Company
         
         candidate = Candidate.query.get(candidate_id)
         if not candidate:
             return {'status': 'skipped', 'reason': 'candidate not found'}
         
-        company = Company.query.get(candidate.sirket_id)
+        company = db.session.get(Company, candidate.sirket_id)
         if not company or not company.webhook_url:
             return {'status': 'skipped', 'reason': 'no webhook configured'}
         
@@ -119,13 +120,14 @@ def trigger_candidate_created(self, candidate_id):
     Trigger webhook when candidate is created
     """
     try:
+        from app.extensions import db
         from app.models import Candidate, Company
         
         candidate = Candidate.query.get(candidate_id)
         if not candidate:
             return {'status': 'skipped'}
         
-        company = Company.query.get(candidate.sirket_id)
+        company = db.session.get(Company, candidate.sirket_id)
         if not company or not company.webhook_url:
             return {'status': 'skipped'}
         
@@ -158,9 +160,10 @@ def send_test_webhook(sirket_id):
     """
     Send test webhook to verify configuration
     """
+    from app.extensions import db
     from app.models import Company
     
-    company = Company.query.get(sirket_id)
+    company = db.session.get(Company, sirket_id)
     if not company or not company.webhook_url:
         return {'status': 'error', 'reason': 'no webhook configured'}
     
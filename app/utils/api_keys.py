@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+API Key Validation - company lookup for X-API-KEY requests
+Process-local cache -> Redis -> database
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+# Process-local LRU of valid API keys in front of Redis/DB (bounded, short TTL).
+# Unknown keys are not cached here (Redis keeps them as 'invalid'), so
+# random-key traffic cannot push real keys out.
+API_KEY_LOCAL_TTL = 30
+API_KEY_LOCAL_MAXSIZE = 10000
+_api_key_local_cache = OrderedDict()
+_api_key_local_lock = threading.Lock()
+
+
+def _api_key_digest(api_key):
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def _local_api_key_get(digest):
+    """Return the cached company_id for a valid key, or None."""
+    with _api_key_local_lock:
+        entry = _api_key_local_cache.get(digest)
+        if entry is None:
+            return None
+        expires, company_id = entry
+        if expires < time.monotonic():
+            del _api_key_local_cache[digest]
+            return None
+        _api_key_local_cache.move_to_end(digest)
+        return company_id
+
+
+def _local_api_key_set(digest, company_id):
+    with _api_key_local_lock:
+        _api_key_local_cache[digest] = (time.monotonic() + API_KEY_LOCAL_TTL, company_id)
+        _api_key_local_cache.move_to_end(digest)
+        if len(_api_key_local_cache) > API_KEY_LOCAL_MAXSIZE:
+            _api_key_local_cache.popitem(last=False)
+
+
+def validate_api_key(api_key):
+    """
+    Validate API key and return company ID.
+    Checks a 30s process-local cache first, then Redis (10 minutes),
+    then the database.
+    """
+    if not api_key:
+        return None
+    
+    digest = _api_key_digest(api_key)
+    company_id = _local_api_key_get(digest)
+    if company_id is not None:
+        return company_id
+    
+    company_id = _lookup_api_key(api_key, digest)
+    if company_id is not None:
+        _local_api_key_set(digest, company_id)
+    return company_id
+
+
+def _lookup_api_key(api_key, digest):
+    """Resolve API key to company ID via Redis cache or database."""
+    import os
+    
+    # Try to use Redis cache
+    try:
+        import redis
+        
+        redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        r = redis.from_url(redis_url)
+        
+        # Create cache key from hashed API key (for security)
+        cache_key = f"api_key:{digest[:16]}"
+        
+        # Check cache first
+        cached_company_id = r.get(cache_key)
+        if cached_company_id is not None:
+            if cached_company_id == b'invalid':
+                return None
+            return int(cached_company_id)
+        
+        # Cache miss - query database
+        from app.models import Company
+        company = Company.query.filter_by(api_key=api_key, is_active=True).first()
+        
+        if company:
+            # Cache valid key for 10 minutes
+            r.setex(cache_key, 600, str(company.id))
+            return company.id
+        else:
+            # Cache invalid key for 5 minutes (prevent brute force)
+            r.setex(cache_key, 300, 'invalid')
+            return None
+            
+    except Exception:
+        # Redis unavailable - fall back to database
+        from app.models import Company
+        company = Company.query.filter_by(api_key=api_key, is_active=True).first()
+        return company.id if company else None
+
+
+def invalidate_api_key_cache(old_api_key):
+    """
+    Invalidate cached API key when it's changed or revoked.
+    SECURITY: Call this when API key is rotated in admin panel.
+    
+    Args:
+        old_api_key: The API key being invalidated
+    """
+    if not old_api_key:
+        return False
+    
+    import os
+    import logging
+    
+    logger = logging.getLogger(__name__)
+    
+    digest = _api_key_digest(old_api_key)
+    with _api_key_local_lock:
+        _api_key_local_cache.pop(digest, None)
+    
+    try:
+        import redis
+        
+        redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        r = redis.from_url(redis_url)
+        
+        # Delete the cache key
+        cache_key = f"api_key:{digest[:16]}"
+        deleted = r.delete(cache_key)
+        
+        logger.info(f"API key cache invalidated: {deleted > 0}")
+        return deleted > 0
+        
+    except Exception as e:
+        logger.warning(f"Failed to invalidate API key cache: {e}")
+        return False
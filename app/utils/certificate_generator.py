@@ -254,7 +254,21 @@ class CertificateGenerator:
             print(f"QR code generation failed: {e}")
 
 
+_generator = None
+
+
+def get_certificate_generator():
+    """
+    Return the shared generator instance.
+    The generator only holds layout settings; each create_certificate call
+    draws on its own canvas, so one instance is safe to reuse across requests.
+    """
+    global _generator
+    if _generator is None:
+        _generator = CertificateGenerator()
+    return _generator
+
+
 def generate_certificate(candidate_data, base_url='https://skillstestcenter.com'):
     """Convenience function to generate a certificate."""
-    generator = CertificateGenerator()
-    return generator.create_certificate(candidate_data, base_url)
+    return get_certificate_generator().create_certificate(candidate_data, base_url)
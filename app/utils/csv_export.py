@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+CSV Export - Completed exam results of a company as UTF-8 CSV
+iter_results_csv streams the download route; write_results_csv fills the
+Celery export task's file
+"""
+import csv
+from io import StringIO
+
+RESULT_HEADER = ['Ad Soyad', 'Email', 'Puan', 'Seviye', 'Tamamlanma Tarihi']
+
+# BOM: Excel UTF-8 (Türkçe karakterler) olarak açsın
+BOM = '\ufeff'.encode('utf-8')
+
+# '%Y-%m-%d %H:%M' in each dialect's own date formatting function
+_SQL_DATETIME_FORMATS = {
+    'postgresql': ('to_char', 'YYYY-MM-DD HH24:MI'),
+    'mysql': ('date_format', '%Y-%m-%d %H:%i'),
+    'mariadb': ('date_format', '%Y-%m-%d %H:%i'),
+}
+
+
+def _formatted_datetime(column):
+    """
+    Column expression formatting a datetime as 'YYYY-MM-DD HH:MM' in SQL,
+    or None if the dialect has no mapping (caller formats in Python).
+    """
+    from sqlalchemy import func
+    from app.extensions import db
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        return func.strftime('%Y-%m-%d %H:%M', column)
+    if dialect in _SQL_DATETIME_FORMATS:
+        name, fmt = _SQL_DATETIME_FORMATS[dialect]
+        if name == 'to_char':
+            return func.to_char(column, fmt)
+        return func.date_format(column, fmt)
+    return None
+
+
+def _results_query(sirket_id, *columns):
+    from app.models import Candidate
+
+    return Candidate.query.with_entities(*columns).filter_by(
+        sirket_id=sirket_id,
+        sinav_durumu='tamamlandi',
+        is_deleted=False
+    )
+
+
+def iter_results_csv(sirket_id, batch_size=1000):
+    """
+    Yield the results CSV as UTF-8 bytes (BOM first, for Excel).
+
+    Rows are fetched batch_size at a time (stream_results + yield_per) and
+    quoted by csv.writer, so the response starts at once and memory stays
+    flat for large companies. Needs an app context for the whole iteration.
+    """
+    return _iter_results_rows(sirket_id, batch_size)
+
+
+def write_results_csv(sirket_id, fileobj, batch_size=1000):
+    """
+    Write the results CSV (BOM first) to a binary file object.
+
+    On PostgreSQL (psycopg2) the server builds the CSV with COPY straight
+    into fileobj; elsewhere the rows of iter_results_csv are written. For
+    the export task, whose output goes to a file anyway - the download
+    route streams iter_results_csv instead.
+
+    Returns:
+        Number of result records written (header not included)
+    """
+    from app.extensions import db
+
+    bind = db.session.get_bind()
+    if bind.dialect.name == 'postgresql' and bind.dialect.driver == 'psycopg2':
+        fileobj.write(BOM)
+        return _copy_results(sirket_id, fileobj)
+
+    lines = _iter_results_rows(sirket_id, batch_size)
+    fileobj.write(next(lines))  # BOM + başlık
+    rows = 0
+    for line in lines:
+        fileobj.write(line)
+        rows += 1
+    return rows
+
+
+def _copy_results(sirket_id, fileobj):
+    """
+    COPY (SELECT ...) TO STDOUT into fileobj: rows are formatted and quoted
+    in C by the server, then written by psycopg2 as they arrive. Returns
+    the number of rows COPY reported (the header is not a row).
+    """
+    from app.extensions import db
+    from app.models import Candidate
+
+    columns = [
+        column.label(name) for column, name in zip(
+            (Candidate.ad_soyad, Candidate.email, Candidate.puan, Candidate.seviye_sonuc,
+             _formatted_datetime(Candidate.bitis_tarihi)),
+            RESULT_HEADER
+        )
+    ]
+    connection = db.session.connection()
+    # sirket_id int'tir; literal_binds COPY'nin parametre almamasından
+    sql = _results_query(sirket_id, *columns).statement.compile(
+        dialect=connection.dialect, compile_kwargs={'literal_binds': True}
+    )
+
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER)", fileobj)
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def _iter_results_rows(sirket_id, batch_size):
+    """Rows as plain tuples (stream_results + yield_per), quoted by csv.writer."""
+    from app.models import Candidate
+
+    bitis = _formatted_datetime(Candidate.bitis_tarihi)
+    rows = _results_query(
+        sirket_id,
+        Candidate.ad_soyad, Candidate.email, Candidate.puan, Candidate.seviye_sonuc,
+        bitis if bitis is not None else Candidate.bitis_tarihi
+    ).execution_options(stream_results=True).yield_per(batch_size)
+
+    # Satır başına küçük tampon: csv.writer virgül/tırnak kaçışını yapar
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(values)
+        return buffer.getvalue().encode('utf-8')
+
+    yield BOM + line(RESULT_HEADER)
+
+    for ad_soyad, email, puan, seviye, bitis_tarihi in rows:
+        if bitis is None and bitis_tarihi:
+            bitis_tarihi = bitis_tarihi.strftime('%Y-%m-%d %H:%M')
+        yield line([ad_soyad, email, puan, seviye, bitis_tarihi or ''])
@@ -410,7 +410,7 @@ class DashboardDataProvider:
     def _get_company_credits(self, config: Dict) -> Dict:
         if self.company_id:
             from app.models.company import Company
-            company = Company.query.get(self.company_id)
+            company = db.session.get(Company, self.company_id)
             return {
                 'value': company.kredi if company else 0,
                 'icon': '💳'
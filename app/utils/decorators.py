@@ -4,7 +4,8 @@ Decorators - Reusable route decorators
 DÜZELTME: auth.sinav_giris -> candidate_auth.sinav_giris
 """
 from functools import wraps
-from flask import session, redirect, url_for, flash, jsonify, request
+from flask import session, redirect, url_for, flash, jsonify, request, g
+from app.utils.api_keys import validate_api_key
 
 
 def login_required(f):
@@ -89,6 +90,7 @@ def api_key_required(f):
     """
     Require valid API key in header
     Returns JSON error if not authenticated
+    Sets g.sirket_id (validated through the cached API key lookup)
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -97,14 +99,14 @@ def api_key_required(f):
         if not api_key:
             return jsonify({'error': 'API key required'}), 401
         
-        from app.models import Company
-        company = Company.query.filter_by(api_key=api_key, is_active=True).first()
+        sirket_id = validate_api_key(api_key)
         
-        if not company:
+        if not sirket_id:
             return jsonify({'error': 'Invalid API key'}), 401
         
         # Add company to request context
-        request.company_id = company.id
+        g.sirket_id = sirket_id
+        request.company_id = sirket_id
         
         return f(*args, **kwargs)
     return decorated_function
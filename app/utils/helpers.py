@@ -3,23 +3,23 @@
 Helper Functions - Common utilities
 """
 import string
-import random
+import secrets
 import hashlib
 from datetime import datetime
 
 
 def generate_code(length=8):
     """
-    Generate a random alphanumeric code
+    Generate a random alphanumeric code (CSPRNG, e.g. candidate giris_kodu)
     
     Args:
-        length: Code length (default 8)
+        length: Code length (default 8, ~41 bits)
     
     Returns:
         Uppercase alphanumeric string
     """
     chars = string.ascii_uppercase + string.digits
-    return ''.join(random.choices(chars, k=length))
+    return ''.join(secrets.choice(chars) for _ in range(length))
 
 
 def generate_hash(data):
@@ -225,3 +225,85 @@ def is_valid_tc_kimlik(tc):
     check_11 = sum(digits[0:10]) % 10
     
     return check_11 == digits[10]
+
+
+# Max body size for JSON API endpoints (file uploads use MAX_CONTENT_LENGTH)
+JSON_MAX_BYTES = 64 * 1024
+
+
+def json_body_limit(max_bytes):
+    """
+    Raise (or lower) the reject_large_json cap for a single view.
+    
+    Usage:
+        @api_bp.route('/candidates/bulk', methods=['POST'])
+        @json_body_limit(512 * 1024)
+        def create_candidates_bulk(): ...
+    """
+    def decorator(f):
+        f.json_max_bytes = max_bytes
+        return f
+    return decorator
+
+
+def reject_large_json():
+    """
+    Blueprint before_request hook: reject oversized bodies with 413
+    before they are parsed. Views may set their own cap with
+    json_body_limit.
+    
+    A body without Content-Length (chunked) is read here, at most
+    max_bytes + 1 bytes, and handed on to get_json()/form parsing.
+    
+    Usage:
+        api_bp.before_request(reject_large_json)
+    """
+    from io import BytesIO
+    from flask import current_app, request, jsonify
+    
+    view = current_app.view_functions.get(request.endpoint)
+    max_bytes = getattr(view, 'json_max_bytes', JSON_MAX_BYTES)
+    if request.content_length is not None:
+        if request.content_length > max_bytes:
+            return jsonify({'error': 'Request body too large'}), 413
+        return None
+    
+    body = request.stream.read(max_bytes + 1)
+    if len(body) > max_bytes:
+        return jsonify({'error': 'Request body too large'}), 413
+    request.stream = BytesIO(body)
+    return None
+
+
+def request_json_object():
+    """
+    The request's JSON body as a dict.
+    
+    Returns:
+        {} if the body is missing or not valid JSON, None if it is JSON
+        but not an object (e.g. an array) - callers answer that with 400
+    """
+    from flask import request
+    
+    data = request.get_json(silent=True)
+    if data is None:
+        return {}
+    return data if isinstance(data, dict) else None
+
+
+def lazy_load_guard():
+    """
+    Query options that make any lazy relationship load raise.
+
+    Active in debug and testing only, so an N+1 introduced in a template
+    fails in development/CI; production keeps normal lazy loading.
+    
+    Usage:
+        Candidate.query.options(*lazy_load_guard()).all()
+    """
+    from flask import current_app, has_app_context
+    from sqlalchemy.orm import raiseload
+    
+    if has_app_context() and (current_app.debug or current_app.testing):
+        return (raiseload('*'),)
+    return ()
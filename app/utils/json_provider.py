@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+JSON Provider - orjson-backed serialization for jsonify()
+Falls back to Flask's stdlib json provider when orjson is not installed
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Serialize responses with orjson.
+
+    Output matches DefaultJSONProvider: keys are sorted, and datetimes,
+    Decimals, UUIDs etc. still go through Flask's default() hook.
+    Pretty-printed (indent) output is delegated to the stdlib provider.
+    """
+
+    option = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get('indent') is None and set(kwargs) <= {'indent', 'separators'}:
+            return orjson.dumps(obj, default=self.default, option=self.option).decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def init_json_provider(app):
+    """Use orjson for app.json if available."""
+    if orjson is None:
+        app.logger.info("orjson not installed - using stdlib json provider")
+        return
+    app.json = OrjsonProvider(app)
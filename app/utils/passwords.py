@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Password Hashing - single helper for CLI, models and login
+Argon2id (argon2-cffi) when installed, bcrypt otherwise; bcrypt and legacy
+Werkzeug hashes are always accepted and upgraded on login via needs_rehash()
+"""
+import os
+import logging
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+# Argon2id cost, sized for web workers (OWASP: t=2, m=19 MiB, p=1).
+# Every concurrent login holds memory_cost KiB, so keep
+# workers x threads x memory_cost within the worker's memory budget.
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', '2'))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', '19456'))  # KiB
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', '1'))
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    _argon2 = PasswordHasher(time_cost=ARGON2_TIME_COST,
+                             memory_cost=ARGON2_MEMORY_COST,
+                             parallelism=ARGON2_PARALLELISM)
+except ImportError:
+    _argon2 = None
+
+# bcrypt cost factor (lower, e.g. 4, only for test/seed data)
+_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+
+# Throwaway hash with the same scheme and cost, built on first use
+_DUMMY_HASH = None
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with Argon2id (bcrypt if argon2-cffi is not installed).
+
+    User.sifre_hash is String(255), so the (ASCII) hash is stored as str;
+    legacy Werkzeug hashes share the same column.
+    """
+    if _argon2 is not None:
+        return _argon2.hash(password)
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=_ROUNDS)).decode('ascii')
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """
+    Verify a password against a stored hash.
+
+    Argon2 and bcrypt hashes are checked by their C implementations
+    (constant time); legacy Werkzeug hashes (pbkdf2/scrypt) are still accepted.
+    """
+    if not password_hash:
+        return False
+    if password_hash.startswith('$argon2'):
+        if _argon2 is None:
+            logger.error("Argon2 password hash found but argon2-cffi is not installed")
+            return False
+        try:
+            return _argon2.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    from werkzeug.security import check_password_hash
+    try:
+        if password_hash.startswith('$2'):
+            return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('ascii'))
+        return check_password_hash(password_hash, password)
+    except ValueError as e:
+        # Malformed hash (e.g. bcrypt "Invalid salt", unknown Werkzeug method)
+        logger.error(f"Unreadable password hash: {e}")
+        return False
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True if the hash is not in the current scheme (or uses outdated Argon2 parameters)."""
+    if _argon2 is None:
+        return not password_hash.startswith('$2')
+    if not password_hash.startswith('$argon2'):
+        return True
+    return _argon2.check_needs_rehash(password_hash)
+
+
+def verify_dummy_password(password: str) -> bool:
+    """
+    Run a full password check against a throwaway hash and return False.
+
+    Called when no user matches the email so the response takes as long
+    as a real password check (no user enumeration via timing).
+    """
+    global _DUMMY_HASH
+    if _DUMMY_HASH is None:
+        _DUMMY_HASH = hash_password(os.urandom(16).hex())
+    verify_password(password, _DUMMY_HASH)
+    return False
@@ -15,6 +15,7 @@ logger = logging.getLogger(__name__)
 MAX_FAILED_ATTEMPTS = int(os.getenv('MAX_FAILED_ATTEMPTS', '5'))
 LOCKOUT_DURATION_MINUTES = int(os.getenv('LOCKOUT_DURATION_MINUTES', '30'))
 ATTEMPT_WINDOW_MINUTES = int(os.getenv('ATTEMPT_WINDOW_MINUTES', '15'))
+VERIFIED_LOGIN_TTL_SECONDS = int(os.getenv('VERIFIED_LOGIN_TTL_SECONDS', '300'))
 
 
 class RedisLoginTracker:
@@ -65,6 +66,10 @@ class RedisLoginTracker:
         """Get Redis key for lockout status."""
         return f"login:locked:{identifier}"
     
+    def _get_verified_key(self, digest: str) -> str:
+        """Get Redis key for a recently verified credential digest."""
+        return f"login:verified:{digest}"
+    
     def record_failed_attempt(self, email: str, ip_address: str = None) -> Tuple[int, bool]:
         """
         Record a failed login attempt.
@@ -207,6 +212,32 @@ class RedisLoginTracker:
         except Exception as e:
             logger.error(f"Redis error in clear_attempts: {e}")
     
+    def is_login_verified(self, digest: str) -> bool:
+        """
+        Check if a credential digest was verified recently.
+        
+        Args:
+            digest: Keyed hash of the credentials (never the password itself)
+        """
+        if not self.redis:
+            return False
+        
+        try:
+            return bool(self.redis.exists(self._get_verified_key(digest)))
+        except Exception as e:
+            logger.error(f"Redis error in is_login_verified: {e}")
+            return False
+    
+    def mark_login_verified(self, digest: str):
+        """Remember a successfully verified credential digest for a short TTL."""
+        if not self.redis:
+            return
+        
+        try:
+            self.redis.setex(self._get_verified_key(digest), VERIFIED_LOGIN_TTL_SECONDS, 1)
+        except Exception as e:
+            logger.error(f"Redis error in mark_login_verified: {e}")
+    
     def unlock_account(self, email: str, ip_address: str = None):
         """Manually unlock an account (admin function)."""
         self.clear_attempts(email, ip_address)
@@ -268,3 +299,13 @@ def is_account_locked(email: str, ip_address: str = None) -> Tuple[bool, Optiona
 def get_remaining_attempts(email: str) -> int:
     """Get remaining login attempts."""
     return get_login_tracker().get_remaining_attempts(email)
+
+
+def is_login_verified(digest: str) -> bool:
+    """Check if credentials were verified within the TTL."""
+    return get_login_tracker().is_login_verified(digest)
+
+
+def mark_login_verified(digest: str):
+    """Remember verified credentials for the TTL."""
+    get_login_tracker().mark_login_verified(digest)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Security Counter Buffer
+Buffers exam security counters (tab switch / window blur) in Redis
+and flushes them to the database in batches via Celery beat
+"""
+import os
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Max candidates flushed per batch
+FLUSH_BATCH_SIZE = int(os.getenv('SECURITY_COUNTER_FLUSH_BATCH', '500'))
+
+# Redis field -> Candidate column
+COUNTER_FIELDS = {
+    'tab_switch': 'tab_switch_count',
+    'blur': 'blur_count',
+}
+
+
+class SecurityCounterBuffer:
+    """
+    Redis-backed buffer for exam security counters.
+
+    Benefits over direct database updates:
+    - One in-memory HINCRBY per event instead of one DB write
+    - Many events for the same candidate collapse into one UPDATE
+    - Database write load no longer grows with polling frequency
+
+    Usage:
+        buffer = SecurityCounterBuffer()
+
+        # On security event (returns None if Redis is unavailable)
+        buffer.increment(aday_id, tab_switch=1)
+
+        # Periodically (Celery beat)
+        buffer.flush()
+    """
+
+    PENDING_KEY = 'security:counters:pending'
+
+    def __init__(self):
+        self.redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        self._redis = None
+
+    @property
+    def redis(self):
+        """Lazy Redis connection."""
+        if self._redis is None:
+            try:
+                import redis
+                self._redis = redis.from_url(self.redis_url)
+            except ImportError:
+                logger.warning("Redis not available for security counters")
+                return None
+        return self._redis
+
+    def _get_counter_key(self, aday_id) -> str:
+        """Get Redis key holding pending counter deltas for a candidate."""
+        return f"security:counters:{aday_id}"
+
+    def increment(self, aday_id: int, tab_switch: int = 0, blur: int = 0) -> Optional[Dict[str, int]]:
+        """
+        Buffer counter deltas for a candidate. With zero deltas the
+        pending values are only read (the candidate is not queued).
+
+        Returns:
+            Pending (not yet flushed) deltas including this one, e.g.
+            {'tab_switch': 2, 'blur': 0}; None if Redis is unavailable
+            (caller should write to the database directly)
+        """
+        if not self.redis:
+            return None
+
+        try:
+            key = self._get_counter_key(aday_id)
+            if not (tab_switch or blur):
+                # Sayaç olmayan olay: sadece oku, flush kuyruğuna ekleme
+                pending_tab_switch, pending_blur = self.redis.hmget(key, 'tab_switch', 'blur')
+                return {'tab_switch': int(pending_tab_switch or 0), 'blur': int(pending_blur or 0)}
+
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hincrby(key, 'tab_switch', tab_switch)
+            pipe.hincrby(key, 'blur', blur)
+            pipe.sadd(self.PENDING_KEY, aday_id)
+            pending_tab_switch, pending_blur, _ = pipe.execute()
+            return {'tab_switch': pending_tab_switch, 'blur': pending_blur}
+        except Exception as e:
+            logger.warning(f"Security counter buffer unavailable: {e}")
+            return None
+
+    def _take_pending(self) -> Dict[int, Dict[str, int]]:
+        """
+        Atomically take a batch of pending deltas out of Redis.
+        Increments that arrive afterwards land in a fresh hash and
+        re-register the candidate for the next flush.
+        """
+        ids = self.redis.spop(self.PENDING_KEY, FLUSH_BATCH_SIZE) or []
+        if not ids:
+            return {}
+
+        ids = [int(i) for i in ids]
+        pipe = self.redis.pipeline(transaction=True)
+        for aday_id in ids:
+            key = self._get_counter_key(aday_id)
+            pipe.hgetall(key)
+            pipe.delete(key)
+        results = pipe.execute()
+
+        pending = {}
+        for aday_id, values in zip(ids, results[0::2]):
+            deltas = {
+                field.decode() if isinstance(field, bytes) else field: int(value)
+                for field, value in (values or {}).items()
+            }
+            if any(deltas.values()):
+                pending[aday_id] = deltas
+        return pending
+
+    def _restore(self, pending: Dict[int, Dict[str, int]]):
+        """Put deltas back into Redis after a failed database flush."""
+        pipe = self.redis.pipeline(transaction=False)
+        for aday_id, deltas in pending.items():
+            key = self._get_counter_key(aday_id)
+            for field, value in deltas.items():
+                pipe.hincrby(key, field, value)
+            pipe.sadd(self.PENDING_KEY, aday_id)
+        pipe.execute()
+
+    def flush(self) -> int:
+        """
+        Write buffered deltas to the database with one executemany UPDATE.
+
+        Returns:
+            Number of candidates updated
+        """
+        if not self.redis:
+            return 0
+
+        from sqlalchemy import update, bindparam, func
+        from app.extensions import db
+        from app.models import Candidate
+
+        total = 0
+        while True:
+            pending = self._take_pending()
+            if not pending:
+                return total
+
+            table = Candidate.__table__
+            stmt = update(table).where(table.c.id == bindparam('b_id')).values({
+                column: func.coalesce(table.c[column], 0) + bindparam(f'b_{field}')
+                for field, column in COUNTER_FIELDS.items()
+            })
+            params = [
+                {'b_id': aday_id, **{f'b_{field}': deltas.get(field, 0) for field in COUNTER_FIELDS}}
+                for aday_id, deltas in pending.items()
+            ]
+
+            try:
+                db.session.execute(stmt, params)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Security counter flush failed, restoring buffer: {e}")
+                self._restore(pending)
+                raise
+
+            total += len(params)
+
+
+# Helper functions for easy use
+_buffer = None
+
+def get_security_counter_buffer() -> SecurityCounterBuffer:
+    """Get global security counter buffer instance."""
+    global _buffer
+    if _buffer is None:
+        _buffer = SecurityCounterBuffer()
+    return _buffer
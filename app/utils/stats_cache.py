@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Stats Cache - Short-lived Redis cache for dashboard/report aggregates
+Falls back to computing on every call when Redis is unavailable
+"""
+import os
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# TTLs (seconds)
+DASHBOARD_STATS_TTL = int(os.getenv('DASHBOARD_STATS_TTL', '60'))
+REPORT_STATS_TTL = int(os.getenv('REPORT_STATS_TTL', '120'))
+
+# Global (superadmin) aggregates that also change when any company's candidates change
+GLOBAL_STATS = ('admin_dashboard', 'admin_raporlar')
+
+_redis_client = None
+
+
+def _get_redis():
+    """Lazy Redis connection (None if redis is not installed)."""
+    global _redis_client
+    if _redis_client is None:
+        try:
+            import redis
+            _redis_client = redis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+        except ImportError:
+            return None
+    return _redis_client
+
+
+def _key(name, scope=None):
+    return f"stats:{name}" if scope is None else f"stats:{name}:{scope}"
+
+
+def cached_stats(name, compute, ttl=DASHBOARD_STATS_TTL, scope=None):
+    """
+    Return compute() through a Redis cache entry that expires after ttl seconds.
+
+    Args:
+        name: Aggregate name (e.g. 'customer_dashboard')
+        compute: Zero-argument callable returning a JSON-serializable dict
+        ttl: Cache lifetime in seconds
+        scope: Optional partition, e.g. sirket_id
+
+    Redis errors are logged and the value is computed directly.
+    """
+    r = _get_redis()
+    key = _key(name, scope)
+    if r is not None:
+        try:
+            cached = r.get(key)
+            if cached is not None:
+                return json.loads(cached)
+        except Exception as e:
+            logger.debug(f"Stats cache read failed ({key}): {e}")
+            r = None
+
+    value = compute()
+
+    if r is not None:
+        try:
+            r.setex(key, ttl, json.dumps(value))
+        except Exception as e:
+            logger.debug(f"Stats cache write failed ({key}): {e}")
+    return value
+
+
+def invalidate_stats(sirket_id=None):
+    """Drop cached aggregates for a company (and the global admin ones)."""
+    r = _get_redis()
+    if r is None:
+        return
+    keys = [_key(name) for name in GLOBAL_STATS]
+    if sirket_id is not None:
+        keys.append(_key('customer_dashboard', sirket_id))
+    try:
+        r.delete(*keys)
+    except Exception as e:
+        logger.debug(f"Stats cache invalidation failed: {e}")
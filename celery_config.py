@@ -3,6 +3,8 @@
 Celery Beat Configuration
 Scheduled tasks for Skills Test Center
 """
+import os
+
 from celery.schedules import crontab, timedelta
 
 # Celery Beat Schedule
@@ -54,6 +56,14 @@ beat_schedule = {
         'schedule': crontab(hour=6, minute=0, day_of_week='saturday'),  # Saturday 06:00
     },
     
+    # ====================
+    # EXAM SECURITY
+    # ====================
+    'flush-security-counters': {
+        'task': 'app.tasks.security_tasks.flush_security_counters',
+        'schedule': timedelta(seconds=10),
+    },
+    
     # ====================
     # HEALTH CHECKS
     # ====================
@@ -68,9 +78,19 @@ broker_url = 'redis://localhost:6379/0'
 result_backend = 'redis://localhost:6379/0'
 
 # Task settings
-task_serializer = 'json'
-accept_content = ['json']
-result_serializer = 'json'
+from app.celery_app import TASK_SERIALIZER, BROKER_TRANSPORT_OPTIONS
+
+# Redis connection reuse (see app/celery_app.py)
+broker_pool_limit = int(os.getenv('CELERY_BROKER_POOL', '50'))
+redis_max_connections = int(os.getenv('CELERY_REDIS_MAX_CONNECTIONS', '100'))
+redis_socket_keepalive = True
+broker_transport_options = BROKER_TRANSPORT_OPTIONS
+result_backend_transport_options = {'retry_policy': {'timeout': 5.0}}
+
+task_serializer = TASK_SERIALIZER
+accept_content = ['msgpack', 'json']  # JSON still accepted for messages queued before rollout
+result_serializer = TASK_SERIALIZER
+result_accept_content = ['msgpack', 'json']
 timezone = 'Europe/Istanbul'
 enable_utc = True
 
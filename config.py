@@ -129,9 +129,14 @@ class ProductionConfig(Config):
     SQLALCHEMY_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
     
     # Engine options for additional tuning
+    # NOTE: Flask-SQLAlchemy 3.x ignores the SQLALCHEMY_POOL_* keys above;
+    # the pool is configured only through these engine options.
     SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
-        'pool_recycle': 1800,
+        'pool_size': SQLALCHEMY_POOL_SIZE,
+        'max_overflow': SQLALCHEMY_MAX_OVERFLOW,
+        'pool_timeout': SQLALCHEMY_POOL_TIMEOUT,
+        'pool_pre_ping': SQLALCHEMY_POOL_PRE_PING,
+        'pool_recycle': SQLALCHEMY_POOL_RECYCLE,
         'connect_args': {
             'connect_timeout': 10,
             'application_name': 'skillstestcenter'
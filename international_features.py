@@ -26,9 +26,33 @@ international_bp = Blueprint('international', __name__)
 
 # ══════════════════════════════════════════════════════════════
 def get_db_connection():
-    """Import from main app - this will be overridden when registered"""
-    from app import get_db_connection as app_get_db
-    return app_get_db()
+    """
+    Borrow a DB-API connection from the application's pooled SQLAlchemy engine.
+    conn.close() returns it to the pool instead of closing the socket.
+    Returns: (connection, is_pg)
+    """
+    from app.extensions import db
+    engine = db.engine
+    return engine.raw_connection(), engine.dialect.name == 'postgresql'
+
+# Queries (qmark style; sql() converts for PostgreSQL)
+LISTENING_AUDIO_SQL = "SELECT * FROM listening_audio WHERE id=?"
+LISTENING_QUESTIONS_SQL = "SELECT * FROM listening_questions WHERE audio_id=? ORDER BY soru_sirasi"
+CERTIFICATE_VERIFY_SQL = """SELECT ad_soyad, puan, seviye_sonuc, bitis_tarihi, band_score,
+                  ielts_reading, ielts_writing, ielts_speaking, ielts_listening
+           FROM adaylar WHERE certificate_hash=?"""
+
+# PostgreSQL (%s) variants of '?' queries, built once per query string
+_PG_SQL_CACHE = {}
+
+def sql(q, is_pg):
+    """Return the query with the placeholder style of the active driver."""
+    if not is_pg:
+        return q
+    try:
+        return _PG_SQL_CACHE[q]
+    except KeyError:
+        return _PG_SQL_CACHE.setdefault(q, q.replace('?', '%s'))
 
 def check_role(roles):
     """Import from main app - role check decorator"""
@@ -99,10 +123,7 @@ def sinav_listening(audio_id):
         c = conn.cursor()
 
     # Get audio
-    q = "SELECT * FROM listening_audio WHERE id=?"
-    if is_pg:
-        q = q.replace('?', '%s')
-    c.execute(q, (audio_id,))
+    c.execute(sql(LISTENING_AUDIO_SQL, is_pg), (audio_id,))
     audio = c.fetchone()
 
     if not audio:
@@ -110,10 +131,7 @@ def sinav_listening(audio_id):
         return redirect(url_for('sinav'))
 
     # Get questions for this audio
-    q = "SELECT * FROM listening_questions WHERE audio_id=? ORDER BY soru_sirasi"
-    if is_pg:
-        q = q.replace('?', '%s')
-    c.execute(q, (audio_id,))
+    c.execute(sql(LISTENING_QUESTIONS_SQL, is_pg), (audio_id,))
     questions = c.fetchall()
 
     # Get play count from session
@@ -202,12 +220,7 @@ def cert_verify(cert_hash):
     else:
         c = conn.cursor()
 
-    q = """SELECT ad_soyad, puan, seviye_sonuc, bitis_tarihi, band_score,
-                  ielts_reading, ielts_writing, ielts_speaking, ielts_listening
-           FROM adaylar WHERE certificate_hash=?"""
-    if is_pg:
-        q = q.replace('?', '%s')
-    c.execute(q, (cert_hash,))
+    c.execute(sql(CERTIFICATE_VERIFY_SQL, is_pg), (cert_hash,))
     cert = c.fetchone()
     conn.close()
 
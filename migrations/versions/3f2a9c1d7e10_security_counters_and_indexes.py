@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Security counters on adaylar and composite/partial list indexes
+
+Adds adaylar.tab_switch_count / blur_count and the composite indexes the
+list, keyset pagination and per-company ledger queries rely on; drops the
+single-column indexes they replace.
+
+Databases created with db.create_all() after these model changes already
+have some or all of this, so every step checks the live schema first.
+
+Revision ID: 3f2a9c1d7e10
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7e10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+NEW_COLUMNS = (
+    ('adaylar', 'tab_switch_count'),
+    ('adaylar', 'blur_count'),
+)
+
+# (name, table, columns, partial WHERE on PostgreSQL or None)
+NEW_INDEXES = (
+    ('ix_adaylar_live_sirket_created_id', 'adaylar',
+     ['sirket_id', 'created_at', 'id'], 'is_deleted = false'),
+    ('ix_adaylar_live_sirket_durum_created_id', 'adaylar',
+     ['sirket_id', 'sinav_durumu', 'created_at', 'id'], 'is_deleted = false'),
+    ('ix_sorular_kategori_zorluk_id', 'sorular',
+     ['kategori', 'zorluk', 'id'], None),
+    ('ix_sorular_live_sirket_kategori_zorluk', 'sorular',
+     ['sirket_id', 'kategori', 'zorluk'], 'is_active = true'),
+    ('ix_learning_resources_live_skill_level', 'learning_resources',
+     ['skill', 'cefr_level'], 'is_active = true'),
+    ('ix_fraud_cases_candidate_created', 'fraud_cases',
+     ['candidate_id', 'created_at'], None),
+    ('ix_exam_schedules_candidate_scheduled', 'exam_schedules',
+     ['candidate_id', 'scheduled_at'], None),
+    ('ix_cevaplar_aday_soru', 'cevaplar',
+     ['aday_id', 'soru_id'], None),
+    ('ix_kredi_hareketleri_sirket_created', 'kredi_hareketleri',
+     ['sirket_id', 'created_at'], None),
+    ('ix_audit_logs_user_created', 'audit_logs',
+     ['user_id', 'created_at'], None),
+    ('ix_credit_tx_company_created', 'credit_transactions',
+     ['company_id', 'created_at'], None),
+)
+
+# Single-column indexes that lead a composite index above
+OLD_INDEXES = (
+    ('ix_sorular_kategori', 'sorular', ['kategori']),
+    ('ix_fraud_cases_candidate_id', 'fraud_cases', ['candidate_id']),
+    ('ix_exam_schedules_candidate_id', 'exam_schedules', ['candidate_id']),
+    ('ix_cevaplar_aday_id', 'cevaplar', ['aday_id']),
+    ('ix_kredi_hareketleri_sirket_id', 'kredi_hareketleri', ['sirket_id']),
+    ('ix_audit_logs_user_id', 'audit_logs', ['user_id']),
+    ('ix_credit_transactions_company_id', 'credit_transactions', ['company_id']),
+)
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def _index_names(inspector, table):
+    return {ix['name'] for ix in inspector.get_indexes(table)}
+
+
+def upgrade():
+    inspector = _inspector()
+    tables = set(inspector.get_table_names())
+
+    for table, column in NEW_COLUMNS:
+        if table not in tables:
+            continue
+        if column not in {c['name'] for c in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column(column, sa.Integer(), nullable=True,
+                                           server_default='0'))
+
+    for name, table, columns, where in NEW_INDEXES:
+        if table not in tables or name in _index_names(inspector, table):
+            continue
+        op.create_index(name, table, columns,
+                        postgresql_where=sa.text(where) if where else None)
+
+    for name, table, _columns in OLD_INDEXES:
+        if table in tables and name in _index_names(inspector, table):
+            op.drop_index(name, table_name=table)
+
+
+def downgrade():
+    inspector = _inspector()
+    tables = set(inspector.get_table_names())
+
+    for name, table, columns in OLD_INDEXES:
+        if table in tables and name not in _index_names(inspector, table):
+            op.create_index(name, table, columns)
+
+    for name, table, _columns, _where in NEW_INDEXES:
+        if table in tables and name in _index_names(inspector, table):
+            op.drop_index(name, table_name=table)
+
+    for table, column in NEW_COLUMNS:
+        if table in tables and column in {c['name'] for c in inspector.get_columns(table)}:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.drop_column(column)
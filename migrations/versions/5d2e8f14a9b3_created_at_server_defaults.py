@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Database-side UTC defaults for kullanicilar/sirketler/adaylar created_at
+
+The models declare server_default=utcnow() (app.models.functions), but
+db.create_all() never alters existing tables, so databases built before
+that change have no DDL default. The SQL below is what utcnow() compiles
+to on each dialect.
+
+Revision ID: 5d2e8f14a9b3
+Revises: e4a18b7c93d5
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8f14a9b3'
+down_revision = 'e4a18b7c93d5'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ('kullanicilar', 'sirketler', 'adaylar')
+
+UTCNOW_SQL = {
+    'postgresql': "TIMEZONE('utc', CURRENT_TIMESTAMP)",
+    'mssql': 'GETUTCDATE()',
+}
+
+
+def _tables_with_created_at():
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+    return [t for t in TABLES
+            if t in existing and 'created_at' in {c['name'] for c in inspector.get_columns(t)}]
+
+
+def _set_default(default):
+    # SQLite cannot ALTER a column default; batch mode recreates the table there
+    for table in _tables_with_created_at():
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(),
+                                  existing_nullable=True, server_default=default)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    _set_default(sa.text(UTCNOW_SQL.get(dialect, 'CURRENT_TIMESTAMP')))
+
+
+def downgrade():
+    _set_default(None)
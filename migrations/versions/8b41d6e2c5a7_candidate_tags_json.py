@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""adaylar.tags as JSON (JSONB on PostgreSQL)
+
+tags held JSON text in a Text column. On PostgreSQL the column becomes
+JSONB (empty strings become NULL); MySQL gets a native JSON column.
+SQLite stores JSON as text already, so nothing changes there.
+
+Revision ID: 8b41d6e2c5a7
+Revises: 3f2a9c1d7e10
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '8b41d6e2c5a7'
+down_revision = '3f2a9c1d7e10'
+branch_labels = None
+depends_on = None
+
+
+def _tags_type():
+    for column in sa.inspect(op.get_bind()).get_columns('adaylar'):
+        if column['name'] == 'tags':
+            return column['type']
+    return None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    current = _tags_type()
+    if dialect == 'sqlite' or current is None or isinstance(current, sa.JSON):
+        return
+
+    if dialect == 'postgresql':
+        op.alter_column('adaylar', 'tags', type_=postgresql.JSONB(),
+                        postgresql_using="NULLIF(tags, '')::jsonb")
+    else:
+        op.alter_column('adaylar', 'tags', type_=sa.JSON(), existing_nullable=True)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    current = _tags_type()
+    if dialect == 'sqlite' or current is None or not isinstance(current, sa.JSON):
+        return
+
+    if dialect == 'postgresql':
+        op.alter_column('adaylar', 'tags', type_=sa.Text(),
+                        postgresql_using='tags::text')
+    else:
+        op.alter_column('adaylar', 'tags', type_=sa.Text(), existing_nullable=True)
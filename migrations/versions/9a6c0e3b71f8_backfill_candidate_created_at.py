@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Backfill NULL adaylar.created_at
+
+Rows inserted before created_at had a server default can hold NULL.
+Keyset pagination orders and compares on (created_at, id), so a NULL
+would sort first on PostgreSQL and cannot be encoded into a cursor.
+Those rows get the Unix epoch, which places them after every dated row.
+
+Revision ID: 9a6c0e3b71f8
+Revises: 5d2e8f14a9b3
+Create Date: 2026-10-17 00:00:00
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a6c0e3b71f8'
+down_revision = '5d2e8f14a9b3'
+branch_labels = None
+depends_on = None
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def upgrade():
+    if 'adaylar' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.execute(
+        sa.text('UPDATE adaylar SET created_at = :epoch WHERE created_at IS NULL')
+        .bindparams(sa.bindparam('epoch', EPOCH, type_=sa.DateTime()))
+    )
+
+
+def downgrade():
+    # Backfilled values cannot be told apart from real ones; nothing to undo
+    pass
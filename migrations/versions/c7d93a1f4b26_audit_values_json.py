@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""audit_logs.old_values / new_values as JSON (JSONB on PostgreSQL)
+
+Both columns held json.dumps() text. On PostgreSQL they become JSONB
+(empty strings become NULL); MySQL gets native JSON columns. SQLite
+stores JSON as text already, so nothing changes there.
+
+Revision ID: c7d93a1f4b26
+Revises: 8b41d6e2c5a7
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d93a1f4b26'
+down_revision = '8b41d6e2c5a7'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = ('old_values', 'new_values')
+
+
+def _column_types():
+    inspector = sa.inspect(op.get_bind())
+    if 'audit_logs' not in inspector.get_table_names():
+        return {}
+    return {c['name']: c['type'] for c in inspector.get_columns('audit_logs')
+            if c['name'] in COLUMNS}
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        return
+
+    for column, current in _column_types().items():
+        if isinstance(current, sa.JSON):
+            continue
+        if dialect == 'postgresql':
+            op.alter_column('audit_logs', column, type_=postgresql.JSONB(),
+                            postgresql_using=f"NULLIF({column}, '')::jsonb")
+        else:
+            op.alter_column('audit_logs', column, type_=sa.JSON(), existing_nullable=True)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        return
+
+    for column, current in _column_types().items():
+        if not isinstance(current, sa.JSON):
+            continue
+        if dialect == 'postgresql':
+            op.alter_column('audit_logs', column, type_=sa.Text(),
+                            postgresql_using=f'{column}::text')
+        else:
+            op.alter_column('audit_logs', column, type_=sa.Text(), existing_nullable=True)
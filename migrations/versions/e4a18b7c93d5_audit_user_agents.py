@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""audit_logs.user_agent -> user_agents lookup table
+
+Each distinct user agent string is stored once in user_agents, keyed by
+its SHA-1 digest; audit_logs keeps only user_agent_id. Existing strings
+are backfilled (matched on ua_text through a temporary index), then the
+audit_logs.user_agent column is dropped.
+
+Revision ID: e4a18b7c93d5
+Revises: c7d93a1f4b26
+Create Date: 2026-10-17 00:00:00
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a18b7c93d5'
+down_revision = 'c7d93a1f4b26'
+branch_labels = None
+depends_on = None
+
+
+user_agents = sa.table(
+    'user_agents',
+    sa.column('id', sa.Integer),
+    sa.column('ua_hash', sa.LargeBinary),
+    sa.column('ua_text', sa.Text),
+)
+
+
+def _columns(inspector, table):
+    return {c['name'] for c in inspector.get_columns(table)}
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    if 'user_agents' not in tables:
+        op.create_table(
+            'user_agents',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('ua_hash', sa.LargeBinary(20), nullable=False),
+            sa.Column('ua_text', sa.Text(), nullable=False),
+            sa.UniqueConstraint('ua_hash', name='uq_user_agents_ua_hash'),
+        )
+
+    if 'audit_logs' not in tables:
+        return
+    columns = _columns(inspector, 'audit_logs')
+
+    if 'user_agent_id' not in columns:
+        with op.batch_alter_table('audit_logs') as batch_op:
+            batch_op.add_column(sa.Column('user_agent_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_audit_logs_user_agent_id', 'user_agents',
+                                        ['user_agent_id'], ['id'])
+
+    if 'user_agent' not in columns:
+        return
+
+    # Farklı UA sayısı az; hash Python'da hesaplanır (pgcrypto gerekmez)
+    known = {row[0] for row in bind.execute(sa.text('SELECT ua_hash FROM user_agents'))}
+    new_rows = []
+    for (ua_text,) in bind.execute(sa.text(
+            "SELECT DISTINCT user_agent FROM audit_logs "
+            "WHERE user_agent IS NOT NULL AND user_agent <> ''")):
+        digest = hashlib.sha1(ua_text.encode('utf-8')).digest()
+        if digest not in known:
+            known.add(digest)
+            new_rows.append({'ua_hash': digest, 'ua_text': ua_text})
+    if new_rows:
+        op.bulk_insert(user_agents, new_rows)
+
+    # audit_logs'ta hash yok; eşleştirme ua_text ile yapılır. Geçici index
+    # olmadan her audit satırı user_agents'ı baştan sona tarardı
+    op.create_index('ix_user_agents_ua_text_tmp', 'user_agents', ['ua_text'],
+                    mysql_length={'ua_text': 255})
+    op.execute(
+        "UPDATE audit_logs SET user_agent_id = "
+        "(SELECT ua.id FROM user_agents ua WHERE ua.ua_text = audit_logs.user_agent) "
+        "WHERE user_agent IS NOT NULL AND user_agent <> ''"
+    )
+    op.drop_index('ix_user_agents_ua_text_tmp', table_name='user_agents')
+
+    with op.batch_alter_table('audit_logs') as batch_op:
+        batch_op.drop_column('user_agent')
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if 'audit_logs' in tables:
+        columns = _columns(inspector, 'audit_logs')
+        if 'user_agent' not in columns:
+            with op.batch_alter_table('audit_logs') as batch_op:
+                batch_op.add_column(sa.Column('user_agent', sa.String(500), nullable=True))
+        if 'user_agent_id' in columns:
+            op.execute(
+                "UPDATE audit_logs SET user_agent = "
+                "(SELECT substr(ua.ua_text, 1, 500) FROM user_agents ua "
+                "WHERE ua.id = audit_logs.user_agent_id)"
+            )
+            with op.batch_alter_table('audit_logs') as batch_op:
+                batch_op.drop_constraint('fk_audit_logs_user_agent_id', type_='foreignkey')
+                batch_op.drop_column('user_agent_id')
+
+    if 'user_agents' in tables:
+        op.drop_table('user_agents')
@@ -167,6 +167,29 @@ def admin_client(client, test_admin):
     yield client
 
 
+@pytest.fixture(scope='function')
+def count_queries(app):
+    """Record SQL statements executed inside the block: with count_queries() as queries: ..."""
+    from contextlib import contextmanager
+    from sqlalchemy import event
+    from app.extensions import db
+
+    @contextmanager
+    def _count():
+        queries = []
+
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            queries.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+        try:
+            yield queries
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', _before_cursor_execute)
+
+    return _count
+
+
 # Mock fixtures
 @pytest.fixture
 def mock_email():
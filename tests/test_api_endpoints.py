@@ -262,6 +262,203 @@ class TestAPIResponseFormat:
         assert isinstance(data, dict)
 
 
+
+class TestJsonBodyGuards:
+    """Tests for reject_large_json / request_json_object"""
+
+    def _chunked(self, app, body):
+        """Request context for a chunked body (no Content-Length)"""
+        import io
+        return app.test_request_context(
+            '/api/v1/questions', method='POST',
+            input_stream=io.BytesIO(body),
+            content_type='application/json',
+            environ_overrides={'wsgi.input_terminated': True},
+        )
+
+    def test_chunked_body_over_cap_rejected(self, app):
+        """Test a chunked body larger than the cap gets 413"""
+        from app.utils.helpers import reject_large_json, JSON_MAX_BYTES
+
+        with self._chunked(app, b'[' + b'0,' * JSON_MAX_BYTES + b'0]'):
+            response, status = reject_large_json()
+            assert status == 413
+
+    def test_chunked_body_under_cap_still_parsed(self, app):
+        """Test a small chunked body is read once and still reaches get_json"""
+        from flask import request
+        from app.utils.helpers import reject_large_json
+
+        with self._chunked(app, b'{"soru_metni": "x"}'):
+            assert reject_large_json() is None
+            assert request.get_json() == {'soru_metni': 'x'}
+
+    def test_json_array_is_not_an_object(self, app):
+        """Test request_json_object returns None for an array, {} for no body"""
+        from app.utils.helpers import request_json_object
+
+        with app.test_request_context('/', method='POST', data='[1, 2]',
+                                      content_type='application/json'):
+            assert request_json_object() is None
+        with app.test_request_context('/', method='POST'):
+            assert request_json_object() == {}
+
+    def test_json_array_returns_400(self, client):
+        """Test an endpoint answers a JSON array body with 400, not 500"""
+        response = client.post('/api/ai/evaluate-candidate',
+            data='[1, 2]',
+            content_type='application/json'
+        )
+        assert response.status_code == 400
+        assert json.loads(response.data)['error'] == 'JSON object expected'
+
+
+class TestCandidatesBulkAPI:
+    """Tests for POST /api/v1/candidates/bulk"""
+
+    def test_bulk_creates_candidates(self, client, api_headers):
+        """Test one request creates every row with its own login code"""
+        response = client.post('/api/candidates/bulk',
+            data=json.dumps([{'ad_soyad': f'Aday {i}'} for i in range(3)]),
+            content_type='application/json',
+            headers=api_headers
+        )
+        assert response.status_code == 201
+        data = json.loads(response.data)
+        assert data['count'] == 3
+        assert len({c['giris_kodu'] for c in data['candidates']}) == 3
+
+    def test_bulk_cap(self, client, api_headers):
+        """Test more than CANDIDATES_BULK_MAX rows are rejected with 400"""
+        from app.models import Candidate
+        from app.routes.api import CANDIDATES_BULK_MAX
+
+        response = client.post('/api/candidates/bulk',
+            data=json.dumps([{'ad_soyad': 'x'}] * (CANDIDATES_BULK_MAX + 1)),
+            content_type='application/json',
+            headers=api_headers
+        )
+        assert response.status_code == 400
+        assert Candidate.query.count() == 0
+
+    def test_bulk_retries_login_code_collision(self, client, api_company, api_headers):
+        """Test a giris_kodu collision rolls back the savepoint and retries"""
+        from app.models import Candidate
+        from app.extensions import db
+
+        db.session.add(Candidate(ad_soyad='Mevcut', giris_kodu='DUPCODE1',
+                                 sirket_id=api_company.id))
+        db.session.commit()
+
+        with patch('app.utils.helpers.generate_code',
+                   side_effect=['NEWCODE1', 'DUPCODE1', 'NEWCODE1', 'NEWCODE2']) as generate:
+            response = client.post('/api/candidates/bulk',
+                data=json.dumps([{'ad_soyad': 'Aday 1'}, {'ad_soyad': 'Aday 2'}]),
+                content_type='application/json',
+                headers=api_headers
+            )
+
+        assert response.status_code == 201
+        assert generate.call_count == 4
+        codes = [c['giris_kodu'] for c in json.loads(response.data)['candidates']]
+        assert codes == ['NEWCODE1', 'NEWCODE2']
+        assert Candidate.query.count() == 3
+
+
+class TestCandidateCursorPagination:
+    """Tests for keyset pagination on GET /api/candidates?cursor="""
+
+    def test_cursor_roundtrip(self):
+        """Test a cursor decodes back to its created_at and id"""
+        from datetime import datetime
+        from app.routes.api import _encode_cursor, _decode_cursor
+
+        created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+        cursor = _encode_cursor(created_at, 42)
+        assert '=' not in cursor
+        assert _decode_cursor(cursor) == (created_at, 42)
+
+        with pytest.raises(ValueError):
+            _decode_cursor('not-a-cursor')
+
+    def test_pages_with_equal_created_at(self, client, api_company, api_headers):
+        """Test rows sharing created_at are split by id, none skipped or repeated"""
+        from datetime import datetime
+        from app.models import Candidate
+        from app.extensions import db
+
+        created_at = datetime(2024, 5, 1, 12, 0, 0)
+        candidates = [Candidate(ad_soyad=f'Aday {i}', giris_kodu=f'CURSOR{i:02d}',
+                                sirket_id=api_company.id, created_at=created_at)
+                      for i in range(5)]
+        db.session.add_all(candidates)
+        db.session.commit()
+
+        seen, cursor = [], ''
+        for _ in range(5):
+            response = client.get('/api/candidates', query_string={'cursor': cursor, 'limit': 2},
+                                  headers=api_headers)
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            seen += [c['id'] for c in data['candidates']]
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+
+        assert seen == sorted((c.id for c in candidates), reverse=True)
+
+    def test_invalid_cursor_returns_400(self, client, api_headers):
+        """Test a malformed cursor is rejected"""
+        response = client.get('/api/candidates?cursor=@@@', headers=api_headers)
+        assert response.status_code == 400
+
+
+class TestConditionalCandidateGet:
+    """Tests for ETag / If-None-Match on GET /api/candidates/<id>"""
+
+    def test_matching_etag_returns_304(self, client, api_company, api_headers):
+        """Test a repeated read with the returned ETag gets an empty 304"""
+        from app.models import Candidate
+        from app.extensions import db
+
+        candidate = Candidate(ad_soyad='Etag Aday', giris_kodu='ETAGCODE', sirket_id=api_company.id)
+        db.session.add(candidate)
+        db.session.commit()
+        url = f'/api/candidates/{candidate.id}'
+
+        first = client.get(url, headers=api_headers)
+        assert first.status_code == 200
+        etag = first.headers['ETag']
+        assert etag.startswith('W/')
+
+        cached = client.get(url, headers={**api_headers, 'If-None-Match': etag})
+        assert cached.status_code == 304
+        assert cached.data == b''
+        assert cached.headers['ETag'] == etag
+
+        stale = client.get(url, headers={**api_headers, 'If-None-Match': 'W/"stale"'})
+        assert stale.status_code == 200
+        assert json.loads(stale.data)['giris_kodu'] == 'ETAGCODE'
+
+    def test_etag_changes_with_payload(self, client, api_company, api_headers):
+        """Test an updated candidate no longer matches the old ETag"""
+        from app.models import Candidate
+        from app.extensions import db
+
+        candidate = Candidate(ad_soyad='Etag Aday', giris_kodu='ETAGCOD2', sirket_id=api_company.id)
+        db.session.add(candidate)
+        db.session.commit()
+        url = f'/api/candidates/{candidate.id}'
+        etag = client.get(url, headers=api_headers).headers['ETag']
+
+        candidate.puan = 75
+        db.session.commit()
+
+        response = client.get(url, headers={**api_headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+
 # ============================================================
 # Fixtures
 # ============================================================
@@ -291,6 +488,26 @@ def app():
         db.drop_all()
 
 
+@pytest.fixture
+def api_company(app):
+    """Company with an API key"""
+    import uuid
+    from app.models import Company
+    from app.extensions import db
+
+    api_key = uuid.uuid4().hex
+    company = Company(isim='API Company', api_key=api_key)
+    db.session.add(company)
+    db.session.commit()
+    return company
+
+
+@pytest.fixture
+def api_headers(api_company):
+    """X-API-KEY header for api_company"""
+    return {'X-API-KEY': api_company.api_key}
+
+
 @pytest.fixture
 def test_user(app):
     """Create a test user"""
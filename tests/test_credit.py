@@ -96,5 +96,101 @@ class TestCreditLogging:
         assert log_entry['yeni_bakiye'] < log_entry['onceki_bakiye']
 
 
+
+# ══════════════════════════════════════════════════════════════
+# COMPANY.deduct_credit TESTS
+# ══════════════════════════════════════════════════════════════
+class TestCompanyDeductCredit:
+    """Test the atomic Company.deduct_credit update"""
+    
+    def _company(self, kredi):
+        from app.models import Company
+        from app.extensions import db
+        
+        company = Company(isim='Kredi Test', kredi=kredi)
+        db.session.add(company)
+        db.session.flush()
+        return company
+    
+    def test_deduct_logs_transaction(self, app):
+        """Deduction should lower the balance and log before/after values"""
+        from app.models.company import CreditTransaction
+        from app.extensions import db
+        
+        with app.app_context():
+            company = self._company(kredi=5)
+            
+            assert company.deduct_credit(2) == True
+            assert company.kredi == 3
+            db.session.flush()
+            
+            tx = CreditTransaction.query.filter_by(sirket_id=company.id).one()
+            assert (tx.miktar, tx.onceki_bakiye, tx.sonraki_bakiye) == (-2, 5, 3)
+            db.session.expire(company)
+            assert company.kredi == 3
+            db.session.rollback()
+    
+    def test_insufficient_credit_changes_nothing(self, app):
+        """Deduction above the balance should fail without a log row"""
+        from app.models.company import CreditTransaction
+        from app.extensions import db
+        
+        with app.app_context():
+            company = self._company(kredi=1)
+            
+            assert company.deduct_credit(2) == False
+            assert company.kredi == 1
+            assert CreditTransaction.query.filter_by(sirket_id=company.id).count() == 0
+            db.session.rollback()
+    
+    def test_postgresql_statement_compiles(self, app):
+        """The PostgreSQL writable CTE should compile for the postgresql dialect"""
+        from unittest.mock import MagicMock, patch
+        from sqlalchemy.dialects import postgresql
+        from app.extensions import db
+        
+        with app.app_context():
+            company = self._company(kredi=5)
+            bind = MagicMock()
+            bind.dialect = postgresql.dialect()
+            captured = []
+            
+            def fake_execute(stmt, *args, **kwargs):
+                captured.append(stmt)
+                result = MagicMock()
+                result.scalar.return_value = 4
+                return result
+            
+            with patch.object(db.session, 'get_bind', return_value=bind), \
+                    patch.object(db.session, 'execute', side_effect=fake_execute):
+                assert company.deduct_credit(1) == True
+            
+            sql = str(captured[0].compile(dialect=postgresql.dialect()))
+            assert sql.startswith('WITH upd AS')
+            assert 'UPDATE sirketler SET kredi=(sirketler.kredi - ' in sql
+            assert 'INSERT INTO kredi_hareketleri' in sql
+            assert sql.rstrip().endswith('RETURNING kredi_hareketleri.sonraki_bakiye')
+            assert company.kredi == 4
+            db.session.rollback()
+
+
+
+# Fixtures
+@pytest.fixture
+def app():
+    """Create application for testing"""
+    from app import create_app
+    
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['WTF_CSRF_ENABLED'] = False
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    
+    with app.app_context():
+        from app.extensions import db
+        db.create_all()
+        yield app
+        db.drop_all()
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
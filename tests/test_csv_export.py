@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for CSV Export
+Tests quoting and row counts of the exam results CSV
+"""
+import csv
+import io
+from datetime import datetime
+
+import pytest
+
+
+NAMES = ['Öztürk, Ayşe', 'Ali "Hoca" Demir', 'Satır\nAtlamalı', 'Düz İsim']
+
+
+class TestResultsCsv:
+    """Tests for iter_results_csv / write_results_csv"""
+
+    def _parse(self, data):
+        assert data.startswith(b'\xef\xbb\xbf')
+        return list(csv.reader(io.StringIO(data[3:].decode('utf-8'), newline='')))
+
+    def test_special_characters_round_trip(self, app, company_id):
+        """Test commas, quotes and newlines survive csv.reader unchanged"""
+        from app.utils.csv_export import iter_results_csv, RESULT_HEADER
+
+        rows = self._parse(b''.join(iter_results_csv(company_id, batch_size=2)))
+
+        assert rows[0] == RESULT_HEADER
+        assert sorted(row[0] for row in rows[1:]) == sorted(NAMES)
+        assert {row[4] for row in rows[1:]} == {'2024-05-01 12:30'}
+
+    def test_write_counts_records_not_lines(self, app, company_id):
+        """Test the returned count ignores newlines inside quoted fields"""
+        from app.utils.csv_export import write_results_csv
+
+        fileobj = io.BytesIO()
+        count = write_results_csv(company_id, fileobj)
+
+        assert count == len(NAMES)
+        assert len(self._parse(fileobj.getvalue())) == len(NAMES) + 1
+        assert fileobj.getvalue().count(b'\n') > len(NAMES) + 1
+
+    def test_other_companies_excluded(self, app, company_id):
+        """Test only the company's completed, non-deleted candidates are exported"""
+        from app.utils.csv_export import iter_results_csv
+
+        rows = self._parse(b''.join(iter_results_csv(company_id + 1)))
+        assert len(rows) == 1
+
+
+# Fixtures
+@pytest.fixture
+def app():
+    """Create application for testing"""
+    from app import create_app
+
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        from app.extensions import db
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def company_id(app):
+    """Company with completed candidates whose names need CSV quoting"""
+    from app.models import Company, Candidate
+    from app.extensions import db
+
+    company = Company(isim='CSV Company')
+    db.session.add(company)
+    db.session.flush()
+
+    finished = datetime(2024, 5, 1, 12, 30)
+    for i, name in enumerate(NAMES):
+        db.session.add(Candidate(ad_soyad=name, email=f'aday{i}@example.com', puan=70 + i,
+                                 seviye_sonuc='B2', sinav_durumu='tamamlandi',
+                                 bitis_tarihi=finished, giris_kodu=f'CSVCODE{i}',
+                                 sirket_id=company.id))
+    db.session.add(Candidate(ad_soyad='Bekleyen', giris_kodu='CSVWAIT0', sirket_id=company.id))
+    db.session.add(Candidate(ad_soyad='Silinen', giris_kodu='CSVDEL00', sinav_durumu='tamamlandi',
+                             is_deleted=True, sirket_id=company.id))
+    db.session.commit()
+    return company.id
@@ -0,0 +1,49 @@
+"""
+Query Count Tests - admin list pages must not grow with row count (N+1)
+pytest tests/test_query_counts.py
+"""
+import pytest
+import sys
+import os
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _add_rows(app, n, prefix):
+    """Add n companies, each with one candidate."""
+    from app.models import Company, Candidate
+    from app.extensions import db
+
+    with app.app_context():
+        for i in range(n):
+            company = Company(isim=f'{prefix} {i}', email=f'{prefix}{i}@example.com', kredi=10)
+            db.session.add(company)
+            db.session.flush()
+            db.session.add(Candidate(
+                ad_soyad=f'{prefix} Aday {i}',
+                giris_kodu=uuid.uuid4().hex[:12].upper(),
+                sirket_id=company.id,
+            ))
+        db.session.commit()
+
+
+# ══════════════════════════════════════════════════════════════
+# ADMIN LIST PAGES
+# ══════════════════════════════════════════════════════════════
+class TestAdminListQueryCounts:
+    """List pages run a fixed number of queries (raiseload catches lazy loads)"""
+
+    @pytest.mark.parametrize('url', ['/admin/adaylar', '/admin/sirketler'])
+    def test_query_count_independent_of_rows(self, app, admin_client, count_queries, url):
+        """Adding rows must not add queries"""
+        prefix = url.rsplit('/', 1)[-1]
+        _add_rows(app, 2, f'{prefix}a')
+        with count_queries() as few:
+            assert admin_client.get(url).status_code == 200
+
+        _add_rows(app, 6, f'{prefix}b')
+        with count_queries() as many:
+            assert admin_client.get(url).status_code == 200
+
+        assert len(many) == len(few)
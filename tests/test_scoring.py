@@ -138,5 +138,109 @@ class TestScoreCalculation:
         assert score == 0
 
 
+# ══════════════════════════════════════════════════════════════
+# STORED SKILL SCORES (Candidate.finalize_scores)
+# ══════════════════════════════════════════════════════════════
+class TestFinalizeScores:
+    """Skill scores computed once at submission"""
+
+    def test_ai_scores_kept(self, app):
+        """Writing/speaking answers must not overwrite AI-scored p_ values"""
+        import uuid
+        from app.models import Candidate, Question, ExamAnswer
+        from app.extensions import db
+
+        with app.app_context():
+            candidate = Candidate(ad_soyad='Skor Aday', giris_kodu=uuid.uuid4().hex[:12].upper(),
+                                  p_writing=72.5, p_speaking=80.0)
+            db.session.add(candidate)
+            db.session.flush()
+
+            answers = [('grammar', True), ('grammar', False), ('listening', True),
+                       ('writing', None), ('speaking', None)]
+            for kategori, dogru_mu in answers:
+                question = Question(soru_metni=f'{kategori} sorusu', kategori=kategori)
+                db.session.add(question)
+                db.session.flush()
+                db.session.add(ExamAnswer(aday_id=candidate.id, soru_id=question.id, dogru_mu=dogru_mu))
+            db.session.flush()
+
+            assert candidate.finalize_scores() == 5
+            assert candidate.p_grammar == 50.0
+            assert candidate.p_listening == 100.0
+            assert candidate.p_writing == 72.5
+            assert candidate.p_speaking == 80.0
+            assert candidate.sinav_durumu == 'tamamlandi'
+            db.session.rollback()
+
+
+class TestBulkSubmit:
+    """Offline-sync answer batches (ExamAnswer.bulk_submit)"""
+
+    def test_only_boolean_true_is_correct(self, app):
+        """Strings like "false" must not be stored as correct"""
+        import uuid
+        from app.models import Candidate, Question, ExamAnswer
+        from app.extensions import db
+
+        with app.app_context():
+            candidate = Candidate(ad_soyad='Sync Aday', giris_kodu=uuid.uuid4().hex[:12].upper())
+            db.session.add(candidate)
+            questions = [Question(soru_metni=f'soru {i}', kategori='grammar') for i in range(3)]
+            db.session.add_all(questions)
+            db.session.flush()
+
+            inserted = ExamAnswer.bulk_submit(candidate.id, [
+                {'soru_id': questions[0].id, 'verilen_cevap': 'A', 'dogru_mu': True},
+                {'soru_id': questions[1].id, 'verilen_cevap': 'B', 'dogru_mu': 'false'},
+                {'soru_id': questions[2].id, 'verilen_cevap': 'C', 'dogru_mu': 1},
+                {'soru_id': questions[0].id, 'verilen_cevap': 'A', 'dogru_mu': True},
+            ])
+
+            assert inserted == 3
+            stored = dict(db.session.query(ExamAnswer.soru_id, ExamAnswer.dogru_mu)
+                          .filter(ExamAnswer.aday_id == candidate.id))
+            assert stored == {questions[0].id: True, questions[1].id: False, questions[2].id: False}
+            db.session.rollback()
+
+
+
+class TestEvaluationParsing:
+    """Test AI evaluation response parsing (msgspec and stdlib paths)"""
+
+    REPLY = ('{"fluency": "80", "pronunciation": 70, "grammar": "65.5", '
+             '"vocabulary": 60, "content": 50, "overall": 70, "suspicious_content": "false"}')
+
+    def _parsers(self):
+        from app.config import ai_config
+        parsers = [lambda text: ai_config._decode_stdlib(text, ai_config.SpeakingEvaluation)]
+        if ai_config.msgspec is not None:
+            parsers.append(lambda text: ai_config.parse_evaluation(text, 'speaking'))
+        return parsers
+
+    def test_lax_scores_and_optional_fields(self):
+        """Numeric strings are converted; cefr_level/feedback may be missing"""
+        for parse in self._parsers():
+            result = parse(self.REPLY)
+            assert result.fluency == 80
+            assert result.grammar == 65.5
+            assert result.suspicious_content is False
+            assert result.cefr_level is None
+            assert result.feedback == ''
+
+    def test_unusable_reply_rejected(self):
+        """Non-numeric or missing scores still fail"""
+        for parse in self._parsers():
+            with pytest.raises(ValueError):
+                parse(self.REPLY.replace('"overall": 70', '"overall": "good"'))
+            with pytest.raises(ValueError):
+                parse(self.REPLY.replace('"overall": 70, ', ''))
+
+    def test_unknown_kind(self):
+        from app.config.ai_config import parse_evaluation
+        with pytest.raises(ValueError, match='Unknown evaluation kind'):
+            parse_evaluation(self.REPLY, 'reading')
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
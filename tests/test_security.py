@@ -124,6 +124,37 @@ class TestPasswordPolicy:
         assert is_valid == False
 
 
+class TestPasswordHashing:
+    """Tests for password hash verification"""
+    
+    def test_malformed_hash_is_rejected(self):
+        """Test unreadable bcrypt/Werkzeug hashes fail closed"""
+        from app.utils.passwords import verify_password
+        
+        assert verify_password('anything', '$2b$12$not-a-valid-bcrypt-salt') == False
+        assert verify_password('anything', 'unknown$salt$digest') == False
+    
+    def test_hash_roundtrip(self):
+        """Test a fresh hash verifies only the original password"""
+        from app.utils.passwords import hash_password, verify_password
+        
+        hashed = hash_password('SecurePass123!')
+        assert verify_password('SecurePass123!', hashed) == True
+        assert verify_password('wrong', hashed) == False
+
+    def test_argon2_uses_configured_cost(self):
+        """Test new Argon2 hashes carry the configured cost parameters"""
+        pytest.importorskip('argon2')
+        from app.utils import passwords
+
+        hashed = passwords.hash_password('SecurePass123!')
+        assert hashed.startswith(
+            f'$argon2id$v=19$m={passwords.ARGON2_MEMORY_COST},'
+            f't={passwords.ARGON2_TIME_COST},p={passwords.ARGON2_PARALLELISM}$'
+        )
+        assert passwords.needs_rehash(hashed) == False
+
+
 class TestTwoFactorAuth:
     """Tests for 2FA utilities"""
     
@@ -219,3 +250,105 @@ class TestWebhookSecurity:
         payload = '{"event": "test"}'
         
         assert manager.verify_signature(payload, 'invalid_signature', 'secret') == False
+
+
+class TestApiKeyCache:
+    """Tests for the process-local API key cache"""
+    
+    def setup_method(self):
+        from app.utils import api_keys
+        api_keys._api_key_local_cache.clear()
+    
+    def test_unknown_key_not_cached(self):
+        """Test invalid keys are looked up again instead of filling the cache"""
+        from app.utils import api_keys
+        
+        with patch.object(api_keys, '_lookup_api_key', return_value=None) as lookup:
+            assert api_keys.validate_api_key('bogus') is None
+            assert api_keys.validate_api_key('bogus') is None
+        
+        assert lookup.call_count == 2
+        assert len(api_keys._api_key_local_cache) == 0
+    
+    def test_lru_eviction(self):
+        """Test the least recently used key is evicted when full"""
+        from app.utils import api_keys
+        
+        with patch.object(api_keys, 'API_KEY_LOCAL_MAXSIZE', 2), \
+                patch.object(api_keys, '_lookup_api_key', side_effect=[1, 2, 3]) as lookup:
+            api_keys.validate_api_key('key-1')
+            api_keys.validate_api_key('key-2')
+            api_keys.validate_api_key('key-1')  # hit, key-1 becomes most recent
+            api_keys.validate_api_key('key-3')  # evicts key-2
+            
+            assert lookup.call_count == 3
+            assert api_keys._local_api_key_get(api_keys._api_key_digest('key-1')) == 1
+            assert api_keys._local_api_key_get(api_keys._api_key_digest('key-2')) is None
+
+
+class TestAuditBuffer:
+    """Tests for the per-request audit buffer"""
+    
+    def _row(self, action):
+        from datetime import datetime
+        return {
+            'user_id': None, 'user_email': 'system', 'user_role': 'system',
+            'action': action, 'table_name': 'test', 'record_id': 1,
+            'description': None, 'old_values': None, 'new_values': None,
+            'ip_address': None, 'user_agent_id': None, 'endpoint': None,
+            'created_at': datetime.utcnow(),
+        }
+    
+    def _actions(self):
+        from app.extensions import db
+        from app.models.audit_log import AuditLog
+        return {a for (a,) in db.session.query(AuditLog.action).filter(AuditLog.table_name == 'test')}
+    
+    def test_rows_follow_request_commit(self, app):
+        """Test queued rows are written on commit and dropped on rollback"""
+        from app.extensions import db
+        from app.models.admin import queue_audit_row
+        
+        with app.test_request_context():
+            db.session.execute(db.text('SELECT 1'))
+            queue_audit_row(self._row('rolled_back'))
+            db.session.rollback()
+            
+            db.session.execute(db.text('SELECT 1'))
+            queue_audit_row(self._row('committed'))
+            assert 'committed' not in self._actions()
+            db.session.commit()
+            app.do_teardown_request(None)
+        
+        actions = self._actions()
+        assert 'committed' in actions
+        assert 'rolled_back' not in actions
+    
+    def test_failed_request_writes_nothing(self, app):
+        """Test rows queued by a request that raised are dropped"""
+        from app.models.admin import queue_audit_row
+        
+        with app.test_request_context():
+            queue_audit_row(self._row('failed'))
+            app.do_teardown_request(RuntimeError('boom'))
+        
+        assert 'failed' not in self._actions()
+    
+    def test_user_agents_resolved_on_flush(self, app):
+        """Test queued user agent strings are stored once and linked by id"""
+        from app.extensions import db
+        from app.models.admin import queue_audit_row
+        from app.models.audit_log import AuditLog, UserAgent
+        
+        with app.test_request_context():
+            for action in ('ua_1', 'ua_2'):
+                row = self._row(action)
+                del row['user_agent_id']
+                row['user_agent'] = 'TestAgent/1.0'
+                queue_audit_row(row)
+            db.session.execute(db.text('SELECT 1'))
+            db.session.commit()
+        
+        logs = AuditLog.query.filter(AuditLog.action.in_(['ua_1', 'ua_2'])).all()
+        assert [log.user_agent for log in logs] == ['TestAgent/1.0', 'TestAgent/1.0']
+        assert UserAgent.query.filter_by(ua_text='TestAgent/1.0').count() == 1
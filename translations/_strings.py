@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Translation Strings - extraction source only
+Picked up by `pybabel extract -F babel.cfg -o messages.pot .`; never imported
+at runtime (templates call _() directly), so no LazyString proxies are built.
+"""
+from flask_babel import lazy_gettext as _
+
+# Navigation
+NAV_DASHBOARD = _('Dashboard')
+NAV_CANDIDATES = _('Adaylar')
+NAV_EXAMS = _('Sınavlar')
+NAV_REPORTS = _('Raporlar')
+NAV_SETTINGS = _('Ayarlar')
+NAV_LOGOUT = _('Çıkış')
+
+# Auth
+AUTH_LOGIN = _('Giriş Yap')
+AUTH_LOGOUT = _('Çıkış')
+AUTH_EMAIL = _('E-posta')
+AUTH_PASSWORD = _('Şifre')
+AUTH_FORGOT_PASSWORD = _('Şifremi Unuttum')
+AUTH_REMEMBER_ME = _('Beni Hatırla')
+
+# Buttons
+BTN_SAVE = _('Kaydet')
+BTN_CANCEL = _('İptal')
+BTN_DELETE = _('Sil')
+BTN_EDIT = _('Düzenle')
+BTN_ADD = _('Ekle')
+BTN_SEARCH = _('Ara')
+BTN_FILTER = _('Filtrele')
+BTN_EXPORT = _('Dışa Aktar')
+BTN_IMPORT = _('İçe Aktar')
+BTN_DOWNLOAD = _('İndir')
+BTN_UPLOAD = _('Yükle')
+BTN_SUBMIT = _('Gönder')
+BTN_BACK = _('Geri')
+BTN_NEXT = _('İleri')
+BTN_FINISH = _('Bitir')
+
+# Messages
+MSG_SUCCESS = _('İşlem başarılı!')
+MSG_ERROR = _('Bir hata oluştu.')
+MSG_CONFIRM_DELETE = _('Bu öğeyi silmek istediğinizden emin misiniz?')
+MSG_NO_DATA = _('Veri bulunamadı.')
+MSG_LOADING = _('Yükleniyor...')
+
+# CEFR Levels
+CEFR_A1 = _('Başlangıç')
+CEFR_A2 = _('Temel')
+CEFR_B1 = _('Orta')
+CEFR_B2 = _('Orta Üstü')
+CEFR_C1 = _('İleri')
+CEFR_C2 = _('Uzman')
+
+# Exam Related
+EXAM_STATUS_PENDING = _('Beklemede')
+EXAM_STATUS_IN_PROGRESS = _('Sınavda')
+EXAM_STATUS_COMPLETED = _('Tamamlandı')
+EXAM_START = _('Sınava Başla')
+EXAM_CONTINUE = _('Sınava Devam Et')
+EXAM_FINISH = _('Sınavı Bitir')
+EXAM_TIME_REMAINING = _('Kalan Süre')
+
+# Skills
+SKILL_GRAMMAR = _('Dilbilgisi')
+SKILL_VOCABULARY = _('Kelime Bilgisi')
+SKILL_READING = _('Okuma')
+SKILL_LISTENING = _('Dinleme')
+SKILL_WRITING = _('Yazma')
+SKILL_SPEAKING = _('Konuşma')
+
+# Time periods
+TIME_TODAY = _('Bugün')
+TIME_YESTERDAY = _('Dün')
+TIME_THIS_WEEK = _('Bu Hafta')
+TIME_THIS_MONTH = _('Bu Ay')
+TIME_LAST_MONTH = _('Geçen Ay')
+TIME_THIS_YEAR = _('Bu Yıl')